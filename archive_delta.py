@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Biblioteka z paczkami różnicowymi między wydaniami (dodane, zmienione i usunięte pliki + binarne różnice bloków)
+"""
+import hashlib
+import os
+import struct
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from archive_utils import TargetResult
+from json_utils import JsonBackend
+
+DELTA_EXTENSION = '.mcdelta'
+DELTA_MANIFEST = 'delta.json'
+DELTA_FORMAT = 1
+# Zmienione pliki od tego rozmiaru są zapisywane jako różnica bloków (mniejsze w całości)
+BLOCK_DIFF_THRESHOLD = 16 * 1024
+BLOCK_SIZE = 512
+# Różnica jest używana tylko, gdy jest wyraźnie mniejsza od pliku
+MAX_PATCH_RATIO = 0.5
+
+PATCH_MAGIC = b'MCBD'
+PATCH_HEADER = struct.Struct('<4sQ')
+COPY_OP = struct.Struct('<cQI')
+DATA_OP = struct.Struct('<cI')
+
+
+def _sha256(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _weak_hash(block: bytes):
+    """rsync weak checksum parts: a = sum of bytes, b = sum of bytes weighted by distance from block end"""
+    length = len(block)
+    return sum(block) & 0xffff, sum((length - position) * value for position, value in enumerate(block)) & 0xffff
+
+
+def block_diff(base: bytes, target: bytes, block_size: int = BLOCK_SIZE) -> bytes:
+    """Encode target as copies of base blocks and literal data (rsync algorithm with a rolling checksum)"""
+    ops = bytearray(PATCH_HEADER.pack(PATCH_MAGIC, len(target)))
+    index = {}
+    for offset in range(0, len(base) - block_size + 1, block_size):
+        a, b = _weak_hash(base[offset:offset + block_size])
+        index.setdefault(b << 16 | a, []).append(offset)
+
+    pending_copy = None
+    literal_start = 0
+
+    def flush(literal_end):
+        nonlocal pending_copy
+        if literal_end > literal_start:
+            if pending_copy:
+                ops.extend(COPY_OP.pack(b'C', *pending_copy))
+                pending_copy = None
+            ops.extend(DATA_OP.pack(b'D', literal_end - literal_start))
+            ops.extend(target[literal_start:literal_end])
+
+    position = 0
+    if index and len(target) >= block_size:
+        a, b = _weak_hash(target[:block_size])
+        while True:
+            offsets = index.get(b << 16 | a)
+            if offsets:
+                window = target[position:position + block_size]
+                match = next((offset for offset in offsets if base[offset:offset + block_size] == window), None)
+                if match is not None:
+                    flush(position)
+                    if pending_copy and pending_copy[0] + pending_copy[1] == match:
+                        pending_copy = (pending_copy[0], pending_copy[1] + block_size)
+                    else:
+                        if pending_copy:
+                            ops.extend(COPY_OP.pack(b'C', *pending_copy))
+                        pending_copy = (match, block_size)
+                    position += block_size
+                    literal_start = position
+                    if position + block_size > len(target):
+                        break
+                    a, b = _weak_hash(target[position:position + block_size])
+                    continue
+            if position + block_size >= len(target):
+                break
+            # Przesunięcie okna o jeden bajt w O(1)
+            outgoing, incoming = target[position], target[position + block_size]
+            a = (a - outgoing + incoming) & 0xffff
+            b = (b - block_size * outgoing + a) & 0xffff
+            position += 1
+
+    flush(len(target))
+    if pending_copy:
+        ops.extend(COPY_OP.pack(b'C', *pending_copy))
+    return bytes(ops)
+
+
+def block_patch(base: bytes, patch: bytes) -> bytes:
+    """Rebuild the target from the base and a block_diff patch"""
+    magic, target_size = PATCH_HEADER.unpack_from(patch)
+    if magic != PATCH_MAGIC:
+        raise ValueError("Not a block diff patch")
+    result = bytearray()
+    position = PATCH_HEADER.size
+    while position < len(patch):
+        if patch[position:position + 1] == b'C':
+            _, offset, length = COPY_OP.unpack_from(patch, position)
+            if offset + length > len(base):
+                raise ValueError("Block diff copies outside of the base file")
+            result.extend(base[offset:offset + length])
+            position += COPY_OP.size
+        else:
+            _, length = DATA_OP.unpack_from(patch, position)
+            position += DATA_OP.size
+            result.extend(patch[position:position + length])
+            position += length
+    if len(result) != target_size:
+        raise ValueError("Block diff result has wrong size")
+    return bytes(result)
+
+
+@dataclass
+class DeltaStats:
+    """Podsumowanie paczki różnicowej"""
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    # Zmienione pliki zapisane jako różnica bloków
+    patched: int = 0
+    target_size: int = 0
+    delta_size: int = 0
+
+
+def _archive_contents(archive_path: str) -> Dict[str, bytes]:
+    with zipfile.ZipFile(archive_path, 'r') as zf:
+        return {info.filename: zf.read(info) for info in zf.infolist() if not info.is_dir()}
+
+
+def create_delta(base_archive: str, target_archive: str, delta_path: str) -> DeltaStats:
+    """Write a delta bundle turning the contents of the base archive into the target archive"""
+    base = _archive_contents(base_archive)
+    target = _archive_contents(target_archive)
+    stats = DeltaStats(target_size=os.path.getsize(target_archive))
+    manifest = {
+        "format": DELTA_FORMAT,
+        "base": os.path.basename(base_archive),
+        "target": os.path.basename(target_archive),
+        "added": {}, "changed": {}, "removed": {},
+    }
+    with zipfile.ZipFile(delta_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for member, content in sorted(target.items()):
+            if member not in base:
+                manifest['added'][member] = _sha256(content)
+                zf.writestr(f"data/{member}", content)
+                stats.added += 1
+                continue
+            if base[member] == content:
+                stats.unchanged += 1
+                continue
+            entry = {"base": _sha256(base[member]), "sha256": _sha256(content), "patch": False}
+            patch = block_diff(base[member], content) if len(content) >= BLOCK_DIFF_THRESHOLD else None
+            if patch is not None and len(patch) <= len(content) * MAX_PATCH_RATIO:
+                entry['patch'] = True
+                zf.writestr(f"patch/{member}", patch)
+                stats.patched += 1
+            else:
+                zf.writestr(f"data/{member}", content)
+            manifest['changed'][member] = entry
+            stats.changed += 1
+        for member in sorted(set(base) - set(target)):
+            manifest['removed'][member] = _sha256(base[member])
+            stats.removed += 1
+        zf.writestr(DELTA_MANIFEST, JsonBackend.dumps(manifest))
+    stats.delta_size = os.path.getsize(delta_path)
+    return stats
+
+
+def _read_file(file_path: str) -> Optional[bytes]:
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _delta_contents(zf: zipfile.ZipFile, manifest, read_base: Callable[[str], Optional[bytes]],
+                    wanted: Callable[[str], bool] = lambda member: True) -> Dict[str, bytes]:
+    """New contents of added and changed members (base contents and results checked against the delta hashes)
+
+    Every changed member must match its recorded base and every removed member that still exists must match
+    its recorded hash, so a mismatch is raised before the caller writes anything.
+    """
+    for member, sha256 in manifest['removed'].items():
+        if not wanted(member):
+            continue
+        base = read_base(member)
+        if base is not None and _sha256(base) != sha256:
+            raise ValueError(f"[{member}] to remove differs from the delta base [{manifest['base']}]")
+    contents = {}
+    for member, sha256 in manifest['added'].items():
+        if wanted(member):
+            contents[member] = zf.read(f"data/{member}")
+    for member, entry in manifest['changed'].items():
+        if not wanted(member):
+            continue
+        base = read_base(member)
+        if base is None or _sha256(base) != entry['base']:
+            raise ValueError(f"Base of [{member}] differs from the delta base [{manifest['base']}]")
+        if entry['patch']:
+            contents[member] = block_patch(base, zf.read(f"patch/{member}"))
+        else:
+            contents[member] = zf.read(f"data/{member}")
+    for member, content in contents.items():
+        expected = manifest['added'].get(member) or manifest['changed'][member]['sha256']
+        if _sha256(content) != expected:
+            raise ValueError(f"Bad checksum of [{member}] after applying the delta")
+    return contents
+
+
+def read_manifest(delta_path: str):
+    with zipfile.ZipFile(delta_path, 'r') as zf:
+        manifest = JsonBackend.loads_lenient(zf.read(DELTA_MANIFEST))
+    if manifest.get('format') != DELTA_FORMAT:
+        raise ValueError(f"Unsupported delta format [{manifest.get('format')}]")
+    return manifest
+
+
+def apply_delta(delta_path: str, targets: Dict[str, Callable[[str], Optional[str]]]) -> Dict[str, TargetResult]:
+    """Apply the delta to installed packs of every target (name -> member to installed path, None to skip)
+
+    New contents of a target are built and checked in memory before anything is written, so a target whose
+    installed changed or removed files do not match the delta base stays untouched and gets the error in its result.
+    """
+    manifest = read_manifest(delta_path)
+    results = {}
+    with zipfile.ZipFile(delta_path, 'r') as zf:
+        for name, install_path in targets.items():
+            result = results[name] = TargetResult()
+            start = time.perf_counter()
+            try:
+                contents = _delta_contents(zf, manifest, lambda member: _read_file(install_path(member)),
+                                           lambda member: bool(install_path(member)))
+                for member, content in contents.items():
+                    target_path = install_path(member)
+                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                    with open(target_path, 'wb') as f:
+                        f.write(content)
+                    result.files += 1
+                    result.bytes += len(content)
+                for member in manifest['removed']:
+                    target_path = install_path(member)
+                    if target_path and os.path.exists(target_path):
+                        os.remove(target_path)
+                        result.files += 1
+            except (OSError, ValueError) as e:
+                result.error = e
+            result.seconds = time.perf_counter() - start
+    return results
+
+
+def apply_delta_to_archive(base_archive: str, delta_path: str, output_path: str):
+    """Rebuild the target archive from the base archive and the delta"""
+    manifest = read_manifest(delta_path)
+    base = _archive_contents(base_archive)
+    with zipfile.ZipFile(delta_path, 'r') as zf:
+        contents = _delta_contents(zf, manifest, base.get)
+    for member in manifest['removed']:
+        base.pop(member, None)
+    base.update(contents)
+    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for member in sorted(base):
+            zf.writestr(member, base[member])
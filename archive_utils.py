@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Biblioteka z funkcjami rozpakowywania archiwów paczek (mmap + równoległy zapis)
+"""
+import mmap
+import os
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Nagłówek lokalny pliku ZIP: sygnatura + 26 bajtów, długości nazwy i pola extra na końcu
+LOCAL_HEADER = struct.Struct('<4s22xHH')
+LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+CHUNK_SIZE = 1024 * 1024
+
+
+def _data_offset(mm: mmap.mmap, info: zipfile.ZipInfo) -> int:
+    """Offset of member data in the archive (after the local header)"""
+    signature, name_length, extra_length = LOCAL_HEADER.unpack_from(mm, info.header_offset)
+    if signature != LOCAL_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile(f"Bad local header of [{info.filename}]")
+    return info.header_offset + LOCAL_HEADER.size + name_length + extra_length
+
+
+def _copy_range(src_fd: int, dst_fd: int, offset: int, count: int):
+    """Copy bytes between files inside the kernel (copy_file_range / sendfile) when the platform allows"""
+    copy_file_range = getattr(os, 'copy_file_range', None)
+    sendfile = getattr(os, 'sendfile', None)
+    if not copy_file_range and not sendfile:
+        raise OSError("No kernel copy available")
+    while count > 0:
+        if copy_file_range:
+            copied = copy_file_range(src_fd, dst_fd, count, offset)
+        else:
+            copied = sendfile(dst_fd, src_fd, offset, count)
+        if copied == 0:
+            raise EOFError("Unexpected end of archive")
+        offset += copied
+        count -= copied
+
+
+@dataclass
+class TargetResult:
+    """Wynik rozpakowania do jednego katalogu docelowego"""
+    files: int = 0
+    bytes: int = 0
+    # Czas zegarowy od pierwszego do ostatniego zapisu celu (wątki piszą równolegle, więc to nie suma czasów)
+    seconds: float = 0.0
+    error: Optional[Exception] = None
+    _started: Optional[float] = field(default=None, repr=False, compare=False)
+    _finished: Optional[float] = field(default=None, repr=False, compare=False)
+
+
+_results_lock = threading.Lock()
+
+
+def _timed(result: TargetResult, func: Callable, *args) -> bool:
+    """Run a write for one target, extend its wall-clock span and record the first error (the target is then skipped)"""
+    start = time.perf_counter()
+    try:
+        func(*args)
+        return True
+    except OSError as e:
+        result.error = result.error or e
+        return False
+    finally:
+        finish = time.perf_counter()
+        with _results_lock:
+            result._started = start if result._started is None else min(result._started, start)
+            result._finished = finish if result._finished is None else max(result._finished, finish)
+            result.seconds = result._finished - result._started
+
+
+def _inflate(mm: mmap.mmap, info: zipfile.ZipInfo) -> Iterator[bytes]:
+    """Decompress a DEFLATED member straight from the mapped archive, checking CRC-32"""
+    start = _data_offset(mm, info)
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    crc = 0
+    # Widoki mmap muszą być zwolnione przed zamknięciem mapowania
+    with memoryview(mm) as view, view[start:start + info.compress_size] as data:
+        for position in range(0, len(data), CHUNK_SIZE):
+            with data[position:position + CHUNK_SIZE] as compressed:
+                chunk = decompressor.decompress(compressed)
+            crc = zlib.crc32(chunk, crc)
+            yield chunk
+    chunk = decompressor.flush()
+    crc = zlib.crc32(chunk, crc)
+    yield chunk
+    if crc != info.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC-32 of [{info.filename}]")
+
+
+def _copy_stored(mm: mmap.mmap, src_fd: int, info: zipfile.ZipInfo, target_path: str):
+    start = _data_offset(mm, info)
+    with open(target_path, 'wb') as dst:
+        try:
+            _copy_range(src_fd, dst.fileno(), start, info.compress_size)
+        except (OSError, EOFError):
+            # Brak wsparcia w systemie plików — zapis wycinka mmap bez kopiowania w Pythonie
+            dst.seek(0)
+            dst.truncate()
+            with memoryview(mm) as view, view[start:start + info.compress_size] as data:
+                dst.write(data)
+
+
+def _read_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo) -> Iterator[bytes]:
+    with zf.open(info) as src:
+        yield from iter(lambda: src.read(CHUNK_SIZE), b'')
+
+
+def _extract_member(zf: zipfile.ZipFile, mm: mmap.mmap, src_fd: int, info: zipfile.ZipInfo,
+                    destinations: List[Tuple[TargetResult, str]]):
+    """Decode the member once and write it to every destination whose target has not failed"""
+    destinations = [(result, target_path) for result, target_path in destinations if not result.error]
+    written = []
+    if info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1:
+        for result, target_path in destinations:
+            if _timed(result, _copy_stored, mm, src_fd, info, target_path):
+                written.append(result)
+    else:
+        opened = []
+        for result, target_path in destinations:
+            try:
+                opened.append((result, open(target_path, 'wb')))
+            except OSError as e:
+                result.error = result.error or e
+        try:
+            if info.compress_type == zipfile.ZIP_DEFLATED and not info.flag_bits & 0x1:
+                chunks = _inflate(mm, info)
+            else:
+                # Szyfrowane i inne metody kompresji — zwykła ścieżka zipfile
+                chunks = _read_member(zf, info)
+            for chunk in chunks:
+                opened = [(result, dst) for result, dst in opened if _timed(result, dst.write, chunk)]
+        finally:
+            for result, dst in opened:
+                _timed(result, dst.close)
+        written = [result for result, dst in opened if not result.error]
+
+    with _results_lock:
+        for result in written:
+            result.files += 1
+            result.bytes += info.file_size
+
+
+def extract_to_targets(archive_path: str, targets: Dict[str, Dict[str, str]],
+                       workers: int = None) -> Dict[str, TargetResult]:
+    """Extract the archive once into several targets (name -> {member name -> path}) in parallel
+
+    Every member is decompressed once and written to all targets. Errors of one target (e.g. permissions)
+    are recorded in its result and do not stop the other targets; archive errors are raised.
+    """
+    results = {name: TargetResult() for name in targets}
+    member_destinations = {}
+    for name, member_paths in targets.items():
+        for target_dir in {os.path.dirname(target_path) for target_path in member_paths.values()}:
+            _timed(results[name], os.makedirs, target_dir, 0o777, True)
+        for member, target_path in member_paths.items():
+            member_destinations.setdefault(member, []).append((results[name], target_path))
+    if not member_destinations:
+        return results
+
+    with open(archive_path, 'rb') as archive, zipfile.ZipFile(archive_path, 'r') as zf, \
+            mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # zlib i zapis zwalniają GIL, więc wątki dzielą pracę między rdzenie i dyski
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_extract_member, zf, mm, archive.fileno(), zf.getinfo(member), destinations)
+                       for member, destinations in member_destinations.items()]
+            for future in futures:
+                future.result()
+    return results
+
+
+def extract_members(archive_path: str, targets: Dict[str, str], workers: int = None) -> int:
+    """Extract archive members to target paths (member name -> path) in parallel, return extracted bytes"""
+    result = extract_to_targets(archive_path, {'': targets}, workers)['']
+    if result.error:
+        raise result.error
+    return result.bytes
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for Minecraft Bedrock Addon tools over synthetic large projects
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from typing import Any, Callable, Dict, List
+
+from console_utils import ConsoleStyle
+from json_utils import JsonBackend
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = [1000, 10000, 50000]
+DEFAULT_TOLERANCE = 0.25
+# Czasy poniżej tej wartości (s) są porównywane z nią zamiast z bazą — milisekundowe potoki to głównie szum
+MIN_COMPARED_SECONDS = 0.05
+NAMESPACE = 'jct'
+LANGUAGES = ['en_US', 'pl_PL']
+BLOCKS_PER_TEXTURE = 16
+# Moduły uruchamianych skryptów i budżet czasu ich importu (ms)
+STARTUP_MODULES = ['build', 'verify_all', 'create_ramps']
+DEFAULT_STARTUP_BUDGET = 100.0
+
+
+def _png(seed: int, size: int = 16) -> bytes:
+    """Create a small RGBA PNG with seed-dependent pixels"""
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff)
+
+    rows = b''.join(
+        b'\x00' + bytes((seed * 7 + x * 13 + y * 31) % 256 for x in range(size * 4)) for y in range(size))
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', size, size, 8, 6, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(rows))
+            + chunk(b'IEND', b''))
+
+
+def _write_json(file_path: str, data: Any):
+    if os.path.dirname(file_path):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _manifest(pack_type: str) -> Dict[str, Any]:
+    return {
+        "format_version": 2,
+        "header": {"name": "Benchmark", "description": f"Benchmark {pack_type}",
+                   "uuid": f"00000000-0000-0000-0000-00000000000{1 if pack_type == 'data' else 2}",
+                   "version": [1, 0, 0], "min_engine_version": [1, 16, 0]},
+        "modules": [{"type": pack_type, "version": [1, 0, 0],
+                     "uuid": f"00000000-0000-0000-0000-00000000001{1 if pack_type == 'data' else 2}"}],
+    }
+
+
+def synthesize_project(project_dir: str, block_count: int):
+    """Create BP/RP tree with blocks, models, textures, lang keys and catalog using the generator schemas"""
+    from create_ramps import MinecraftAddon
+
+    cwd = os.getcwd()
+    os.makedirs(project_dir, exist_ok=True)
+    os.chdir(project_dir)
+    try:
+        for directory in ['BP/blocks/bench', 'BP/blocks/ramps/base_road_ramp',
+                          'BP/blocks/ramps/road_ramp_marking_straight', 'BP/blocks/ramps/road_ramp_oblique',
+                          'BP/item_catalog', 'RP/models/blocks/bench', 'RP/models/blocks/road_ramp',
+                          'RP/models/blocks/road_ramp_oblique', 'RP/textures/blocks', 'RP/texts']:
+            os.makedirs(directory, exist_ok=True)
+        shutil.copy(os.path.join(REPO_DIR, 'minecraft_textures.json'), 'minecraft_textures.json')
+        for pack in ('BP', 'RP'):
+            with open(f'{pack}/pack_icon.png', 'wb') as f:
+                f.write(_png(0))
+        _write_json('BP/manifest.json', _manifest('data'))
+        _write_json('RP/manifest.json', _manifest('resources'))
+        _write_json('config.json', {"type": "minecraftBedrock", "name": "Benchmark", "namespace": NAMESPACE,
+                                    "targetVersion": MinecraftAddon.FORMAT_VERSION})
+
+        texture_count = max(1, block_count // BLOCKS_PER_TEXTURE)
+        terrain_textures = {}
+        for texture_index in range(texture_count):
+            texture_id = f"bench_texture_{texture_index}"
+            terrain_textures[texture_id] = {"textures": f"textures/blocks/{texture_id}.png"}
+            with open(f"RP/textures/blocks/{texture_id}.png", 'wb') as f:
+                f.write(_png(texture_index))
+        _write_json('RP/textures/terrain_texture.json', {
+            "resource_pack_name": "vanilla", "texture_name": "atlas.terrain", "padding": 8, "num_mip_levels": 4,
+            "texture_data": terrain_textures,
+        })
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_blocks(block_count, texture_count)
+
+        groups = []
+        for group_start in range(0, block_count, 1000):
+            items = [f"{NAMESPACE}:bench_block_{i}" for i in range(group_start, min(block_count, group_start + 1000))]
+            groups.append({"group_identifier": {"icon": items[0], "name": f"{NAMESPACE}:bench_group_{group_start}"},
+                           "items": items})
+        _write_json('BP/item_catalog/crafting_item_catalog.json', {
+            "format_version": MinecraftAddon.FORMAT_VERSION,
+            "minecraft:crafting_items_catalog": {"categories": [{"category_name": "construction", "groups": groups}]},
+        })
+        _write_json('RP/blocks.json', {"format_version": "1.21.40",
+                                       **{f"bench_block_{i}": {"sound": "stone"} for i in range(block_count)}})
+
+        _write_json('RP/texts/languages.json', LANGUAGES)
+        for lang_name in LANGUAGES:
+            lines = [f"{group['group_identifier']['name']}=Group {index}" for index, group in enumerate(groups)]
+            lines.append('')
+            lines.extend(f"tile.{NAMESPACE}:bench_block_{i}.name=Bench Block {i} ({lang_name})"
+                         for i in range(block_count))
+            with open(f"RP/texts/{lang_name}.lang", 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+    finally:
+        os.chdir(cwd)
+
+
+def generate_blocks(block_count: int, texture_count: int):
+    """Emit block and geometry files through MinecraftAddon (the create_ramps generator)"""
+    from create_ramps import MinecraftAddon, RampAlgorithm
+
+    for i in range(block_count):
+        height = i % 16 + 1
+        bounds = MinecraftAddon.create_geometry_file('blocks/bench/', f"bench_block_h{i}",
+                                                     [RampAlgorithm._cube(-8, 0, -8, 16, height, 16)])
+        MinecraftAddon.create_block_file('bench/', f"bench_block_{i}", f"bench_block_h{i}", bounds, height)
+        # Podmień teksturę, aby każda tekstura była używana
+        block_path = f"BP/blocks/bench/bench_block_{i}.block.json"
+        with open(block_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data['minecraft:block']['components']['minecraft:material_instances']['*']['texture'] = \
+            f"bench_texture_{i % texture_count}"
+        with open(block_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _pipeline_verify(project_dir: str, block_count: int):
+    from minecraft_check import MinecraftUtils
+    for verify_func in [MinecraftUtils.verify_config, MinecraftUtils.verify_manifests,
+                        MinecraftUtils.verify_project_structure, MinecraftUtils.count_project_files,
+                        MinecraftUtils.verify_translations, MinecraftUtils.verify_blocks,
+                        MinecraftUtils.verify_models, MinecraftUtils.verify_textures]:
+        verify_func()
+
+
+def _pipeline_build(project_dir: str, block_count: int):
+    import build
+    output_dir = os.path.join(project_dir, 'dist')
+    os.makedirs(output_dir, exist_ok=True)
+    build.build_mcaddon([1, 0, 0], [1, 0, 0], 'benchmark', output_dir, 'bench', True)
+    shutil.rmtree(output_dir)
+
+
+def _pipeline_generate(project_dir: str, block_count: int):
+    from create_ramps import RoadRampOblique11250, RoadRampOblique22500, RoadRampStraight
+    generate_blocks(block_count, max(1, block_count // BLOCKS_PER_TEXTURE))
+    RoadRampOblique22500()
+    RoadRampOblique11250()
+    for parts in (2, 3, 4, 6, 8):
+        RoadRampStraight(parts)
+
+
+def _pipeline_json(project_dir: str, block_count: int) -> int:
+    """Parse every JSON file and dump it in pretty and compact mode, returning processed bytes"""
+    from json_utils import JsonBackend
+    processed = 0
+    for root, dirs, files in os.walk(project_dir):
+        for file in files:
+            if file.endswith('.json'):
+                file_path = os.path.join(root, file)
+                processed += os.path.getsize(file_path)
+                data = JsonBackend.load_file(file_path)
+                JsonBackend.dumps(data, compact=False)
+                JsonBackend.dumps(data, compact=True)
+    return processed
+
+
+def _pipeline_schema(project_dir: str, block_count: int):
+    """Validate every file with a schema (in worker processes for large projects)"""
+    import minecraft_schema
+    results = minecraft_schema.validate_files(minecraft_schema.project_files())
+    errors = [error for file_errors in results.values() for error in file_errors]
+    if errors:
+        raise AssertionError(f"Synthetic project failed schema validation: {errors[0]}")
+
+
+def _pipeline_structure(project_dir: str, block_count: int) -> int:
+    """Build a 4-lane road prefab block_count blocks long, encode it as .mcstructure and decode it back"""
+    import road_prefabs
+    from minecraft_structure import Structure
+    names = [road_prefabs.SURFACE, road_prefabs.LINE]
+    catalog = road_prefabs.BlockCatalog(NAMESPACE, {f"{NAMESPACE}:{name}": {'minecraft:cardinal_direction'}
+                                                    for name in names})
+    structure = road_prefabs.straight(catalog, lanes=4, length=block_count)
+    written = structure.save(os.path.join(project_dir, 'bench.mcstructure'))
+    if not (Structure.load(os.path.join(project_dir, 'bench.mcstructure')).blocks == structure.blocks).all():
+        raise AssertionError("Structure round trip changed block indices")
+    return written
+
+
+PIPELINES: Dict[str, Callable[[str, int], Any]] = {
+    'verify': _pipeline_verify,
+    'build': _pipeline_build,
+    'generate': _pipeline_generate,
+    'json': _pipeline_json,
+    'schema': _pipeline_schema,
+    'structure': _pipeline_structure,
+}
+
+
+def measure(pipeline: Callable[[str, int], Any], project_dir: str, block_count: int,
+            with_memory: bool = True) -> Dict[str, float]:
+    """Run the pipeline inside the project directory, measuring time and (in a second run) peak memory"""
+    cwd = os.getcwd()
+    os.chdir(project_dir)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            processed_bytes = pipeline(project_dir, block_count)
+            seconds = time.perf_counter() - start
+            result = {
+                'seconds': round(seconds, 4),
+                'blocks_per_second': round(block_count / seconds, 1) if seconds else 0.0,
+            }
+            if processed_bytes and seconds:
+                result['mb_per_second'] = round(processed_bytes / 1024 / 1024 / seconds, 2)
+            if with_memory:
+                tracemalloc.start()
+                pipeline(project_dir, block_count)
+                result['peak_memory_mb'] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+                tracemalloc.stop()
+    finally:
+        os.chdir(cwd)
+    return result
+
+
+def run_benchmarks(sizes: List[int], pipelines: List[str], with_memory: bool = True,
+                   work_dir: str = None) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, Any]] = {name: {} for name in pipelines}
+    for block_count in sizes:
+        project_dir = tempfile.mkdtemp(prefix=f"bench_{block_count}_", dir=work_dir)
+        try:
+            print(ConsoleStyle.process(f"Synthesizing project with [{block_count}] blocks..."))
+            synthesize_project(project_dir, block_count)
+            for name in pipelines:
+                print(ConsoleStyle.process(f"Running [{name}] on [{block_count}] blocks..."))
+                results[name][str(block_count)] = measure(PIPELINES[name], project_dir, block_count, with_memory)
+        finally:
+            shutil.rmtree(project_dir, ignore_errors=True)
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def measure_startup(module: str, repeat: int = 5) -> float:
+    """Return the best cumulative import time of the module in ms, measured with `python -X importtime`"""
+    best = None
+    for _ in range(repeat):
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                 cwd=REPO_DIR, capture_output=True, text=True, check=True)
+        for line in process.stderr.splitlines():
+            parts = [part.strip() for part in line.split('|')]
+            if len(parts) == 3 and parts[2] == module:
+                cumulative = int(parts[1]) / 1000
+                best = cumulative if best is None else min(best, cumulative)
+    return round(best, 2)
+
+
+def check_startup(budget: float) -> List[str]:
+    """Measure startup of the CLI modules and return the ones over budget"""
+    over_budget = []
+    stats = {}
+    for module in STARTUP_MODULES:
+        elapsed = measure_startup(module)
+        stats[module] = f"[{elapsed}] ms"
+        if elapsed > budget:
+            over_budget.append(f"{module} import takes {elapsed} ms (budget {budget} ms)")
+    ConsoleStyle.print_stats(stats, "STARTUP (import time)", '-')
+    return over_budget
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return regressions where time or peak memory exceed the baseline by more than tolerance"""
+    regressions = []
+    for name, sizes in current['results'].items():
+        for block_count, metrics in sizes.items():
+            base = baseline.get('results', {}).get(name, {}).get(block_count)
+            if not base:
+                continue
+            for metric in ('seconds', 'peak_memory_mb'):
+                if metric not in metrics or not base.get(metric):
+                    continue
+                limit = max(base[metric], MIN_COMPARED_SECONDS) if metric == 'seconds' else base[metric]
+                if metrics[metric] > limit * (1 + tolerance):
+                    regressions.append(f"{name}[{block_count}] {metric}: {metrics[metric]} > {base[metric]} "
+                                       f"(+{(metrics[metric] / base[metric] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark verify/build/generate on synthetic add-on projects",
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog="""
+examples:
+  python3 benchmark.py --sizes 1000 --save benchmark_baseline.json
+  python3 benchmark.py --sizes 1000 --check benchmark_baseline.json
+  python3 benchmark.py --startup --startup-budget 100
+                                     """)
+    parser.add_argument("--sizes", type=lambda x: [int(v) for v in x.split(',')], default=DEFAULT_SIZES,
+                        help="comma separated block counts (default: 1000,10000,50000)")
+    parser.add_argument("--pipeline", action='append', choices=list(PIPELINES),
+                        help="pipeline to run (repeatable, default: all)")
+    parser.add_argument("--no-memory", action='store_true', help="skip peak memory measurement")
+    parser.add_argument("--save", metavar='FILE', help="save results as JSON baseline")
+    parser.add_argument("--check", metavar='FILE', help="compare with JSON baseline and fail on regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"allowed slowdown ratio for --check (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--work-dir", help="directory for synthetic projects (default: system temp)")
+    parser.add_argument("--startup", action='store_true',
+                        help="only check CLI import time against --startup-budget")
+    parser.add_argument("--startup-budget", type=float, default=DEFAULT_STARTUP_BUDGET,
+                        help=f"import time budget in ms (default: {DEFAULT_STARTUP_BUDGET})")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_DIR)
+    ConsoleStyle.print_section("BENCHMARK", icon="⏱️")
+    if args.startup:
+        over_budget = check_startup(args.startup_budget)
+        for message in over_budget:
+            print(ConsoleStyle.error(message))
+        if over_budget:
+            sys.exit(1)
+        print(ConsoleStyle.success("Startup within budget"))
+        return
+    report = run_benchmarks(args.sizes, args.pipeline or list(PIPELINES), not args.no_memory, args.work_dir)
+    report['json_backend'] = {'loads': JsonBackend.LOADS_BACKEND, 'dumps': JsonBackend.DUMPS_BACKEND}
+
+    for name, sizes in report['results'].items():
+        ConsoleStyle.print_stats({
+            f"{block_count} blocks": f"[{m['seconds']}] s, [{m['blocks_per_second']}] blocks/s"
+                                     + (f", [{m['mb_per_second']}] MB/s" if 'mb_per_second' in m else '')
+                                     + (f", [{m['peak_memory_mb']}] MB peak" if 'peak_memory_mb' in m else '')
+            for block_count, m in sizes.items()
+        }, name.upper(), '-')
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(ConsoleStyle.success(f"Baseline saved to [{args.save}]"))
+
+    if args.check:
+        with open(args.check, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            for regression in regressions:
+                print(ConsoleStyle.error(regression))
+            sys.exit(1)
+        print(ConsoleStyle.success("No regressions against baseline"))
+
+
+if __name__ == "__main__":
+    main()
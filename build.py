@@ -4,17 +4,31 @@ Build Script for Minecraft Bedrock Addon
 """
 
 import os
-import json
+import sys
+import time
 import shutil
 import zipfile
 import argparse
 from datetime import datetime
 from pathlib import Path
-from console_utils import ConsoleStyle
+from console_utils import ConsoleStyle, Profiler
+from json_utils import JsonBackend
+from scan_utils import ProjectScanner, scan_files
+from pack_version import MANIFEST_FILE, content_hash, dependency_order, is_packaged, read_content_hash, \
+    write_content_hash
 
 # Pack name from directory name
 PACK_NAME = os.path.basename(os.getcwd()).replace(" ", "_").replace("-", "_").lower()
 
+PACK_DIRS = ['BP', 'RP']
+
+# Install targets file: list of directories or {"name": "directory"} ("auto" = detected local Minecraft)
+INSTALL_TARGETS_FILE = 'install_targets.json'
+
+# Watch mode inputs
+GENERATOR_SCRIPT = 'create_ramps.py'
+WATCH_PATHS = ['BP', 'RP', 'config.json', GENERATOR_SCRIPT]
+
 
 def get_minecraft_dir():
     """Try to auto-detect Minecraft com.mojang folder"""
@@ -50,48 +64,190 @@ def remove_existing_packs(mc_dir):
         shutil.rmtree(rp_dir)
 
 
-def install_mcaddon(mcaddon_path, clean_existing=True):
-    """Install .mcaddon file to the local Minecraft directory"""
+def get_install_path(mc_dir, file_path):
+    """Map BP/ and RP/ paths to the installed pack location (None for other paths)"""
+    if file_path.startswith('BP/'):
+        return os.path.join(mc_dir, 'behavior_packs', PACK_NAME, os.path.relpath(file_path, 'BP'))
+    if file_path.startswith('RP/'):
+        return os.path.join(mc_dir, 'resource_packs', PACK_NAME, os.path.relpath(file_path, 'RP'))
+    return None
+
+
+def install_files(mc_dir, file_paths):
+    """Copy changed pack files into the installed packs; files missing in the source are removed"""
+    file_count = 0
+    for file_path in file_paths:
+        target_path = get_install_path(mc_dir, file_path)
+        if not target_path or not is_packaged(os.path.basename(file_path)) or \
+                ProjectScanner.shared().is_ignored(file_path):
+            continue
+        if os.path.exists(file_path):
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            shutil.copy2(file_path, target_path)
+        elif os.path.exists(target_path):
+            os.remove(target_path)
+        else:
+            continue
+        file_count += 1
+    return file_count
+
+
+def watch(run_verification=True):
+    """Watch sources, regenerate/verify what changed and sync changed files into the installed packs"""
+    import subprocess
+    from minecraft_check import MinecraftUtils
+    from watch_utils import FileWatcher
+
     mc_dir = get_minecraft_dir()
     if not mc_dir:
-        print(ConsoleStyle.error("Cannot auto-detect Minecraft com.mojang directory. Installation failed."))
+        print(ConsoleStyle.error("Cannot auto-detect Minecraft com.mojang directory. Watch mode failed."))
         return False
 
+    watcher = FileWatcher([path for path in WATCH_PATHS if os.path.exists(path)])
+    ConsoleStyle.print_section("WATCH MODE", icon="👀")
     print(ConsoleStyle.info(f"Minecraft directory [{mc_dir}]"))
+    print(ConsoleStyle.info(f"Watching [{', '.join(watcher.paths)}] using [{watcher.backend}]"))
+
+    file_count = install_files(mc_dir, sorted(watcher.state))
+    print(ConsoleStyle.success(f"Initial sync of [{file_count}] files"))
+
+    try:
+        while True:
+            changed = watcher.wait_for_changes()
+            start = time.perf_counter()
+
+            if GENERATOR_SCRIPT in changed:
+                print(ConsoleStyle.process(f"Generator changed, running [{GENERATOR_SCRIPT}]..."))
+                subprocess.run([sys.executable, GENERATOR_SCRIPT], check=False)
+                changed.update(watcher.poll())
+
+            if run_verification:
+                verifications = MinecraftUtils.affected_verifications(changed)
+                if verifications:
+                    MinecraftUtils.verification_summary(verifications, exit_on_finish=False)
+
+            file_count = install_files(mc_dir, sorted(changed))
+            elapsed = (time.perf_counter() - start) * 1000
+            print(ConsoleStyle.success(f"Synced [{file_count}] changed files in [{elapsed:.0f}] ms"))
+    except KeyboardInterrupt:
+        print(ConsoleStyle.info("Watch mode stopped"))
+    finally:
+        watcher.stop()
+    return True
 
-    # Remove existing packs if requested
-    if clean_existing:
-        remove_existing_packs(mc_dir)
-
-    # Install new packs
-    print(ConsoleStyle.process("Installing new packs..."))
-    file_count = 0
 
-    with zipfile.ZipFile(mcaddon_path, 'r') as zf:
-        for member in zf.namelist():
-            if member.startswith('BP/'):
-                out_dir = os.path.join(mc_dir, 'behavior_packs', PACK_NAME)
-                rel_path = os.path.relpath(member, 'BP')
-            elif member.startswith('RP/'):
-                out_dir = os.path.join(mc_dir, 'resource_packs', PACK_NAME)
-                rel_path = os.path.relpath(member, 'RP')
-            else:
+def get_install_targets(target_dirs=None, targets_file=None):
+    """Resolve install targets (name -> com.mojang or BDS directory) from arguments and targets file"""
+    entries = []
+    if targets_file:
+        data = JsonBackend.load_file(targets_file)
+        entries += list(data.items()) if isinstance(data, dict) else [(target_dir, target_dir) for target_dir in data]
+    entries += [(target_dir, target_dir) for target_dir in target_dirs or []]
+    if not entries:
+        entries = [('local', 'auto')]
+
+    targets = {}
+    for name, target_dir in entries:
+        if target_dir == 'auto':
+            target_dir = get_minecraft_dir()
+            if not target_dir:
+                print(ConsoleStyle.error("Cannot auto-detect Minecraft com.mojang directory."))
                 continue
-            target_path = os.path.join(out_dir, rel_path)
-            os.makedirs(os.path.dirname(target_path), exist_ok=True)
-            with zf.open(member) as src, open(target_path, 'wb') as dst:
-                shutil.copyfileobj(src, dst)
-            file_count += 1
+        targets[name] = target_dir
+    return targets
+
+
+def print_install_results(results, install_targets):
+    """Display installation result of every target, return whether all targets succeeded"""
+    if len(install_targets) > 1:
+        ConsoleStyle.print_stats({
+            (ConsoleStyle.error(name) if result.error else ConsoleStyle.success(name)):
+                f"{result.error}" if result.error
+                else f"[{result.files}] files, [{result.bytes / 1024 / 1024:.2f}] MB in [{result.seconds * 1000:.0f}] ms"
+            for name, result in results.items()
+        }, "INSTALL TARGETS", icon="🎯")
+    for name, result in results.items():
+        if result.error:
+            print(ConsoleStyle.error(f"Installation to [{name}] failed: {result.error}"))
+        else:
+            print(ConsoleStyle.success(f"Installed [{result.files}] files"))
+            ConsoleStyle.print_installation_info(PACK_NAME, install_targets[name])
+    return all(not result.error for result in results.values())
+
+
+def install_delta(delta_path, install_targets):
+    """Apply a delta bundle to packs installed from its base archive in every target"""
+    from archive_delta import apply_delta, read_manifest
+    from archive_utils import TargetResult
+
+    manifest = read_manifest(delta_path)
+    print(ConsoleStyle.info(f"Delta [{manifest['base']}] -> [{manifest['target']}]: [{len(manifest['added'])}] added, "
+                            f"[{len(manifest['changed'])}] changed, [{len(manifest['removed'])}] removed"))
+    results = {}
+    targets = {}
+    for name, mc_dir in install_targets.items():
+        print(ConsoleStyle.info(f"Minecraft directory [{mc_dir}]"))
+        if not os.path.isdir(mc_dir):
+            results[name] = TargetResult(error=FileNotFoundError(f"Directory not found: {mc_dir}"))
+            continue
+        targets[name] = lambda member, mc_dir=mc_dir: get_install_path(mc_dir, member)
+
+    print(ConsoleStyle.process("Applying delta to installed packs..."))
+    with Profiler.stage("install_delta"):
+        results.update(apply_delta(delta_path, targets))
+    Profiler.add_bytes("install_delta", sum(result.bytes for result in results.values()))
+    return print_install_results(results, install_targets)
+
+
+def install_mcaddon(mcaddon_path, clean_existing=True, install_targets=None):
+    """Install .mcaddon file to the local Minecraft directory (or to all given targets at once)
+
+    A delta bundle (.mcdelta) is applied to the packs already installed from its base archive instead.
+    """
+    from archive_delta import DELTA_EXTENSION
+    from archive_utils import TargetResult, extract_to_targets
+
+    if install_targets is None:
+        install_targets = get_install_targets()
+    if not install_targets:
+        print(ConsoleStyle.error("No install target. Installation failed."))
+        return False
+    if mcaddon_path.endswith(DELTA_EXTENSION):
+        return install_delta(mcaddon_path, install_targets)
 
-    print(ConsoleStyle.success(f"Installed [{file_count}] files"))
-    ConsoleStyle.print_installation_info(PACK_NAME, mc_dir)
-    return True
+    with zipfile.ZipFile(mcaddon_path, 'r') as zf:
+        members = [member for member in zf.namelist() if not member.endswith('/')]
+
+    results = {}
+    targets = {}
+    for name, mc_dir in install_targets.items():
+        print(ConsoleStyle.info(f"Minecraft directory [{mc_dir}]"))
+        if not os.path.isdir(mc_dir):
+            results[name] = TargetResult(error=FileNotFoundError(f"Directory not found: {mc_dir}"))
+            continue
+
+        # Remove existing packs if requested
+        if clean_existing:
+            start = time.perf_counter()
+            remove_existing_packs(mc_dir)
+            results[name] = TargetResult(seconds=time.perf_counter() - start)
+        targets[name] = {member: get_install_path(mc_dir, member) for member in members
+                         if get_install_path(mc_dir, member)}
+
+    # Install new packs — każdy plik archiwum jest rozpakowany raz i zapisany do wszystkich celów
+    print(ConsoleStyle.process("Installing new packs..."))
+    with Profiler.stage("install"):
+        for name, result in extract_to_targets(mcaddon_path, targets).items():
+            result.seconds += results[name].seconds if name in results else 0.0
+            results[name] = result
+    Profiler.add_bytes("install", sum(result.bytes for result in results.values()))
+    return print_install_results(results, install_targets)
 
 
+@Profiler.profiled("read_manifest")
 def read_manifest(file_path):
     """Read manifest file and return name and version"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = JsonBackend.load_file(file_path)
     return data['header']['name'], data['header']['version']
 
 
@@ -102,10 +258,10 @@ def bump_version(version):
     return new_version
 
 
-def update_version(file_path, new_version):
-    """Update version in manifest file"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+@Profiler.profiled("update_version")
+def update_version(file_path, new_version, dependency_versions=None):
+    """Update version in manifest file (and versions of dependencies on packs given as uuid -> version)"""
+    data = JsonBackend.load_file(file_path)
 
     data['header']['version'] = new_version
 
@@ -114,18 +270,128 @@ def update_version(file_path, new_version):
         if 'version' in module:
             module['version'] = new_version
 
-    # Update all dependency versions EXCEPT @minecraft/server
+    # Update versions of dependencies on our other packs (script modules like @minecraft/server are kept)
     for dependency in data.get('dependencies', []):
-        if 'version' in dependency:
-            # Don't update @minecraft/server version - keep it as "1.19.0"
-            if dependency.get('module_name') != '@minecraft/server':
-                dependency['version'] = new_version
+        if dependency.get('uuid') in (dependency_versions or {}):
+            dependency['version'] = dependency_versions[dependency['uuid']]
+
+    JsonBackend.dump_file(file_path, data, compact=False)
+
+
+@Profiler.profiled("bump_changed_versions")
+def bump_changed_versions(pack_dirs=None, force=False):
+    """Bump the patch version of packs whose content hash changed, return pack -> (old version, new version)
+
+    Packs are processed after the packs they depend on, so a bumped dependency version changes the dependent
+    manifest (and bumps it too). A pack without a recorded hash is bumped; a recorded version different from
+    the manifest means a manual version change, which is only recorded.
+    """
+    versions = {}
+    result = {}
+    for pack_dir in dependency_order(pack_dirs or PACK_DIRS):
+        manifest_path = os.path.join(pack_dir, MANIFEST_FILE)
+        data = JsonBackend.load_file(manifest_path)
+        version = data['header']['version']
+        if any(dependency.get('uuid') in versions and dependency.get('version') != versions[dependency['uuid']]
+               for dependency in data.get('dependencies', [])):
+            update_version(manifest_path, version, versions)
+
+        sha256 = content_hash(pack_dir)
+        stored = read_content_hash(pack_dir)
+        new_version = version
+        if force or stored is None or (stored.get('version') == version and stored.get('sha256') != sha256):
+            new_version = bump_version(version)
+            update_version(manifest_path, new_version, versions)
+        write_content_hash(pack_dir, sha256, new_version)
+        versions[data['header']['uuid']] = new_version
+        result[pack_dir] = (version, new_version)
+    return result
+
+
+def scan_directory(directory):
+    """List files to be packaged from the directory (without ignored files and the content hash file)"""
+    with Profiler.stage(f"scan {directory}"):
+        return [file_path for file_path in scan_files(directory) if is_packaged(os.path.basename(file_path))]
+
+
+def minify_json(file_path):
+    """Return minified JSON content of the file, or None when it cannot be parsed"""
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    try:
+        data = JsonBackend.loads_lenient(content)
+    except ValueError as e:
+        print(ConsoleStyle.warning(f"Cannot minify [{file_path}], adding as is: {e}"))
+        return None
+    return JsonBackend.dumps(data, compact=True).encode('utf-8')
+
+
+def add_directory_to_zip(zipf, directory, minify=False, prune=None):
+    """Add all files from the directory to the archive (arc name equals file path)
+
+    With minify, JSON files are minified in memory while streaming into the archive (the source tree is untouched).
+    With prune (PrunePlan), unreachable assets are skipped and files with removed entries are written rewritten.
+    Returns original and written size of JSON files.
+    """
+    json_original_size = 0
+    json_written_size = 0
+    for file_path in scan_directory(directory):
+        if prune:
+            plan_path = file_path.replace(os.sep, '/')
+            if plan_path in prune.files:
+                continue
+            if plan_path in prune.rewritten:
+                content = prune.rewritten[plan_path]
+                zinfo = zipfile.ZipInfo.from_file(file_path, file_path)
+                zinfo.compress_type = zipf.compression
+                if minify and file_path.endswith('.json'):
+                    content = JsonBackend.dumps(JsonBackend.loads_lenient(content), compact=True).encode('utf-8')
+                    json_original_size += zinfo.file_size
+                    json_written_size += len(content)
+                zipf.writestr(zinfo, content)
+                continue
+        if minify and file_path.endswith('.json'):
+            with Profiler.stage("minify_json"):
+                content = minify_json(file_path)
+            if content is not None:
+                zinfo = zipfile.ZipInfo.from_file(file_path, file_path)
+                zinfo.compress_type = zipf.compression
+                json_original_size += zinfo.file_size
+                json_written_size += len(content)
+                with Profiler.stage("zipf.write", len(content)):
+                    zipf.writestr(zinfo, content)
+                continue
+        if Profiler.ENABLED:
+            with Profiler.stage("zipf.write", ProjectScanner.shared().stat(file_path).st_size):
+                zipf.write(file_path, file_path)
+        else:
+            zipf.write(file_path, file_path)
+    return json_original_size, json_written_size
+
+
+def print_minify_info(json_original_size, json_written_size):
+    """Display size reduction of minified JSON files"""
+    if not json_original_size:
+        return
+    saved = json_original_size - json_written_size
+    print(ConsoleStyle.info(f"Minified JSON: [{json_original_size / 1024:.1f}] KB -> [{json_written_size / 1024:.1f}] KB "
+                            f"(saved [{saved / 1024:.1f}] KB, [{saved / json_original_size * 100:.1f}]%)"))
 
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
 
+def print_prune_info(plan):
+    """Display assets removed by tree-shaking"""
+    ConsoleStyle.print_stats({
+        ConsoleStyle.info("Removed files"): f"[{len(plan.files)}]",
+        ConsoleStyle.info("Removed texture/sound definitions"): f"[{len(plan.definitions)}]",
+        ConsoleStyle.info("Removed lang keys"): f"[{len(plan.lang_keys)}]",
+        ConsoleStyle.info("Removed size"): f"[{plan.removed_bytes / 1024:.1f}] KB",
+    }, "PRUNED ASSETS", icon="✂️")
+    for file_path in sorted(plan.files):
+        print(ConsoleStyle.delete(file_path, padding=2))
 
-def build_mcaddon(bp_version, rp_version, plugin_name, output_dir, timestamp, simplify_name):
+
+def build_mcaddon(bp_version, rp_version, plugin_name, output_dir, timestamp, simplify_name, minify=False,
+                  prune=None):
     """Build the .mcaddon package"""
     if simplify_name:
         mcaddon_name = f"{plugin_name}.mcaddon"
@@ -136,31 +402,18 @@ def build_mcaddon(bp_version, rp_version, plugin_name, output_dir, timestamp, si
     print(ConsoleStyle.process(f"Building {mcaddon_name}..."))
 
     with zipfile.ZipFile(mcaddon_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        # Add BP files
-        for root, dirs, files in os.walk('BP'):
-            for file in files:
-                if file.endswith('.DS_Store'):
-                    continue
-                file_path = os.path.join(root, file)
-                arc_name = file_path
-                zipf.write(file_path, arc_name)
-
-        # Add RP files
-        for root, dirs, files in os.walk('RP'):
-            for file in files:
-                if file.endswith('.DS_Store'):
-                    continue
-                file_path = os.path.join(root, file)
-                arc_name = file_path
-                zipf.write(file_path, arc_name)
+        bp_original_size, bp_written_size = add_directory_to_zip(zipf, 'BP', minify, prune)
+        rp_original_size, rp_written_size = add_directory_to_zip(zipf, 'RP', minify, prune)
 
     mcaddon_size = os.path.getsize(mcaddon_path) / 1024 / 1024
     ConsoleStyle.print_build_info("MCADDON", mcaddon_path, f"{mcaddon_size:.2f} MB")
+    print_minify_info(bp_original_size + rp_original_size, bp_written_size + rp_written_size)
 
     return mcaddon_path, mcaddon_size
 
 
-def build_mcpack(bp_version, rp_version, bp_plugin_name, rp_plugin_name, output_dir, timestamp, simplify_name):
+def build_mcpack(bp_version, rp_version, bp_plugin_name, rp_plugin_name, output_dir, timestamp, simplify_name,
+                 minify=False, prune=None):
     """Build separate .mcpack files for BP and RP"""
 
     # Build BP .mcpack
@@ -173,16 +426,11 @@ def build_mcpack(bp_version, rp_version, bp_plugin_name, rp_plugin_name, output_
     print(ConsoleStyle.process(f"Building {bp_mcpack_name}..."))
 
     with zipfile.ZipFile(bp_mcpack_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk('BP'):
-            for file in files:
-                if file.endswith('.DS_Store'):
-                    continue
-                file_path = os.path.join(root, file)
-                arc_name = file_path
-                zipf.write(file_path, arc_name)
+        bp_original_size, bp_written_size = add_directory_to_zip(zipf, 'BP', minify, prune)
 
     bp_size = os.path.getsize(bp_mcpack_path) / 1024 / 1024
     ConsoleStyle.print_build_info("BP MCPACK", bp_mcpack_path, f"{bp_size:.2f} MB")
+    print_minify_info(bp_original_size, bp_written_size)
 
     # Build RP .mcpack
     if simplify_name:
@@ -194,31 +442,67 @@ def build_mcpack(bp_version, rp_version, bp_plugin_name, rp_plugin_name, output_
     print(ConsoleStyle.process(f"Building {rp_mcpack_path}..."))
 
     with zipfile.ZipFile(rp_mcpack_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk('RP'):
-            for file in files:
-                if file.endswith('.DS_Store'):
-                    continue
-                file_path = os.path.join(root, file)
-                arc_name = file_path
-                zipf.write(file_path, arc_name)
+        rp_original_size, rp_written_size = add_directory_to_zip(zipf, 'RP', minify, prune)
 
     rp_size = os.path.getsize(rp_mcpack_path) / 1024 / 1024
     ConsoleStyle.print_build_info("RP MCPACK", rp_mcpack_path, f"{rp_size:.2f} MB")
+    print_minify_info(rp_original_size, rp_written_size)
 
     return bp_mcpack_path, rp_mcpack_path, bp_size, rp_size
 
 
+def preserve_delta_bases(base_paths, output_dir):
+    """Copy previous archives from the output directory (cleaned before building) to a temporary directory"""
+    import tempfile
+
+    preserved = []
+    temp_dir = None
+    for base_path in base_paths:
+        if not os.path.isfile(base_path):
+            print(ConsoleStyle.error(f"Delta base archive not found: {base_path}"))
+            sys.exit(1)
+        if os.path.abspath(base_path).startswith(os.path.abspath(output_dir) + os.sep):
+            temp_dir = temp_dir or tempfile.mkdtemp(prefix='delta_base_')
+            base_path = shutil.copy2(base_path, temp_dir)
+        preserved.append(base_path)
+    return preserved
+
+
+def build_delta(base_path, built_archives, output_dir):
+    """Write a delta bundle from the base archive to the new archive of the same kind (None when none was built)"""
+    from archive_delta import DELTA_EXTENSION, create_delta
+
+    def pack_dirs(archive_path):
+        with zipfile.ZipFile(archive_path, 'r') as zf:
+            return {member.split('/', 1)[0] for member in zf.namelist()}
+
+    base_dirs = pack_dirs(base_path)
+    target_path = next((archive_path for archive_path in built_archives
+                        if os.path.splitext(archive_path)[1] == os.path.splitext(base_path)[1]
+                        and pack_dirs(archive_path) == base_dirs), None)
+    if target_path is None:
+        print(ConsoleStyle.warning(f"No new archive of the same kind as [{base_path}], delta skipped"))
+        return None
+
+    # Nazwa zawiera też bazę, żeby kilka --delta-from do tego samego wydania się nie nadpisywało
+    delta_name = f"{os.path.splitext(os.path.basename(target_path))[0]}.from-" \
+                 f"{os.path.splitext(os.path.basename(base_path))[0]}{DELTA_EXTENSION}"
+    delta_path = os.path.join(output_dir, delta_name)
+    with Profiler.stage("build_delta"):
+        stats = create_delta(base_path, target_path, delta_path)
+    ConsoleStyle.print_build_info("DELTA", delta_path, f"{stats.delta_size / 1024:.1f} KB")
+    print(ConsoleStyle.info(f"[{stats.added}] added, [{stats.changed}] changed ([{stats.patched}] as block diffs), "
+                            f"[{stats.removed}] removed, [{stats.unchanged}] unchanged; "
+                            f"[{stats.delta_size / 1024:.1f}] KB instead of [{stats.target_size / 1024:.1f}] KB"))
+    return delta_path
+
+
 def count_files():
     """Count total files in BP and RP directories"""
-    file_count = 0
-    for root, dirs, files in os.walk("BP"):
-        file_count += len(files)
-    for root, dirs, files in os.walk("RP"):
-        file_count += len(files)
-    return file_count
+    return len(scan_files("BP")) + len(scan_files("RP"))
 
 
-def main():
+def main(argv=None):
     """Main build function"""
     parser = argparse.ArgumentParser(description=f"Build {PACK_NAME} Minecraft Addon",
                                      formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -226,26 +510,66 @@ def main():
 examples:
   python3 build.py --mcaddon
   python3 build.py --all --test-on-local
+  python3 build.py --mcaddon --install-target auto --install-target /srv/bds/worlds/test
   python3 build.py --mcpack --no-bump
+  python3 build.py --all --minify
+  python3 build.py --all --minify --prune
+  python3 build.py --watch
+  python3 build.py --matrix build_matrix.json --no-bump
+  python3 build.py --mcaddon --delta-from releases/previous.mcaddon
+  python3 build.py --apply-delta dist/pack.from-previous.mcdelta --install-target /srv/bds/mirror
                                      """
                                      )
     parser.add_argument("--mcaddon", '-a', action="store_true", help="build .mcaddon package")
     parser.add_argument("--mcpack", '-p', action="store_true", help="build separate .mcpack packages")
     parser.add_argument("--all", action="store_true", help="build all package types")
     parser.add_argument("--no-bump", '-n', action="store_true", help="don't bump version")
+    parser.add_argument("--force-bump", action="store_true",
+                        help="bump version of all packs (by default only packs whose content changed are bumped)")
     parser.add_argument("--test-on-local", '-t', action="store_true", help="install to local Minecraft after building")
     parser.add_argument('--no-clean', '-c', action='store_true',
                         help='do not clean old packages before installation (only with --test-on-local)')
+    parser.add_argument("--install-target", '-i', action='append', metavar='DIR',
+                        help="install into com.mojang or BDS directory (repeatable, 'auto' = local Minecraft)")
+    parser.add_argument("--install-targets-file", nargs='?', const=INSTALL_TARGETS_FILE, metavar='FILE',
+                        help=f"install into directories listed in JSON file (default: {INSTALL_TARGETS_FILE})")
     parser.add_argument('--simplify-name', '-s', action='store_true',
                         help='simplify package file name (do not append version and timestamp)')
     parser.add_argument("--output", '-o', default="dist", help="output directory")
+    parser.add_argument("--minify", '-m', action="store_true",
+                        help="minify JSON files in packages (release build, source files are not changed)")
+    parser.add_argument("--matrix", nargs='?', const='build_matrix.json', metavar='FILE',
+                        help="build all pack variants described in the build matrix file (default: build_matrix.json)")
+    parser.add_argument("--delta-from", action='append', metavar='ARCHIVE',
+                        help="also write a delta bundle (.mcdelta) from a previous .mcaddon/.mcpack to the new one "
+                             "(repeatable)")
+    parser.add_argument("--apply-delta", metavar='DELTA',
+                        help="apply a delta bundle to installed packs (local Minecraft or --install-target) and exit")
+    parser.add_argument("--prune", action="store_true",
+                        help="leave out models, textures, sounds and lang keys unreachable from catalog/database")
+    parser.add_argument("--profile", nargs='?', const='', metavar='FILE',
+                        help="print timing of build stages (and save flame graph stacks to FILE)")
+    parser.add_argument("--watch", '-w', action="store_true",
+                        help="watch BP/RP and generator, verify changes and sync them into local Minecraft")
+    parser.add_argument("--no-verify", action="store_true", help="skip verification in watch mode")
+
+    args = parser.parse_args(argv)
+
+    if args.watch:
+        watch(not args.no_verify)
+        return
 
-    args = parser.parse_args()
+    if args.apply_delta:
+        install_targets = get_install_targets(args.install_target, args.install_targets_file)
+        if not install_mcaddon(args.apply_delta, install_targets=install_targets):
+            sys.exit(1)
+        return
 
-    if not any([args.mcaddon, args.mcpack, args.all]):
+    if not any([args.mcaddon, args.mcpack, args.all, args.matrix]):
         parser.print_help()
         return
 
+    Profiler.set_enabled(args.profile is not None)
     ConsoleStyle.print_section("BUILDING MINECRAFT PACKAGES", icon="🏗️")
 
     # Read current versions and names
@@ -255,18 +579,21 @@ examples:
     print(ConsoleStyle.info(f"BP: {bp_name} v{bp_version[0]}.{bp_version[1]}.{bp_version[2]}"))
     print(ConsoleStyle.info(f"RP: {rp_name} v{rp_version[0]}.{rp_version[1]}.{rp_version[2]}"))
 
-    # Bump version if requested
+    # Bump version of packs whose content changed (unchanged packs keep their version, clients skip download)
     if not args.no_bump:
-        print(ConsoleStyle.process("Bumping version..."))
-        new_bp_version = bump_version(bp_version.copy())
-        new_rp_version = bump_version(rp_version.copy())
-
-        update_version("BP/manifest.json", new_bp_version)
-        update_version("RP/manifest.json", new_rp_version)
+        print(ConsoleStyle.process("Bumping version of changed packs..."))
+        for pack_dir, (old_version, new_version) in bump_changed_versions(PACK_DIRS, args.force_bump).items():
+            if new_version != old_version:
+                print(ConsoleStyle.success(f"{pack_dir} version bumped to "
+                                           f"[{new_version[0]}.{new_version[1]}.{new_version[2]}]"))
+            else:
+                print(ConsoleStyle.info(f"{pack_dir} unchanged, keeping "
+                                        f"[{old_version[0]}.{old_version[1]}.{old_version[2]}]"))
+        bp_version = read_manifest('BP/manifest.json')[1]
+        rp_version = read_manifest('RP/manifest.json')[1]
 
-        bp_version = new_bp_version
-        rp_version = new_rp_version
-        print(ConsoleStyle.success(f"Version bumped to [{bp_version[0]}.{bp_version[1]}.{bp_version[2]}]"))
+    # Poprzednie archiwa z katalogu wyjściowego są kopiowane przed jego wyczyszczeniem
+    delta_bases = preserve_delta_bases(args.delta_from or [], 'dist')
 
     # Create an output directory
     output_dir = 'dist'
@@ -277,39 +604,77 @@ examples:
     # Create timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+    # Tree-shaking: zasoby nieosiągalne z katalogu i bazy danych nie trafiają do paczek
+    prune_plan = None
+    if args.prune:
+        from minecraft_graph import AssetGraph
+        graph = AssetGraph.build()
+        unlisted = graph.unlisted()
+        if unlisted:
+            print(ConsoleStyle.warning(f"[{len(unlisted)}] blocks/items are not in catalog or database, "
+                                       f"keeping them with their assets"))
+        with Profiler.stage("prune_plan"):
+            prune_plan = graph.prune_plan()
+        print_prune_info(prune_plan)
+
     # Build requested formats
     mcaddon_path = None
     bp_mcpack_path = None
     rp_mcpack_path = None
 
     if args.mcaddon or args.all:
-        mcaddon_path, mcaddon_size = build_mcaddon(bp_version, rp_version, PACK_NAME, args.output, timestamp,
-                                                   args.simplify_name)
+        with Profiler.stage("build_mcaddon"):
+            mcaddon_path, mcaddon_size = build_mcaddon(bp_version, rp_version, PACK_NAME, args.output, timestamp,
+                                                       args.simplify_name, args.minify, prune_plan)
 
     if args.mcpack or args.all:
-        bp_mcpack_path, rp_mcpack_path, bp_size, rp_size = build_mcpack(
-            bp_version, rp_version, f"{PACK_NAME}_BP", f"{PACK_NAME}_RP", args.output, timestamp, args.simplify_name
-        )
+        with Profiler.stage("build_mcpack"):
+            bp_mcpack_path, rp_mcpack_path, bp_size, rp_size = build_mcpack(
+                bp_version, rp_version, f"{PACK_NAME}_BP", f"{PACK_NAME}_RP", args.output, timestamp,
+                args.simplify_name, args.minify, prune_plan
+            )
+
+    variant_archives = {}
+    if args.matrix:
+        from build_variants import VariantBuilder, load_matrix
+        variants = load_matrix(args.matrix)
+        print(ConsoleStyle.process(f"Building [{len(variants)}] variants from [{args.matrix}]..."))
+        namespace = JsonBackend.load_file('config.json').get('namespace', '')
+        builder = VariantBuilder(namespace, PACK_NAME, args.output, timestamp, args.simplify_name)
+        variant_archives = builder.build(variants, bp_version, rp_version)
+        for archive_paths in variant_archives.values():
+            for archive_path in archive_paths:
+                ConsoleStyle.print_build_info("VARIANT", archive_path,
+                                              f"{os.path.getsize(archive_path) / 1024 / 1024:.2f} MB")
+
+    built_archives = [path for path in (mcaddon_path, bp_mcpack_path, rp_mcpack_path) if path]
+    delta_paths = [build_delta(base_path, built_archives, args.output) for base_path in delta_bases]
 
     stats = {
         "📦Total files": count_files()
     }
+    for variant_name, archive_paths in variant_archives.items():
+        stats[f"📦 {variant_name}"] = ", ".join(os.path.basename(archive_path) for archive_path in archive_paths)
     if mcaddon_path:
         stats["📦 .mcaddon"] = os.path.basename(mcaddon_path)
     if bp_mcpack_path and rp_mcpack_path:
         stats["📦 .mcpack"] = f"{os.path.basename(bp_mcpack_path)}, {os.path.basename(rp_mcpack_path)}"
+    if any(delta_paths):
+        stats["📦 .mcdelta"] = ", ".join(os.path.basename(delta_path) for delta_path in delta_paths if delta_path)
     ConsoleStyle.print_stats(stats, "BUILD SUMMARY")
 
-    # Install to local Minecraft if requested
-    if args.test_on_local:
+    # Install to local Minecraft (or to the given targets) if requested
+    if args.test_on_local or args.install_target or args.install_targets_file:
         ConsoleStyle.print_section("INSTALLATION", "")
         print(ConsoleStyle.process("Installing to local Minecraft..."))
         clean_existing = not args.no_clean
-        if install_mcaddon(mcaddon_path, clean_existing):
+        install_targets = get_install_targets(args.install_target, args.install_targets_file)
+        if install_mcaddon(mcaddon_path, clean_existing, install_targets):
             print(ConsoleStyle.success("Installation completed successfully!"))
         else:
             print(ConsoleStyle.error("Installation failed!"))
 
+    Profiler.finish(args.profile)
     print(ConsoleStyle.success("Build completed successfully!"))
 
 
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Budowanie wielu wariantów paczki (namespace, języki, lżejsze tekstury) w jednym uruchomieniu
+"""
+import fnmatch
+import os
+import re
+import threading
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from console_utils import ConsoleStyle, Profiler
+from json_utils import JsonBackend
+from pack_version import is_packaged
+from scan_utils import scan_files
+
+BUILD_MATRIX_FILE = 'build_matrix.json'
+FORMATS = ('mcaddon', 'mcpack')
+PACK_DIRS = ('BP', 'RP')
+# Pliki tekstowe, w których podmieniany jest namespace
+NAMESPACE_EXTENSIONS = ('.json', '.lang', '.js', '.mcfunction')
+
+
+@dataclass
+class PackVariant:
+    """Wariant paczki opisany w pliku macierzy budowania"""
+    name: str
+    namespace: Optional[str] = None
+    languages: Optional[List[str]] = None
+    exclude: List[str] = field(default_factory=list)
+    # Katalog z plikami (ścieżki jak w projekcie, np. RP/textures/...) zastępującymi lub dodawanymi do paczki
+    overlay: Optional[str] = None
+    pack_name: Optional[str] = None
+    keep_uuids: bool = False
+    minify: bool = False
+    formats: List[str] = field(default_factory=lambda: ['mcaddon'])
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'PackVariant':
+        unknown = set(data) - set(PackVariant.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"Unknown variant option(s): {', '.join(sorted(unknown))}")
+        variant = PackVariant(**data)
+        unknown_formats = set(variant.formats) - set(FORMATS)
+        if unknown_formats:
+            raise ValueError(f"Unknown format(s) in variant [{variant.name}]: {', '.join(sorted(unknown_formats))}")
+        return variant
+
+
+def load_matrix(file_path: str = BUILD_MATRIX_FILE) -> List[PackVariant]:
+    """Read variants from the build matrix file ({"variants": [...]} or a list)"""
+    data = JsonBackend.load_file(file_path)
+    variants = [PackVariant.from_dict(entry) for entry in (data['variants'] if isinstance(data, dict) else data)]
+    names = [variant.name for variant in variants]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate variant name(s): {', '.join(sorted(duplicates))}")
+    return variants
+
+
+class VariantBuilder:
+    """Builds archives of all variants from one scan of the pack directories and a shared content cache"""
+
+    def __init__(self, base_namespace: str, plugin_name: str, output_dir: str, timestamp: str, simplify_name: bool):
+        self.base_namespace = base_namespace
+        self.plugin_name = plugin_name
+        self.output_dir = output_dir
+        self.timestamp = timestamp
+        self.simplify_name = simplify_name
+        self.files: Dict[str, List[str]] = {}
+        with Profiler.stage("variants.scan"):
+            for directory in PACK_DIRS:
+                self.files[directory] = self._scan(directory)
+        # Treść po transformacjach: (ścieżka, namespace, minify) -> bajty, wspólna dla wariantów
+        self._cache: Dict[Tuple[str, str, bool], bytes] = {}
+        self._cache_lock = threading.Lock()
+
+    @staticmethod
+    def _scan(directory: str) -> List[str]:
+        return [file_path for file_path in scan_files(directory) if is_packaged(os.path.basename(file_path))]
+
+    def _read(self, file_path: str) -> bytes:
+        key = (file_path, '', False)
+        with self._cache_lock:
+            content = self._cache.get(key)
+        if content is None:
+            with open(file_path, 'rb') as f:
+                content = f.read()
+            with self._cache_lock:
+                self._cache[key] = content
+        return content
+
+    def _transform(self, file_path: str, namespace: str, minify: bool) -> Optional[bytes]:
+        """Content with namespace replaced and JSON minified (None when the file is unchanged)"""
+        rename = namespace != self.base_namespace and file_path.endswith(NAMESPACE_EXTENSIONS)
+        minify = minify and file_path.endswith('.json')
+        if not rename and not minify:
+            return None
+        key = (file_path, namespace, minify)
+        with self._cache_lock:
+            if key in self._cache:
+                return self._cache[key]
+        content = self._read(file_path)
+        if rename and f'{self.base_namespace}:'.encode('utf-8') in content:
+            pattern = re.compile(rf'(?<![A-Za-z0-9_]){re.escape(self.base_namespace)}:'.encode('utf-8'))
+            content = pattern.sub(f'{namespace}:'.encode('utf-8'), content)
+        if minify:
+            try:
+                content = JsonBackend.dumps(JsonBackend.loads_lenient(content), compact=True).encode('utf-8')
+            except ValueError as e:
+                print(ConsoleStyle.warning(f"Cannot minify [{file_path}], adding as is: {e}"))
+        with self._cache_lock:
+            self._cache[key] = content
+        return content
+
+    @staticmethod
+    def _manifest(content: bytes, variant: PackVariant) -> bytes:
+        data = JsonBackend.loads_lenient(content)
+        if variant.pack_name:
+            data['header']['name'] = variant.pack_name
+        if not variant.keep_uuids:
+            # Stałe UUID wariantu (uuid5 z oryginału), aby warianty mogły być zainstalowane obok siebie
+            def derive(value):
+                return str(uuid.uuid5(uuid.UUID(value), variant.name))
+
+            data['header']['uuid'] = derive(data['header']['uuid'])
+            for module in data.get('modules', []):
+                module['uuid'] = derive(module['uuid'])
+            for dependency in data.get('dependencies', []):
+                if 'uuid' in dependency:
+                    dependency['uuid'] = derive(dependency['uuid'])
+        return JsonBackend.dumps(data, compact=variant.minify).encode('utf-8')
+
+    def entries(self, variant: PackVariant, directory: str) -> List[Tuple[str, str, Optional[bytes]]]:
+        """Archive entries of the variant: (arc name, source file, content or None to copy the source)"""
+        namespace = variant.namespace or self.base_namespace
+        file_paths = {file_path: file_path for file_path in self.files[directory]}
+        if variant.overlay:
+            for overlay_path in self._scan(os.path.join(variant.overlay, directory)):
+                file_paths[os.path.relpath(overlay_path, variant.overlay).replace(os.sep, '/')] = overlay_path
+
+        entries = []
+        for arc_name, source_path in sorted(file_paths.items()):
+            if any(fnmatch.fnmatch(arc_name, pattern) for pattern in variant.exclude):
+                continue
+            if variant.languages is not None and arc_name.endswith('.lang') \
+                    and os.path.basename(arc_name)[:-len('.lang')] not in variant.languages:
+                continue
+            content = self._transform(source_path, namespace, variant.minify)
+            if arc_name.endswith('/manifest.json'):
+                content = self._manifest(content or self._read(source_path), variant)
+            elif variant.languages is not None and arc_name.endswith('texts/languages.json'):
+                languages = [language for language in JsonBackend.loads_lenient(self._read(source_path))
+                             if language in variant.languages]
+                content = JsonBackend.dumps(languages, compact=variant.minify).encode('utf-8')
+            entries.append((arc_name, source_path, content))
+        return entries
+
+    def _write_archive(self, archive_path: str, entries: List[Tuple[str, str, Optional[bytes]]]):
+        with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for arc_name, source_path, content in entries:
+                if content is None:
+                    zipf.write(source_path, arc_name)
+                else:
+                    zinfo = zipfile.ZipInfo.from_file(source_path, arc_name)
+                    zinfo.compress_type = zipf.compression
+                    zipf.writestr(zinfo, content)
+
+    def _archive_name(self, name: str, version, extension: str) -> str:
+        if self.simplify_name:
+            return f"{name}.{extension}"
+        return f"{name}-v{version[0]}.{version[1]}.{version[2]}_{self.timestamp}.{extension}"
+
+    def archives(self, variant: PackVariant, bp_version, rp_version) -> List[Tuple[str, List[str]]]:
+        """Archive paths of the variant with pack directories packed into each"""
+        name = f"{self.plugin_name}_{variant.name}"
+        archives = []
+        if 'mcaddon' in variant.formats:
+            archives.append((self._archive_name(name, bp_version, 'mcaddon'), list(PACK_DIRS)))
+        if 'mcpack' in variant.formats:
+            archives.append((self._archive_name(f"{name}_BP", bp_version, 'mcpack'), ['BP']))
+            archives.append((self._archive_name(f"{name}_RP", rp_version, 'mcpack'), ['RP']))
+        return [(os.path.join(self.output_dir, archive_name), directories)
+                for archive_name, directories in archives]
+
+    def build(self, variants: List[PackVariant], bp_version, rp_version, workers: int = None) -> Dict[str, List[str]]:
+        """Build archives of all variants in parallel, return archive paths per variant"""
+        jobs = []
+        for variant in variants:
+            for archive_path, directories in self.archives(variant, bp_version, rp_version):
+                jobs.append((variant, archive_path, directories))
+
+        def build_archive(job):
+            variant, archive_path, directories = job
+            entries = [entry for directory in directories for entry in self.entries(variant, directory)]
+            self._write_archive(archive_path, entries)
+            return variant.name, archive_path
+
+        result = {variant.name: [] for variant in variants}
+        with Profiler.stage("variants.build"), ThreadPoolExecutor(max_workers=workers) as executor:
+            for variant_name, archive_path in executor.map(build_archive, jobs):
+                result[variant_name].append(archive_path)
+        return result
@@ -3,8 +3,11 @@
 Biblioteka z funkcjami stylizacji konsoli dla skryptów
 """
 
+import functools
 import sys
-from typing import Dict, Any, Union
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Union, List
 
 
 def print_if_not_quiet(text):
@@ -209,3 +212,114 @@ class ConsoleStyle:
 
 def rsort(sizes: Dict[str, Any]) -> Dict[str, Any]:
     return dict(sorted(sizes.items(), key=lambda x: x[1], reverse=True))
+
+
+class Profiler:
+    """Class for measuring wall time, call counts and processed bytes of hot-path stages"""
+
+    # Tryb profilowania (domyślnie wyłączony — zero narzutu poza jednym if)
+    ENABLED = False
+
+    # nazwa etapu -> [czas, liczba wywołań, bajty]
+    _stats: Dict[str, List[float]] = {}
+    # ścieżka stosu (a;b;c) -> czas własny w sekundach, dla flame graph
+    _folded: Dict[str, float] = {}
+    _stack: List[str] = []
+
+    @staticmethod
+    def set_enabled(enabled: bool = True):
+        """Enable or disable profiling"""
+        Profiler.ENABLED = enabled
+
+    @staticmethod
+    def reset():
+        """Clear collected measurements"""
+        Profiler._stats = {}
+        Profiler._folded = {}
+        Profiler._stack = []
+
+    @staticmethod
+    @contextmanager
+    def stage(name: str, size: int = 0):
+        """Measure a stage; nested stages build a call stack for the flame graph"""
+        if not Profiler.ENABLED:
+            yield
+            return
+        Profiler._stack.append(name)
+        stack_key = ';'.join(Profiler._stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            Profiler._stack.pop()
+            Profiler.record(name, elapsed, size)
+            Profiler._folded[stack_key] = Profiler._folded.get(stack_key, 0.0) + elapsed
+            if Profiler._stack:
+                # Czas dziecka nie wlicza się do czasu własnego rodzica
+                parent_key = ';'.join(Profiler._stack)
+                Profiler._folded[parent_key] = Profiler._folded.get(parent_key, 0.0) - elapsed
+
+    @staticmethod
+    def record(name: str, elapsed: float, size: int = 0):
+        """Add a measurement to the stage statistics"""
+        stats = Profiler._stats.setdefault(name, [0.0, 0, 0])
+        stats[0] += elapsed
+        stats[1] += 1
+        stats[2] += size
+
+    @staticmethod
+    def add_bytes(name: str, size: int):
+        """Add processed bytes to a stage without timing it"""
+        if Profiler.ENABLED:
+            Profiler._stats.setdefault(name, [0.0, 0, 0])[2] += size
+
+    @staticmethod
+    def profiled(name: str = None):
+        """Decorator measuring every call of the function as a stage"""
+
+        def decorator(func):
+            stage_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not Profiler.ENABLED:
+                    return func(*args, **kwargs)
+                with Profiler.stage(stage_name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    @staticmethod
+    def print_report(title: str = "PROFILE"):
+        """Display stages sorted by total wall time"""
+        if not Profiler._stats:
+            return
+        stats = {}
+        for name, (elapsed, calls, size) in sorted(Profiler._stats.items(), key=lambda x: x[1][0], reverse=True):
+            line = f"[{elapsed * 1000:.1f}] ms, [{calls}] calls"
+            if size:
+                line += f", [{size / 1024:.1f}] KB"
+            stats[name] = line
+        ConsoleStyle.print_stats(stats, title, icon="⏱️")
+
+    @staticmethod
+    def write_folded(file_path: str):
+        """Write collapsed stacks (flamegraph.pl / speedscope compatible), values in microseconds"""
+        with open(file_path, 'w', encoding='utf-8') as f:
+            for stack_key, elapsed in sorted(Profiler._folded.items()):
+                micros = int(round(elapsed * 1_000_000))
+                if micros > 0:
+                    f.write(f"{stack_key} {micros}\n")
+
+    @staticmethod
+    def finish(output_file: str = None):
+        """Print the timing table and optionally save the flame graph file"""
+        if not Profiler.ENABLED:
+            return
+        Profiler.print_report()
+        if output_file:
+            Profiler.write_folded(output_file)
+            print_if_not_quiet(ConsoleStyle.info(f"Profile saved to [{output_file}]"))
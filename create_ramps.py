@@ -1,9 +1,107 @@
 #!/usr/bin/env python3
 
-import json
-import numpy as np
-from typing import List, Dict
-from console_utils import ConsoleStyle
+import argparse
+import copy
+import os
+import re
+from typing import Any, List, Dict, Tuple
+from console_utils import ConsoleStyle, Profiler
+from import_utils import lazy_import
+from json_utils import JsonBackend
+from minecraft_bounds import Bounds, block_box, cubes_bounds, visible_bounds
+from minecraft_lang import LangUtils
+from scan_utils import scan_files
+
+# NumPy jest importowany dopiero przy pierwszym użyciu (generowanie ramp ukośnych)
+np = lazy_import('numpy')
+
+
+class FaceUV:
+    """Per-face UV engine for generated cubes
+
+    Every face gets the part of the 16x16 texture it covers on a full block (planar projection of block
+    coordinates, oriented like `geometry.base_road_h16`), so markings continue across cubes and ramp parts.
+    Faces are named by role with material instances, so the base and marking variants of a ramp part share one
+    geometry and choose textures in `minecraft:material_instances`. Faces fully covered by other cubes are omitted.
+    """
+    SURFACE = 'surface'
+    MARKING = 'marking'
+    FACES = ('north', 'south', 'east', 'west', 'up', 'down')
+    # Ścianka -> (oś prostopadła, strona: 0 = początek kostki, 1 = koniec, osie płaszczyzny ścianki)
+    PLANES = {'north': (2, 0, (0, 1)), 'south': (2, 1, (0, 1)), 'east': (0, 1, (2, 1)), 'west': (0, 0, (2, 1)),
+              'up': (1, 1, (0, 2)), 'down': (1, 0, (0, 2))}
+    PRECISION = 3
+
+    @staticmethod
+    def _number(value: float):
+        value = round(float(value), FaceUV.PRECISION)
+        return int(value) if value == int(value) else value
+
+    @staticmethod
+    def face_uv(face: str, origin, size) -> Dict[str, List]:
+        """UV of the face: the texture region it covers on a full block (up/down rotated 180° like flat blocks)"""
+        x0, y0, z0 = (float(value) for value in origin)
+        size_x, size_y, size_z = (float(value) for value in size)
+        x1, y1, z1 = x0 + size_x, y0 + size_y, z0 + size_z
+        uv, uv_size = {
+            'north': ((8 - x1, 16 - y1), (size_x, size_y)),
+            'south': ((x0 + 8, 16 - y1), (size_x, size_y)),
+            'east': ((8 - z1, 16 - y1), (size_z, size_y)),
+            'west': ((z0 + 8, 16 - y1), (size_z, size_y)),
+            'up': ((8 - x0, 8 - z0), (-size_x, -size_z)),
+            'down': ((8 - x0, 8 - z0), (-size_x, -size_z)),
+        }[face]
+        return {'uv': [FaceUV._number(value) for value in uv], 'uv_size': [FaceUV._number(value) for value in uv_size]}
+
+    @staticmethod
+    def _box(cube) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+        start = tuple(round(float(value), FaceUV.PRECISION) for value in cube['origin'])
+        return start, tuple(round(start[i] + float(cube['size'][i]), FaceUV.PRECISION) for i in range(3))
+
+    @staticmethod
+    def _covered(face: str, index: int, boxes) -> bool:
+        """Whether the face of the cube is fully covered by touching faces of other cubes"""
+        axis, side, (a, b) = FaceUV.PLANES[face]
+        start, end = boxes[index]
+        plane = (start, end)[side][axis]
+        rectangles = []
+        for other, (other_start, other_end) in enumerate(boxes):
+            # Przylegająca kostka leży po drugiej stronie płaszczyzny ścianki
+            if other == index or (other_end, other_start)[side][axis] != plane:
+                continue
+            rectangle = (max(start[a], other_start[a]), min(end[a], other_end[a]),
+                         max(start[b], other_start[b]), min(end[b], other_end[b]))
+            if rectangle[0] < rectangle[1] and rectangle[2] < rectangle[3]:
+                rectangles.append(rectangle)
+        if not rectangles or start[a] == end[a] or start[b] == end[b]:
+            return False
+        # Pokrycie sprawdzane na siatce wyznaczonej krawędziami przylegających prostokątów
+        edges_a = sorted({start[a], end[a]} | {value for r in rectangles for value in r[:2]})
+        edges_b = sorted({start[b], end[b]} | {value for r in rectangles for value in r[2:]})
+        for a0, a1 in zip(edges_a, edges_a[1:]):
+            for b0, b1 in zip(edges_b, edges_b[1:]):
+                center_a, center_b = (a0 + a1) / 2, (b0 + b1) / 2
+                if not any(r[0] < center_a < r[1] and r[2] < center_b < r[3] for r in rectangles):
+                    return False
+        return True
+
+    @staticmethod
+    @Profiler.profiled("FaceUV.apply")
+    def apply(cubes: List[Dict], roles: Dict[str, str]) -> List[Dict]:
+        """Cubes with per-face UV and material instances by role (face -> instance), hidden faces and cubes dropped"""
+        boxes = [FaceUV._box(cube) for cube in cubes]
+        mapped = []
+        for index, cube in enumerate(cubes):
+            faces = {}
+            for face in FaceUV.FACES:
+                if FaceUV._covered(face, index, boxes):
+                    continue
+                faces[face] = FaceUV.face_uv(face, cube['origin'], cube['size'])
+                if face in roles:
+                    faces[face]['material_instance'] = roles[face]
+            if faces:
+                mapped.append({**cube, 'uv': faces})
+        return mapped
 
 
 class MinecraftAddon:
@@ -11,11 +109,18 @@ class MinecraftAddon:
     MARKING_OBLIQUE = 'oblique'
     FORMAT_VERSION = "1.21.60"
     NAMESPACE = 'jct'
+    # Tekstury ról ścianek (material_instance z FaceUV) dla wariantów bloku korzystających z tej samej geometrii
+    MARKING_TEXTURES = {
+        '': {FaceUV.SURFACE: 'base_road', FaceUV.MARKING: 'base_road'},
+        MARKING_STRAIGHT: {FaceUV.SURFACE: 'road_marking_straight', FaceUV.MARKING: 'road_marking_straight'},
+        MARKING_OBLIQUE: {FaceUV.SURFACE: 'road_marking_oblique', FaceUV.MARKING: 'road_marking_straight'},
+    }
 
     @staticmethod
     def create_file(filename: str, data: str):
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
+            os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+            with Profiler.stage("create_file", len(data)), open(filename, 'w', encoding='utf-8') as f:
                 f.write(data)
             ConsoleStyle.print_file_operation("Created file", filename, "OK")
         except Exception as e:
@@ -23,9 +128,9 @@ class MinecraftAddon:
             print(ConsoleStyle.error(f"Error: {e}"))
 
     @staticmethod
-    def create_block_file(output_dir: str, block_identifier: str, geometry_identifier: str, collision_box_size_y: float,
-                          selection_box_size_y: float, marking: str = ''):
-        """Generuje plik bloku na podstawie typu części"""
+    def create_block_file(output_dir: str, block_identifier: str, geometry_identifier: str, bounds: Bounds,
+                          collision_box_size_y: float, marking: str = ''):
+        """Generuje plik bloku na podstawie typu części (selection box z granic geometrii, collision box z tabeli)"""
         filename = f"BP/blocks/{output_dir}{block_identifier}.block.json"
         data = {
             "format_version": MinecraftAddon.FORMAT_VERSION,
@@ -37,12 +142,14 @@ class MinecraftAddon:
                 },
                 "components": {
                     "minecraft:collision_box": {"origin": [-8, 0, -8], "size": [16, collision_box_size_y, 16]},
-                    "minecraft:selection_box": {"origin": [-8, 0, -8], "size": [16, selection_box_size_y, 16]},
+                    "minecraft:selection_box": block_box(bounds),
                     "minecraft:destructible_by_mining": {"seconds_to_destroy": 1},
                     "minecraft:destructible_by_explosion": {"explosion_resistance": 30},
                     "minecraft:geometry": f"geometry.{geometry_identifier}",
                     "minecraft:material_instances": {
-                        "*": {"texture": "base_road", "render_method": "alpha_test_single_sided"}
+                        "*": {"texture": "base_road", "render_method": "alpha_test_single_sided"},
+                        **{instance: {"texture": texture, "render_method": "alpha_test_single_sided"}
+                           for instance, texture in MinecraftAddon.MARKING_TEXTURES[marking].items()}
                     },
                     "minecraft:map_color": "#353637"
                 },
@@ -58,28 +165,14 @@ class MinecraftAddon:
                 ]
             }
         }
-        if marking == MinecraftAddon.MARKING_STRAIGHT:
-            data['minecraft:block']['components']['minecraft:material_instances'] = {
-                "*": {"texture": "base_road", "render_method": "alpha_test_single_sided", },
-                "up": {"texture": "road_marking_straight", "render_method": "alpha_test_single_sided"},
-                "marking": {"texture": "road_marking_straight", "render_method": "alpha_test_single_sided"},
-                "north": "marking",
-                "south": "marking"
-            }
-        if marking == MinecraftAddon.MARKING_OBLIQUE:
-            data['minecraft:block']['components']['minecraft:material_instances'] = {
-                "*": {"texture": "base_road", "render_method": "alpha_test_single_sided", },
-                "up": {"texture": "road_marking_oblique", "render_method": "alpha_test_single_sided"},
-                "marking": {"texture": "road_marking_straight", "render_method": "alpha_test_single_sided"},
-                "east": "marking",
-                "south": "marking"
-            }
-        json_str = json.dumps(data, indent=2, ensure_ascii=False)
+        json_str = JsonBackend.dumps(data)
         MinecraftAddon.create_file(filename, json_str)
 
     @staticmethod
-    def create_geometry_file(output_dir: str, geometry_identifier: str, cubes: List[Dict]):
+    def create_geometry_file(output_dir: str, geometry_identifier: str, cubes: List[Dict]) -> Bounds:
+        """Generuje plik geometrii z granicami widoczności dopasowanymi do kostek, zwraca granice"""
         filename = f"RP/models/{output_dir}{geometry_identifier}.geo.json"
+        bounds = cubes_bounds(cubes)
         geometry_data = {
             "format_version": MinecraftAddon.FORMAT_VERSION,
             "minecraft:geometry": [
@@ -88,9 +181,7 @@ class MinecraftAddon:
                         "identifier": f"geometry.{geometry_identifier}",
                         "texture_width": 16,
                         "texture_height": 16,
-                        "visible_bounds_width": 1,
-                        "visible_bounds_height": 1,
-                        "visible_bounds_offset": [0, 0.75, 0],
+                        **visible_bounds(bounds),
                     },
                     "item_display_transforms": {"gui": {"rotation": [30, 45, 0]}},
                     "bones": [{
@@ -104,11 +195,15 @@ class MinecraftAddon:
 
         json_str = MinecraftAddon._flatten_cubes(geometry_data)
         MinecraftAddon.create_file(filename, json_str)
+        return bounds
 
     @staticmethod
+    @Profiler.profiled("_flatten_cubes")
     def _flatten_cubes(data):
         # Konwertuj geometrię na string z customowym formatowaniem dla kostek
-        json_str = json.dumps(data, indent=2, ensure_ascii=False)
+        json_str = JsonBackend.dumps(data)
+        if JsonBackend.COMPACT_MODE:
+            return json_str
 
         # Podziel na linie
         lines = json_str.split('\n')
@@ -151,6 +246,8 @@ class MinecraftAddon:
 
 
 class RoadRampStraight:
+    # Rampa wznosi się w kierunku north — stopnie i tylna ściana to ścianki north/south
+    ROLES = {'up': FaceUV.SURFACE, 'north': FaceUV.MARKING, 'south': FaceUV.MARKING}
 
     @classmethod
     def __init__(cls, parts):
@@ -186,20 +283,20 @@ class RoadRampStraight:
                 size_z = round(size_z - (parts * size_y), 3)
 
             base_size_y = round(origin_y, 3)
+            collision_box_size_y = round(origin_y, 3) if origin_y <= 16.0 else 16.0
 
-            MinecraftAddon.create_geometry_file('blocks/road_ramp/', road_ramp_geometry_identifier, cubes)
+            cubes = FaceUV.apply(cubes, cls.ROLES)
+            bounds = MinecraftAddon.create_geometry_file('blocks/road_ramp/', road_ramp_geometry_identifier, cubes)
             ################################################################################################################
-            collision_box_size_y = round(origin_y, 3) if origin_y <= 16.0 else 16.0
-            selection_box_size_y = round(origin_y, 3) if origin_y <= 16.0 else 16.0
             MinecraftAddon.create_block_file('ramps/base_road_ramp/',
                                              road_ramp_base_block_identifier,
                                              road_ramp_geometry_identifier,
-                                             collision_box_size_y, selection_box_size_y)
+                                             bounds, collision_box_size_y)
             # Road ramp marking with variants
             MinecraftAddon.create_block_file('ramps/road_ramp_marking_straight/',
                                              road_ramp_marking_straight_block_identifier,
                                              road_ramp_geometry_identifier,
-                                             collision_box_size_y, selection_box_size_y,
+                                             bounds, collision_box_size_y,
                                              MinecraftAddon.MARKING_STRAIGHT)
             ################################################################################################################
 
@@ -208,6 +305,18 @@ class RampAlgorithm:
     # Zmienna klasowa dla rozmiaru kroku i kostek
     STEP_SIZE: float = 1.0
     ANGLE: float = None
+    # Schodki rampy ukośnej kończą się na ściankach east i south
+    ROLES = {'up': FaceUV.SURFACE, 'east': FaceUV.MARKING, 'south': FaceUV.MARKING}
+    # Wysokość collision box części (niższa niż geometria, żeby dało się wjechać na rampę); domyślnie pełny blok
+    COLLISION_BOX_SIZE_Y = {
+        "22_5_part1": 0,
+        "22_5_part2": 8,
+        "11_25_part1": 0,
+        "11_25_part2": 4,
+        "11_25_part3": 8,
+        "11_25_part4": 12,
+        "11_25_part5": 16,
+    }
 
     @classmethod
     def __init__(cls):
@@ -225,9 +334,7 @@ class RampAlgorithm:
                         "identifier": f"geometry.road_ramp_oblique_{part_type}",
                         "texture_width": 16,
                         "texture_height": 16,
-                        "visible_bounds_width": 1,
-                        "visible_bounds_height": 1,
-                        "visible_bounds_offset": [0, 0.75, 0]
+                        **visible_bounds(cubes_bounds(cubes))
                     },
                     "item_display_transforms": {"gui": {"rotation": [30, 45, 0]}},
                     "bones": [
@@ -244,71 +351,33 @@ class RampAlgorithm:
         return geometry
 
     @classmethod
+    @Profiler.profiled("RampAlgorithm.generate")
     def generate(cls, parts: Dict):
         for part_type, cubes in parts.items():
             print(ConsoleStyle.process(f"Generating [{part_type}] content..."))
 
-            # Generuj geometrię dla bloków podstawowych
-            MinecraftAddon.create_geometry_file('blocks/road_ramp_oblique/', f"road_ramp_oblique_{part_type}", cubes)
-
-            # # Generuj geometrię dla bloków z oznaczeniami (z teksturą oznaczenia na górze)
-            # marking_cubes = []
-            # for cube in cubes:
-            #     # Skopiuj kostkę, ale zmień teksturę górnej ścianki na oznaczenie
-            #     marking_cube = cube.copy()
-            #     # if "uv" in marking_cube and "up" in marking_cube["uv"]:
-            #     #     marking_cube["uv"]["up"]["material_instance"] = "road_marking_oblique"
-            #     marking_cubes.append(marking_cube)
-            #
-            # # Utwórz plik geometrii dla bloków z oznaczeniami w katalogu road_ramp_oblique
-            # MinecraftAddon.create_geometry_file('blocks/road_ramp_marking_oblique/', f"road_ramp_marking_oblique_{part_type}",
-            #                                     marking_cubes)
-
-            # Określ wysokość na podstawie typu części
-            collision_box_size_y = 16.0
-            if part_type == "22_5_part1":
-                collision_box_size_y = 0
-            elif part_type == "22_5_part2":
-                collision_box_size_y = 8
-            elif part_type == "11_25_part1":
-                collision_box_size_y = 0
-            elif part_type == "11_25_part2":
-                collision_box_size_y = 4
-            elif part_type == "11_25_part3":
-                collision_box_size_y = 8
-            elif part_type == "11_25_part4":
-                collision_box_size_y = 12
-            elif part_type == "11_25_part5":
-                collision_box_size_y = 16
-            selection_box_size_y = collision_box_size_y + 4 if collision_box_size_y < 16 else 16
-
+            # Jedna geometria na część — wariant z oznaczeniami wybiera tekstury przez material_instances
+            cubes = FaceUV.apply(cubes, cls.ROLES)
+            bounds = MinecraftAddon.create_geometry_file('blocks/road_ramp_oblique/',
+                                                         f"road_ramp_oblique_{part_type}", cubes)
+            collision_box_size_y = cls.COLLISION_BOX_SIZE_Y.get(part_type, 16.0)
             MinecraftAddon.create_block_file('ramps/road_ramp_oblique/',
                                              f"road_ramp_oblique_{part_type}",
                                              f"road_ramp_oblique_{part_type}",
-                                             collision_box_size_y, selection_box_size_y)
-            # MinecraftAddon.create_block_file('ramps/road_ramp_marking_oblique/',
-            #                                  f"road_ramp_marking_oblique_{part_type}",
-            #                                  f"road_ramp_marking_oblique_{part_type}",
-            #                                  collision_box_size_y, selection_box_size_y, MinecraftAddon.MARKING_OBLIQUE)
+                                             bounds, collision_box_size_y)
+            MinecraftAddon.create_block_file('ramps/road_ramp_marking_oblique/',
+                                             f"road_ramp_marking_oblique_{part_type}",
+                                             f"road_ramp_oblique_{part_type}",
+                                             bounds, collision_box_size_y, MinecraftAddon.MARKING_OBLIQUE)
 
     # ===== UNIWERSALNE METODY POMOCNICZE =====
 
     @classmethod
-    def _cube(cls, origin_x: float, origin_y: float, origin_z: float, size_x: float, size_y: float, size_z: float,
-              up_texture: str = "base_road"):
+    def _cube(cls, origin_x: float, origin_y: float, origin_z: float, size_x: float, size_y: float, size_z: float):
+        # UV ścianek i material_instance dodaje FaceUV.apply dla całej części naraz
         return {
             "origin": [origin_x, origin_y, origin_z],
             "size": [size_x, size_y, size_z],
-            # "uv": {
-            #     "north": {"uv": [0, 15], "uv_size": [16, 1], "material_instance": "base_road"},  # X,Y
-            #     "south": {"uv": [0, 15], "uv_size": [16, 1], "material_instance": "base_road"},  # X,Y
-            #     "east": {"uv": [0, 15], "uv_size": [16, 1], "material_instance": "base_road"},  # Z,Y
-            #     "west": {"uv": [0, 15], "uv_size": [16, 1], "material_instance": "base_road"},  # Z,Y
-            #     "up": {"uv": [8 + origin_x, 8 + origin_z], "uv_size": [size_x, size_z],
-            #            "material_instance": up_texture},  # X,Z - proporcjonalne do rozmiaru
-            #     "down": {"uv": [0, 0], "uv_size": [size_x, size_z], "material_instance": "base_road"},
-            #     # X,Z - proporcjonalne do rozmiaru
-            # }
         }
 
     @classmethod
@@ -621,16 +690,379 @@ class RoadRampOblique11250(RampAlgorithm):
         return cubes
 
 
+class HeightFamilies:
+    """Alternatywny tryb emisji: rodzina bloków `nazwa_1..16` jako jeden blok ze stanem wysokości"""
+
+    REPORT_FILE = 'height_migration_report.json'
+    RP_BLOCKS_FILE = 'RP/blocks.json'
+    ITEM_TEXTURE_FILE = 'RP/textures/item_texture.json'
+    TERRAIN_TEXTURE_FILE = 'RP/textures/terrain_texture.json'
+    ITEMS_DIR = 'BP/items'
+    # Komponenty, które mogą się różnić między wysokościami (wybierane przez permutacje)
+    HEIGHT_COMPONENTS = ('minecraft:geometry', 'minecraft:collision_box', 'minecraft:selection_box')
+    MAX_HEIGHTS = 16
+    # /fill obejmuje najwyżej 32768 bloków — sześcian 32x32x32 wokół gracza (~-16..~15)
+    FILL_RADIUS = 16
+    # Stare bloki zostają do czasu migracji światów, ale znikają z ekwipunku kreatywnego
+    DEPRECATED_CATEGORY = 'none'
+
+    @staticmethod
+    def state_name() -> str:
+        return f"{MinecraftAddon.NAMESPACE}:height"
+
+    @staticmethod
+    def height_item(name: str, height: int) -> str:
+        """Identifier of the item placing the family block at the height (the highest one is the block itself)"""
+        return f"{MinecraftAddon.NAMESPACE}:{name}_height_{height}"
+
+    @staticmethod
+    def find_families() -> Dict[str, Dict[str, Any]]:
+        """Group `ns:name_<height>` blocks living in one directory into families (at least 2 heights),
+        keyed by `directory|name`"""
+        pattern = re.compile(rf'^{re.escape(MinecraftAddon.NAMESPACE)}:(.+)_(\d+)$')
+        families: Dict[str, Dict[str, Any]] = {}
+        for file_path in scan_files('BP/blocks', '.block.json'):
+            root = os.path.dirname(file_path)
+            data = JsonBackend.load_file(file_path)
+            match = pattern.match(data.get('minecraft:block', {}).get('description', {}).get('identifier', ''))
+            if not match or not 1 <= int(match.group(2)) <= HeightFamilies.MAX_HEIGHTS:
+                continue
+            family = families.setdefault(f"{root}|{match.group(1)}", {
+                'name': match.group(1), 'directory': root, 'members': {}})
+            family['members'][int(match.group(2))] = (file_path, data)
+        return {key: family for key, family in families.items() if len(family['members']) > 1}
+
+    @staticmethod
+    def _shared_definition(family: Dict[str, Any]) -> str:
+        """Return reason why the family cannot be collapsed (None when members differ only by height)"""
+        def without_height(data):
+            block = copy.deepcopy(data['minecraft:block'])
+            del block['description']['identifier']
+            for component in HeightFamilies.HEIGHT_COMPONENTS:
+                block['components'].pop(component, None)
+            return block
+
+        members = list(family['members'].values())
+        reference = without_height(members[0][1])
+        for file_path, data in members[1:]:
+            if without_height(data) != reference:
+                return f"[{file_path}] differs from [{members[0][0]}] in more than geometry/collision/selection"
+        if 'states' in reference['description']:
+            return "family already uses block states"
+        return None
+
+    @staticmethod
+    def collapse_block(family: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the state-driven block: permutations select geometry and boxes for every height"""
+        heights = sorted(family['members'], reverse=True)
+        state = HeightFamilies.state_name()
+        data = copy.deepcopy(family['members'][heights[0]][1])
+        block = data['minecraft:block']
+        block['description']['identifier'] = f"{MinecraftAddon.NAMESPACE}:{family['name']}"
+        # Pierwsza wartość stanu jest domyślna — najwyższy blok, jak ikona w katalogu
+        block['description']['states'] = {state: heights}
+        height_permutations = []
+        for height in heights:
+            member_components = family['members'][height][1]['minecraft:block']['components']
+            height_permutations.append({
+                "condition": f"q.block_state('{state}') == {height}",
+                "components": {component: member_components[component]
+                               for component in HeightFamilies.HEIGHT_COMPONENTS if component in member_components}
+            })
+        block['permutations'] = height_permutations + block.get('permutations', [])
+        return data
+
+    @staticmethod
+    def deprecated_block(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Member block kept for world migration, hidden from the creative inventory"""
+        data = copy.deepcopy(data)
+        data['minecraft:block']['description']['menu_category'] = {'category': HeightFamilies.DEPRECATED_CATEGORY}
+        return data
+
+    @staticmethod
+    def _icon_texture(family: Dict[str, Any]) -> str:
+        instances = family['members'][max(family['members'])][1]['minecraft:block']['components'].get(
+            'minecraft:material_instances', {})
+        instance = instances.get('up', instances.get('*', {}))
+        return instance.get('texture', '') if isinstance(instance, dict) else ''
+
+    @staticmethod
+    def height_item_data(family: Dict[str, Any], height: int) -> Dict[str, Any]:
+        """Item placing the family block with the height state (catalog entry for every non-default height)"""
+        return {
+            "format_version": MinecraftAddon.FORMAT_VERSION,
+            "minecraft:item": {
+                "description": {
+                    "identifier": HeightFamilies.height_item(family['name'], height),
+                    "menu_category": {"category": "construction"}
+                },
+                "components": {
+                    "minecraft:icon": family['name'],
+                    "minecraft:block_placer": {
+                        "block": {"name": f"{MinecraftAddon.NAMESPACE}:{family['name']}",
+                                  "states": {HeightFamilies.state_name(): height}}
+                    }
+                }
+            }
+        }
+
+    @staticmethod
+    def _family_name(name: str) -> str:
+        # `Droga podstawowa #16` / `Base Road 16` -> nazwa rodziny bez numeru
+        return re.sub(r'\s*#?\d+$', '', name)
+
+    @staticmethod
+    def _update_catalog(replacements: Dict[str, str], height_items: Dict[str, List[str]]):
+        """Replace member entries with the family block (highest member) or its height items; height items
+        missing from the catalog are listed right after their family block"""
+        data = JsonBackend.load_file(LangUtils.CATALOG_FILE)
+        listed = {replacements.get(item, item) for category in data['minecraft:crafting_items_catalog']['categories']
+                  for group in category.get('groups', []) for item in group.get('items', [])}
+        for category in data['minecraft:crafting_items_catalog']['categories']:
+            for group in category.get('groups', []):
+                items = []
+                for item in group.get('items', []):
+                    item = replacements.get(item, item)
+                    items.append(item)
+                    items.extend(height_item for height_item in height_items.get(item, []) if height_item not in listed)
+                group['items'] = items
+                icon = group.get('group_identifier', {}).get('icon')
+                if icon in replacements:
+                    group['group_identifier']['icon'] = replacements[icon]
+        MinecraftAddon.create_file(LangUtils.CATALOG_FILE, JsonBackend.dumps(data))
+
+    @staticmethod
+    def _update_translations(families: Dict[str, Dict[str, Any]]):
+        """Add the family name (from the highest member) before its members and height item names after them;
+        member names stay for the deprecated blocks"""
+        namespace = MinecraftAddon.NAMESPACE
+        member_keys = {f"tile.{namespace}:{name}_{height}.name": (name, height)
+                       for name, family in families.items() for height in family['members']}
+        for lang_name in JsonBackend.load_file(LangUtils.LANGUAGES_FILE):
+            lang_path = os.path.join(LangUtils.TEXTS_DIR, f"{lang_name}.lang")
+            with open(lang_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            index = LangUtils.parse_lang(content)
+            lines = []
+            written = set()
+            for line in content.splitlines(keepends=True):
+                key = line.lstrip('\ufeff').partition('=')[0].strip()
+                if key not in member_keys:
+                    lines.append(line)
+                    continue
+                name, height = member_keys[key]
+                if name not in written:
+                    written.add(name)
+                    top_key = f"tile.{namespace}:{name}_{max(families[name]['members'])}.name"
+                    value = index.get(top_key, index[key])[0]
+                    lines.append(f"tile.{namespace}:{name}.name={HeightFamilies._family_name(value)}\n")
+                lines.append(line if line.endswith('\n') else line + '\n')
+                if height != max(families[name]['members']):
+                    lines.append(f"item.{HeightFamilies.height_item(name, height)}={index[key][0]}\n")
+            MinecraftAddon.create_file(lang_path, ''.join(lines))
+
+    @staticmethod
+    def _update_rp_blocks(families: Dict[str, Dict[str, Any]]):
+        """Add family entries (taken from the first member) next to the deprecated member entries"""
+        if not os.path.exists(HeightFamilies.RP_BLOCKS_FILE):
+            return
+        data = JsonBackend.load_file(HeightFamilies.RP_BLOCKS_FILE)
+        updated = {}
+        for key, value in data.items():
+            base = key.partition(':')[2] if ':' in key else key
+            match = re.match(r'^(.+)_(\d+)$', base)
+            if match and match.group(1) in families and int(match.group(2)) in families[match.group(1)]['members']:
+                updated.setdefault(key[:len(key) - len(base)] + match.group(1), value)
+            updated[key] = value
+        MinecraftAddon.create_file(HeightFamilies.RP_BLOCKS_FILE, JsonBackend.dumps(updated))
+
+    @staticmethod
+    def _update_item_textures(families: Dict[str, Dict[str, Any]]):
+        """Register item icons of the height items (the family texture from terrain_texture.json)"""
+        terrain = JsonBackend.load_file(HeightFamilies.TERRAIN_TEXTURE_FILE).get('texture_data', {})
+        if os.path.exists(HeightFamilies.ITEM_TEXTURE_FILE):
+            data = JsonBackend.load_file(HeightFamilies.ITEM_TEXTURE_FILE)
+        else:
+            data = {"resource_pack_name": "vanilla", "texture_name": "atlas.items", "texture_data": {}}
+        for name, family in families.items():
+            texture = terrain.get(HeightFamilies._icon_texture(family), {}).get('textures')
+            if texture:
+                data['texture_data'].setdefault(name, {"textures": texture})
+        MinecraftAddon.create_file(HeightFamilies.ITEM_TEXTURE_FILE, JsonBackend.dumps(data))
+
+    @staticmethod
+    def _plan(families: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, str]]]:
+        """Collapsible families by name and skipped families with reasons"""
+        by_name: Dict[str, List[Dict[str, Any]]] = {}
+        for family in families.values():
+            by_name.setdefault(family['name'], []).append(family)
+        collapsed = {}
+        skipped = []
+        for name, same_name in sorted(by_name.items()):
+            for family in same_name:
+                if len(same_name) > 1:
+                    # Jeden identyfikator `ns:name` nie może opisać rodzin z kilku katalogów
+                    directories = ', '.join(sorted(f['directory'] for f in same_name))
+                    reason = f"family name used in several directories ({directories})"
+                else:
+                    reason = HeightFamilies._shared_definition(family)
+                family_file = f"{family['directory']}/{name}.block.json"
+                if not reason and os.path.exists(family_file):
+                    reason = f"[{family_file}] already exists"
+                if reason:
+                    skipped.append({'family': name, 'directory': family['directory'], 'reason': reason})
+                else:
+                    collapsed[name] = family
+        return collapsed, skipped
+
+    @staticmethod
+    def collapse(report_file: str = REPORT_FILE, dry_run: bool = False) -> Dict[str, Any]:
+        """Emit state-driven blocks and height items for all height families, keep members as deprecated blocks
+        for world migration and write report (dry run only prints the plan)"""
+        ConsoleStyle.print_section("Collapsing height families into state-driven blocks", "=", "🏗️")
+        state = HeightFamilies.state_name()
+        namespace = MinecraftAddon.NAMESPACE
+        block_types_before = len(scan_files('BP/blocks', '.block.json'))
+        collapsed, skipped = HeightFamilies._plan(HeightFamilies.find_families())
+        for entry in skipped:
+            print(ConsoleStyle.warning(f"Skipping family [{entry['family']}] in [{entry['directory']}]: "
+                                       f"{entry['reason']}"))
+        report = {'state': state, 'families': [], 'skipped': skipped}
+        replacements = {}
+        height_items = {}
+        radius = HeightFamilies.FILL_RADIUS
+        for name, family in collapsed.items():
+            family_id = f"{namespace}:{name}"
+            top = max(family['members'])
+            family_file = f"{family['directory']}/{name}.block.json"
+            items = {}
+            replaced = {}
+            for height, (file_path, data) in sorted(family['members'].items()):
+                old_id = data['minecraft:block']['description']['identifier']
+                replacements[old_id] = family_id if height == top else HeightFamilies.height_item(name, height)
+                if height != top:
+                    items[height] = os.path.join(HeightFamilies.ITEMS_DIR, os.path.relpath(
+                        family['directory'], 'BP/blocks'), f"{name}_height_{height}.item.json")
+                replaced[old_id] = {
+                    'name': family_id,
+                    'states': {state: height},
+                    'deprecated_file': file_path,
+                    # Zamiana bloków w istniejącym świecie (sześcian 32x32x32 wokół gracza, limit /fill)
+                    'command': f'fill ~-{radius} ~-{radius} ~-{radius} ~{radius - 1} ~{radius - 1} ~{radius - 1} '
+                               f'{family_id} ["{state}"={height}] replace {old_id}',
+                }
+            # Wysokości od najwyższej, jak wartości stanu
+            height_items[family_id] = [HeightFamilies.height_item(name, height) for height in sorted(items, reverse=True)]
+            report['families'].append({'family': family_id, 'directory': family['directory'], 'file': family_file,
+                                        'heights': sorted(family['members']), 'items': sorted(items.values()),
+                                        'replaced': replaced})
+            if dry_run:
+                print(ConsoleStyle.info(f"[{family_id}] <- [{len(family['members'])}] blocks in "
+                                        f"[{family['directory']}], [{len(items)}] height items"))
+                continue
+            MinecraftAddon.create_file(family_file, JsonBackend.dumps(HeightFamilies.collapse_block(family)))
+            for height, item_file in items.items():
+                MinecraftAddon.create_file(item_file, JsonBackend.dumps(HeightFamilies.height_item_data(family,
+                                                                                                        height)))
+            for height, (file_path, data) in family['members'].items():
+                MinecraftAddon.create_file(file_path, JsonBackend.dumps(HeightFamilies.deprecated_block(data)))
+
+        if collapsed and not dry_run:
+            HeightFamilies._update_catalog(replacements, height_items)
+            HeightFamilies._update_translations(collapsed)
+            HeightFamilies._update_rp_blocks(collapsed)
+            HeightFamilies._update_item_textures(collapsed)
+
+        report['block_types_before'] = block_types_before
+        report['block_types_during_migration'] = block_types_before + len(collapsed)
+        report['block_types_after'] = block_types_before - sum(len(family['members']) - 1
+                                                               for family in collapsed.values())
+        # Ponowne uruchomienie nie nadpisuje raportu poprzedniej migracji
+        if collapsed and not dry_run:
+            MinecraftAddon.create_file(report_file, JsonBackend.dumps(report))
+        ConsoleStyle.print_stats({
+            ConsoleStyle.info("Collapsed families"): f"[{len(collapsed)}]" + (" (dry run)" if dry_run else ""),
+            ConsoleStyle.info("Skipped families"): f"[{len(skipped)}]",
+            ConsoleStyle.info("Block types"): f"[{report['block_types_before']}] -> "
+                                              f"[{report['block_types_during_migration']}] during migration -> "
+                                              f"[{report['block_types_after']}]",
+            ConsoleStyle.info("Migration report"): report_file if collapsed and not dry_run else "-",
+        }, "HEIGHT FAMILIES", icon="📉")
+        return report
+
+    @staticmethod
+    def remove_deprecated(report_file: str = REPORT_FILE, dry_run: bool = False) -> List[str]:
+        """After worlds are migrated: remove deprecated member blocks listed in the report (with names and
+        RP/blocks.json entries), return removed block identifiers"""
+        ConsoleStyle.print_section("Removing deprecated height family blocks", "=", "🧹")
+        report = JsonBackend.load_file(report_file)
+        removed = {}
+        for family in report['families']:
+            for old_id, entry in family['replaced'].items():
+                if os.path.exists(entry['deprecated_file']):
+                    removed[old_id] = entry['deprecated_file']
+        for old_id, file_path in sorted(removed.items()):
+            if dry_run:
+                print(ConsoleStyle.info(f"Would remove [{old_id}] ({file_path})"))
+                continue
+            os.remove(file_path)
+            print(ConsoleStyle.delete(f"Removed [{file_path}]"))
+        if removed and not dry_run:
+            names = {old_id.partition(':')[2] for old_id in removed}
+            for lang_name in JsonBackend.load_file(LangUtils.LANGUAGES_FILE):
+                lang_path = os.path.join(LangUtils.TEXTS_DIR, f"{lang_name}.lang")
+                with open(lang_path, 'r', encoding='utf-8') as f:
+                    lines = f.readlines()
+                keys = {f"tile.{old_id}.name" for old_id in removed}
+                MinecraftAddon.create_file(lang_path, ''.join(
+                    line for line in lines if line.lstrip('\ufeff').partition('=')[0].strip() not in keys))
+            if os.path.exists(HeightFamilies.RP_BLOCKS_FILE):
+                data = JsonBackend.load_file(HeightFamilies.RP_BLOCKS_FILE)
+                MinecraftAddon.create_file(HeightFamilies.RP_BLOCKS_FILE, JsonBackend.dumps(
+                    {key: value for key, value in data.items() if key.partition(':')[2] not in names
+                     and key not in names}))
+        ConsoleStyle.print_stats({
+            ConsoleStyle.info("Deprecated blocks removed"): f"[{len(removed)}]" + (" (dry run)" if dry_run else ""),
+        }, "HEIGHT FAMILIES", icon="📉")
+        return sorted(removed)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate road ramp blocks and geometries")
+    parser.add_argument("--profile", nargs='?', const='', metavar='FILE',
+                        help="print timing of generation stages (and save flame graph stacks to FILE)")
+    parser.add_argument("--collapse-heights", nargs='?', const=HeightFamilies.REPORT_FILE, metavar='REPORT',
+                        help="emit one block per height family with a height block state and height items; members "
+                             "stay as deprecated blocks for world migration (rewrites BP/RP, writes migration report)")
+    parser.add_argument("--remove-deprecated", nargs='?', const=HeightFamilies.REPORT_FILE, metavar='REPORT',
+                        help="after migrating worlds: remove deprecated member blocks listed in the migration report")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="with --collapse-heights/--remove-deprecated: print the plan without writing files")
+    args = parser.parse_args()
+    Profiler.set_enabled(args.profile is not None)
+
+    if args.collapse_heights:
+        with Profiler.stage("HeightFamilies.collapse"):
+            HeightFamilies.collapse(args.collapse_heights, args.dry_run)
+        Profiler.finish(args.profile)
+        return
+    if args.remove_deprecated:
+        with Profiler.stage("HeightFamilies.remove_deprecated"):
+            HeightFamilies.remove_deprecated(args.remove_deprecated, args.dry_run)
+        Profiler.finish(args.profile)
+        return
+
     # RoadRampOblique45000()
-    RoadRampOblique22500()
-    RoadRampOblique11250()
+    with Profiler.stage("RoadRampOblique22500"):
+        RoadRampOblique22500()
+    with Profiler.stage("RoadRampOblique11250"):
+        RoadRampOblique11250()
     # straight_road_ramp(1)
-    RoadRampStraight(2)
-    RoadRampStraight(3)
-    RoadRampStraight(4)
-    RoadRampStraight(6)
-    RoadRampStraight(8)
+    for parts in (2, 3, 4, 6, 8):
+        with Profiler.stage(f"RoadRampStraight({parts})"):
+            RoadRampStraight(parts)
+
+    Profiler.finish(args.profile)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Biblioteka z funkcjami leniwego importu modułów
+"""
+import importlib
+import importlib.util
+
+
+class LazyModule:
+    """Module proxy which imports the real module on first attribute access"""
+
+    def __init__(self, name: str):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def __getattr__(self, attr):
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self.__dict__['_name'])
+            self.__dict__['_module'] = module
+        return getattr(module, attr)
+
+    def __repr__(self):
+        return f"<lazy module '{self.__dict__['_name']}'>"
+
+
+def lazy_import(name: str):
+    """Return a lazy proxy of the module, or None when the module is not installed"""
+    try:
+        if importlib.util.find_spec(name) is None:
+            return None
+    except (ImportError, ValueError):
+        return None
+    return LazyModule(name)
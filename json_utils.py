@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Biblioteka z funkcjami serializacji JSON (orjson / ujson / json)
+"""
+import json
+import re
+from typing import Any
+
+from console_utils import Profiler
+from import_utils import lazy_import
+
+# Backend wybierany przy imporcie, ale sam moduł ładowany przy pierwszym użyciu
+orjson = lazy_import('orjson')
+ujson = lazy_import('ujson')
+
+
+# Napisy są dopasowywane pierwsze, aby `//` i `/*` wewnątrz nich nie były traktowane jak komentarze
+_COMMENT_PATTERN = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', re.DOTALL)
+
+
+def _orjson_default(value):
+    """Serialize float/int subclasses (e.g. numpy scalars) that orjson rejects"""
+    if isinstance(value, float):
+        return float(value)
+    if isinstance(value, int):
+        return int(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class JsonBackend:
+    """Class for JSON parsing and serialization with the fastest available backend"""
+
+    # Parsowanie: orjson > ujson > json, zapis: orjson > json
+    # (ujson formatuje inaczej liczby i wcięcia niż json, więc nie jest używany do zapisu)
+    LOADS_BACKEND = 'orjson' if orjson else 'ujson' if ujson else 'json'
+    DUMPS_BACKEND = 'orjson' if orjson else 'json'
+
+    # Tryb kompaktowy (bez białych znaków) dla paczek wydawanych
+    COMPACT_MODE = False
+
+    @staticmethod
+    def set_compact_mode(enabled: bool = True):
+        """Set compact mode"""
+        JsonBackend.COMPACT_MODE = enabled
+
+    @staticmethod
+    def loads(content):
+        """Parse JSON string or bytes; decoding errors are always json.JSONDecodeError"""
+        if orjson:
+            return orjson.loads(content)
+        if ujson:
+            try:
+                return ujson.loads(content)
+            except ValueError as e:
+                raise json.JSONDecodeError(str(e), content if isinstance(content, str) else '', 0) from e
+        return json.loads(content)
+
+    @staticmethod
+    def strip_comments(content: str) -> str:
+        """Remove // and /* */ comments outside of strings (Bedrock JSON allows them)"""
+        return _COMMENT_PATTERN.sub(lambda match: match.group(1) or '', content)
+
+    @staticmethod
+    def loads_lenient(content: bytes):
+        """Parse JSON bytes, retrying without comments when strict parsing fails"""
+        if content.startswith(b'\xef\xbb\xbf'):
+            content = content[3:]
+        try:
+            return JsonBackend.loads(content if orjson or ujson else content.decode('utf-8'))
+        except json.JSONDecodeError:
+            text = content.decode('utf-8')
+            if '//' not in text and '/*' not in text:
+                raise
+            return JsonBackend.loads(JsonBackend.strip_comments(text))
+
+    @staticmethod
+    def load_file(file_path: str):
+        """Load a JSON file (comments allowed) and return its content"""
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        with Profiler.stage("json.load", len(content)):
+            return JsonBackend.loads_lenient(content)
+
+    @staticmethod
+    def dumps(data: Any, compact: bool = None) -> str:
+        """Serialize data to 2-space indented JSON (or compact JSON in compact mode)"""
+        if compact is None:
+            compact = JsonBackend.COMPACT_MODE
+        if orjson:
+            option = orjson.OPT_SERIALIZE_NUMPY if compact else orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
+            return orjson.dumps(data, default=_orjson_default, option=option).decode('utf-8')
+        if compact:
+            return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        return json.dumps(data, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def dump_file(file_path: str, data: Any, compact: bool = None):
+        """Save data as JSON file"""
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(JsonBackend.dumps(data, compact))
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Biblioteka wyliczająca granice modeli (visible_bounds, selection box) z kostek geometrii
+"""
+import argparse
+import json
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from console_utils import ConsoleStyle
+from json_utils import JsonBackend
+from scan_utils import scan_files
+
+Vector = Tuple[float, float, float]
+
+# Jednostki modelu: 16 = jeden blok; blok zajmuje x/z od -8 do 8 i y od 0 do 16
+BLOCK_UNIT = 16.0
+BLOCK_MIN = (-8.0, 0.0, -8.0)
+BLOCK_MAX = (8.0, 16.0, 8.0)
+# Zaokrąglenie jak w generatorze ramp (3 miejsca po przecinku w jednostkach modelu)
+PRECISION = 3
+TOLERANCE = 10 ** -PRECISION
+VISIBLE_BOUNDS_KEYS = ('visible_bounds_width', 'visible_bounds_height', 'visible_bounds_offset')
+# Wyliczany z geometrii jest tylko selection box — collision box to decyzja o rozgrywce (np. niższe rampy ukośne,
+# na które da się wejść) i nie jest porównywany ani nadpisywany
+DERIVED_BOX_COMPONENTS = ('minecraft:selection_box',)
+
+
+@dataclass(frozen=True)
+class Bounds:
+    """Prostopadłościan w jednostkach modelu"""
+    min: Vector
+    max: Vector
+
+    @staticmethod
+    def of_points(points: Iterable[Vector]) -> Optional['Bounds']:
+        points = list(points)
+        if not points:
+            return None
+        return Bounds(tuple(min(point[i] for point in points) for i in range(3)),
+                      tuple(max(point[i] for point in points) for i in range(3)))
+
+    @property
+    def size(self) -> Vector:
+        return tuple(self.max[i] - self.min[i] for i in range(3))
+
+    def contains(self, other: 'Bounds', tolerance: float = TOLERANCE) -> bool:
+        return all(self.min[i] - tolerance <= other.min[i] and other.max[i] <= self.max[i] + tolerance
+                   for i in range(3))
+
+    def close_to(self, other: 'Bounds', tolerance: float = TOLERANCE) -> bool:
+        return all(abs(self.min[i] - other.min[i]) <= tolerance and abs(self.max[i] - other.max[i]) <= tolerance
+                   for i in range(3))
+
+
+def _rotate(point: Vector, pivot: Vector, rotation: Vector) -> Vector:
+    """Rotate the point around the pivot by Euler angles in degrees (X, then Y, then Z)"""
+    x, y, z = (point[i] - pivot[i] for i in range(3))
+    rx, ry, rz = (math.radians(angle) for angle in rotation)
+    if rx:
+        y, z = y * math.cos(rx) - z * math.sin(rx), y * math.sin(rx) + z * math.cos(rx)
+    if ry:
+        x, z = x * math.cos(ry) + z * math.sin(ry), -x * math.sin(ry) + z * math.cos(ry)
+    if rz:
+        x, y = x * math.cos(rz) - y * math.sin(rz), x * math.sin(rz) + y * math.cos(rz)
+    return x + pivot[0], y + pivot[1], z + pivot[2]
+
+
+def cube_points(cube: Dict[str, Any]) -> List[Vector]:
+    """Corners of the cube (with inflate and its own rotation around pivot)"""
+    inflate = cube.get('inflate', 0)
+    low = [cube['origin'][i] - inflate for i in range(3)]
+    high = [cube['origin'][i] + cube['size'][i] + inflate for i in range(3)]
+    points = [(x, y, z) for x in (low[0], high[0]) for y in (low[1], high[1]) for z in (low[2], high[2])]
+    if any(cube.get('rotation', (0, 0, 0))):
+        points = [_rotate(point, cube.get('pivot', (0, 0, 0)), cube['rotation']) for point in points]
+    return points
+
+
+def geometry_bounds(geometry: Dict[str, Any]) -> Optional[Bounds]:
+    """Bounds of all cubes of the geometry, with bone rotations of the bone and its parents applied"""
+    bones = {bone.get('name'): bone for bone in geometry.get('bones', [])}
+    points = []
+    for bone in geometry.get('bones', []):
+        bone_points = [point for cube in bone.get('cubes', []) for point in cube_points(cube)]
+        chain = set()
+        while bone is not None and bone.get('name') not in chain:
+            chain.add(bone.get('name'))
+            if any(bone.get('rotation', (0, 0, 0))):
+                bone_points = [_rotate(point, bone.get('pivot', (0, 0, 0)), bone['rotation']) for point in bone_points]
+            bone = bones.get(bone.get('parent'))
+        points.extend(bone_points)
+    return Bounds.of_points(points)
+
+
+def cubes_bounds(cubes: List[Dict[str, Any]]) -> Optional[Bounds]:
+    """Bounds of cubes of a single unrotated bone (as emitted by the generators)"""
+    return geometry_bounds({'bones': [{'name': 'block', 'cubes': cubes}]})
+
+
+def _number(value: float, precision: int = PRECISION):
+    value = round(value, precision)
+    return int(value) if value == int(value) else value
+
+
+def visible_bounds(bounds: Bounds) -> Dict[str, Any]:
+    """Tight visible_bounds_* description fields (in blocks, offset is the box center)"""
+    precision = PRECISION + 2
+    # Szerokość i wysokość zaokrąglone w górę, aby model nigdy nie wychodził poza granice widoczności
+    width = math.ceil(max(bounds.size[0], bounds.size[2]) / BLOCK_UNIT * 10 ** precision) / 10 ** precision
+    height = math.ceil(bounds.size[1] / BLOCK_UNIT * 10 ** precision) / 10 ** precision
+    return {
+        'visible_bounds_width': _number(width, precision),
+        'visible_bounds_height': _number(height, precision),
+        'visible_bounds_offset': [_number((bounds.min[i] + bounds.max[i]) / 2 / BLOCK_UNIT, precision)
+                                  for i in range(3)],
+    }
+
+
+def declared_visible_bounds(description: Dict[str, Any]) -> Optional[Bounds]:
+    """Visible box declared in the geometry description (in model units), None when incomplete"""
+    try:
+        width = description['visible_bounds_width'] * BLOCK_UNIT
+        height = description['visible_bounds_height'] * BLOCK_UNIT
+        offset = [value * BLOCK_UNIT for value in description['visible_bounds_offset']]
+    except (KeyError, TypeError):
+        return None
+    half = (width / 2, height / 2, width / 2)
+    return Bounds(tuple(offset[i] - half[i] for i in range(3)), tuple(offset[i] + half[i] for i in range(3)))
+
+
+def block_box(bounds: Bounds) -> Dict[str, Any]:
+    """Collision/selection box component covering the model, clamped to the block cell"""
+    low = [min(max(bounds.min[i], BLOCK_MIN[i]), BLOCK_MAX[i]) for i in range(3)]
+    high = [min(max(bounds.max[i], BLOCK_MIN[i]), BLOCK_MAX[i]) for i in range(3)]
+    return {"origin": [_number(low[i]) for i in range(3)], "size": [_number(high[i] - low[i]) for i in range(3)]}
+
+
+def _declared_box(component: Any) -> Optional[Bounds]:
+    """Box of a collision/selection component (missing or true is the full block, false is None)"""
+    if component is None or component is True:
+        return Bounds(BLOCK_MIN, BLOCK_MAX)
+    if component is False:
+        return None
+    origin, size = component.get('origin', BLOCK_MIN), component.get('size', (16, 16, 16))
+    return Bounds(tuple(origin), tuple(origin[i] + size[i] for i in range(3)))
+
+
+@dataclass
+class Drift:
+    """Zadeklarowane granice różniące się od wyliczonych z geometrii"""
+    file_path: str
+    # Identyfikator geometrii albo komponent bloku (z indeksem permutacji)
+    location: str
+    declared: Any
+    expected: Any
+    # Zadeklarowane granice widoczności obcinają model (migotanie przy cullingu)
+    clipping: bool = False
+
+    def message(self) -> str:
+        declared = JsonBackend.dumps(self.declared, compact=True)
+        expected = JsonBackend.dumps(self.expected, compact=True)
+        problem = "clips the model" if self.clipping else "drifts from geometry"
+        return f"[{self.file_path}] {self.location} {problem}: {declared} -> {expected}"
+
+
+def check_geometry_file(file_path: str) -> Tuple[Dict[str, Bounds], List[Drift]]:
+    """Bounds of geometries defined in the file and drift of their visible_bounds"""
+    data = JsonBackend.load_file(file_path)
+    bounds_by_geometry = {}
+    drifts = []
+    for geometry in data.get('minecraft:geometry', []):
+        description = geometry.get('description', {})
+        identifier = description.get('identifier')
+        bounds = geometry_bounds(geometry)
+        if not identifier or bounds is None:
+            continue
+        bounds_by_geometry[identifier] = bounds
+        expected = visible_bounds(bounds)
+        declared = {key: description[key] for key in VISIBLE_BOUNDS_KEYS if key in description}
+        declared_box = declared_visible_bounds(description)
+        expected_box = declared_visible_bounds(expected)
+        if declared_box is None or not declared_box.close_to(expected_box):
+            drifts.append(Drift(file_path, identifier, declared, expected,
+                                clipping=declared_box is None or not declared_box.contains(bounds)))
+    return bounds_by_geometry, drifts
+
+
+def _geometry_identifier(component: Any) -> Optional[str]:
+    return component.get('identifier') if isinstance(component, dict) else component
+
+
+def check_block_file(file_path: str, bounds_by_geometry: Dict[str, Bounds]) -> List[Drift]:
+    """Drift of selection boxes of the block (and its permutations) from its geometries"""
+    block = JsonBackend.load_file(file_path).get('minecraft:block', {})
+    components = block.get('components', {})
+    contexts = [('components', components, components)]
+    for index, permutation in enumerate(block.get('permutations', [])):
+        overrides = permutation.get('components', {})
+        if any(key in overrides for key in ('minecraft:geometry',) + DERIVED_BOX_COMPONENTS):
+            contexts.append((f'permutations[{index}]', overrides, {**components, **overrides}))
+
+    drifts = []
+    for location, own_components, effective in contexts:
+        bounds = bounds_by_geometry.get(_geometry_identifier(effective.get('minecraft:geometry')))
+        if bounds is None:
+            # Geometria wbudowana lub brakująca (zgłaszana przez verify_models)
+            continue
+        expected = block_box(bounds)
+        for component in DERIVED_BOX_COMPONENTS:
+            if location != 'components' and component not in own_components \
+                    and 'minecraft:geometry' not in own_components:
+                continue
+            declared = _declared_box(effective.get(component))
+            if declared is not None and not declared.close_to(_declared_box(expected)):
+                drifts.append(Drift(file_path, f'{location}.{component}', effective.get(component), expected))
+    return drifts
+
+
+def check_project() -> Tuple[List[Drift], Dict[str, int]]:
+    """Drift of all geometries in RP/models and all blocks in BP/blocks, with counts of checked files"""
+    bounds_by_geometry = {}
+    drifts = []
+    model_files = scan_files('RP/models', '.geo.json')
+    for file_path in model_files:
+        file_bounds, file_drifts = check_geometry_file(file_path)
+        bounds_by_geometry.update(file_bounds)
+        drifts.extend(file_drifts)
+    block_files = scan_files('BP/blocks', '.block.json')
+    for file_path in block_files:
+        drifts.extend(check_block_file(file_path, bounds_by_geometry))
+    return drifts, {'geometries': len(bounds_by_geometry), 'models': len(model_files), 'blocks': len(block_files)}
+
+
+def _replace_value(text: str, key: str, occurrence: int, value: Any) -> str:
+    """Replace the value of the n-th occurrence of the key in JSON text, keeping the rest of the formatting"""
+    match = list(re.finditer(rf'"{re.escape(key)}"\s*:\s*', text))[occurrence]
+    _, end = json.JSONDecoder().raw_decode(text, match.end())
+    indent = re.match(r'[ \t]*', text[text.rfind('\n', 0, match.start()) + 1:]).group()
+    replacement = JsonBackend.dumps(value, compact='\n' not in text.strip()).replace('\n', '\n' + indent)
+    return text[:match.end()] + replacement + text[end:]
+
+
+def _fix_geometry_file(file_path: str, drifts: List[Drift]):
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    data = JsonBackend.loads_lenient(content)
+    text = content.decode('utf-8-sig')
+    geometries = data.get('minecraft:geometry', [])
+    expected = {drift.location: drift.expected for drift in drifts}
+    if all(len(re.findall(rf'"{key}"\s*:', text)) == len(geometries) for key in VISIBLE_BOUNDS_KEYS):
+        # Podmiana samych wartości — zachowuje formatowanie (np. kostki w jednej linii z generatora)
+        for index, geometry in enumerate(geometries):
+            for key, value in expected.get(geometry['description'].get('identifier'), {}).items():
+                text = _replace_value(text, key, index, value)
+    else:
+        for geometry in geometries:
+            geometry['description'].update(expected.get(geometry['description'].get('identifier'), {}))
+        text = JsonBackend.dumps(data)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def _fix_block_file(file_path: str, drifts: List[Drift]):
+    data = JsonBackend.load_file(file_path)
+    block = data['minecraft:block']
+    for drift in drifts:
+        location, component = drift.location.split('.', 1)
+        if location == 'components':
+            block['components'][component] = drift.expected
+        else:
+            index = int(location[len('permutations['):-1])
+            block['permutations'][index]['components'][component] = drift.expected
+    JsonBackend.dump_file(file_path, data)
+
+
+def fix(drifts: List[Drift]) -> List[str]:
+    """Write computed bounds into drifting files, return rewritten file paths"""
+    by_file = {}
+    for drift in drifts:
+        by_file.setdefault(drift.file_path, []).append(drift)
+    for file_path, file_drifts in sorted(by_file.items()):
+        if file_path.endswith('.geo.json'):
+            _fix_geometry_file(file_path, file_drifts)
+        else:
+            _fix_block_file(file_path, file_drifts)
+    return sorted(by_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare model bounds and block boxes with geometry cube extents")
+    parser.add_argument("--fix", action="store_true",
+                        help="write computed visible bounds and selection boxes into drifting files (collision boxes are kept)")
+    args = parser.parse_args()
+
+    drifts, counts = check_project()
+    for drift in drifts:
+        print(ConsoleStyle.error(drift.message()) if drift.clipping else ConsoleStyle.warning(drift.message()))
+    print(ConsoleStyle.info(f"Checked [{counts['geometries']}] geometries and [{counts['blocks']}] blocks, "
+                            f"[{len(drifts)}] drifting bounds"))
+    if args.fix and drifts:
+        fixed = fix(drifts)
+        print(ConsoleStyle.success(f"Rewritten [{len(fixed)}] files"))
+
+
+if __name__ == "__main__":
+    main()
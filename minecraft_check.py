@@ -2,12 +2,17 @@
 """
 Biblioteka z funkcjami weryfikacji strukturę paczki Minecraft
 """
+import fnmatch
 import json
 import os
 import sys
 from typing import Any, Dict, List, Callable, Tuple
 
-from console_utils import ConsoleStyle, print_if_not_quiet
+from console_utils import ConsoleStyle, Profiler, print_if_not_quiet
+from json_utils import JsonBackend
+from minecraft_lang import LangUtils
+from scan_utils import ProjectScanner, scan_files
+from verification_report import SEVERITY_ERROR, SEVERITY_WARNING, Finding, VerificationReport, run_check
 
 
 class MinecraftUtils:
@@ -15,10 +20,29 @@ class MinecraftUtils:
 
     namespace = None
     DATABASE_FILE_NAME = 'database.json'
+    TERRAIN_TEXTURE_FILE = 'RP/textures/terrain_texture.json'
+    ITEM_TEXTURE_FILE = 'RP/textures/item_texture.json'
 
     # Lista wbudowanych tekstur Minecraft Bedrock Edition
     BUILTIN_TEXTURES_FILE = 'minecraft_textures.json'
 
+    # Wzorce ścieżek -> weryfikacje, które od nich zależą
+    VERIFICATION_DEPENDENCIES = [
+        ('config.json', ['verify_config']),
+        ('*/manifest.json', ['verify_manifests', 'verify_schemas']),
+        ('RP/blocks.json', ['verify_schemas']),
+        ('RP/textures/*_texture.json', ['verify_schemas']),
+        ('*/pack_icon.png', ['verify_project_structure']),
+        ('database.json', ['verify_blocks', 'verify_translations']),
+        ('BP/item_catalog/*', ['verify_translations', 'verify_schemas']),
+        ('BP/blocks/*', ['verify_config', 'verify_blocks', 'verify_models', 'verify_textures', 'verify_translations',
+                         'verify_schemas', 'verify_bounds']),
+        ('BP/items/*', ['verify_textures']),
+        ('RP/models/*', ['verify_models', 'verify_schemas', 'verify_bounds']),
+        ('RP/textures/*', ['verify_textures']),
+        ('RP/texts/*', ['verify_translations']),
+    ]
+
     @staticmethod
     def _load_builtin_textures():
         """Załaduj wbudowane tekstury z zewnętrznego pliku"""
@@ -33,6 +57,54 @@ class MinecraftUtils:
             print(ConsoleStyle.error(f"Błąd podczas ładowania [{MinecraftUtils.BUILTIN_TEXTURES_FILE}]: {e}"))
             return set()
 
+    @staticmethod
+    def default_verifications() -> List[Callable[[], Tuple[List[str], List[str]]]]:
+        """Weryfikacje uruchamiane przez verify_all.py"""
+        return [
+            MinecraftUtils.verify_config,
+            MinecraftUtils.verify_manifests,
+            MinecraftUtils.verify_project_structure,
+            MinecraftUtils.count_project_files,
+            MinecraftUtils.verify_translations,
+            MinecraftUtils.verify_blocks,
+            MinecraftUtils.verify_textures,
+            MinecraftUtils.verify_schemas,
+            MinecraftUtils.verify_bounds,
+        ]
+
+    @staticmethod
+    def available_verifications() -> List[Callable[[], Tuple[List[str], List[str]]]]:
+        """Wszystkie weryfikacje, które można uruchomić wybiórczo (domyślne + modele)"""
+        return MinecraftUtils.default_verifications() + [MinecraftUtils.verify_models]
+
+    @staticmethod
+    def affected_verifications(file_paths, verifications=None) -> List[Callable[[], Tuple[List[str], List[str]]]]:
+        """Wybierz weryfikacje zależne od zmienionych plików (zachowując kolejność)
+
+        Ścieżki względne (także z ./) i bezwzględne są liczone od katalogu projektu. Plik z BP/ lub RP/,
+        do którego nie pasuje żadna reguła, uruchamia wszystkie weryfikacje.
+        """
+        if verifications is None:
+            verifications = MinecraftUtils.available_verifications()
+        names = set()
+        for file_path in file_paths:
+            file_path = os.path.relpath(os.path.normpath(file_path)).replace(os.sep, '/')
+            matched = False
+            for pattern, verification_names in MinecraftUtils.VERIFICATION_DEPENDENCIES:
+                if fnmatch.fnmatch(file_path, pattern):
+                    names.update(verification_names)
+                    matched = True
+            if not matched and file_path.startswith(('BP/', 'RP/')):
+                return list(verifications)
+        return [verify_func for verify_func in verifications if verify_func.__name__ in names]
+
+    @staticmethod
+    def get_namespace():
+        """Pobierz namespace z config.json (jeśli verify_config jeszcze go nie ustawił)"""
+        if MinecraftUtils.namespace is None and os.path.exists('config.json'):
+            MinecraftUtils.namespace = MinecraftUtils.load_json_file('config.json').get('namespace')
+        return MinecraftUtils.namespace
+
     @staticmethod
     def get_builtin_textures():
         """Pobierz wbudowane tekstury (singleton pattern)"""
@@ -43,48 +115,46 @@ class MinecraftUtils:
     @staticmethod
     def load_json_file(file_path: str):
         """Load a JSON file and return its content"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return JsonBackend.load_file(file_path)
 
     # ===== FUNKCJE POMOCNICZE =====
 
     @staticmethod
-    def _get_bp_blocks():
-        """Pobierz wszystkie bloki z BP"""
+    @Profiler.profiled("scan _get_bp_block_files")
+    def _get_bp_block_files():
+        """Pobierz wszystkie bloki z BP razem ze ścieżkami plików"""
         blocks = {}
-        for root, dirs, files in os.walk("BP/blocks"):
-            for file in files:
-                if file.endswith('.block.json'):
-                    file_path = os.path.join(root, file)
-                    data = MinecraftUtils.load_json_file(file_path)
-                    if data:
-                        blocks[file.replace('.block.json', '')] = data
+        for file_path in scan_files("BP/blocks", '.block.json'):
+            data = MinecraftUtils.load_json_file(file_path)
+            if data:
+                blocks[os.path.basename(file_path).replace('.block.json', '')] = (file_path, data)
         return blocks
 
     @staticmethod
+    def _get_bp_blocks():
+        """Pobierz wszystkie bloki z BP"""
+        return {block_id: data for block_id, (_, data) in MinecraftUtils._get_bp_block_files().items()}
+
+    @staticmethod
+    @Profiler.profiled("scan _get_bp_items")
     def _get_bp_items():
         """Pobierz wszystkie itemy z BP"""
         items = {}
-        for root, dirs, files in os.walk("BP/items"):
-            for file in files:
-                if file.endswith('.item.json'):
-                    file_path = os.path.join(root, file)
-                    data = MinecraftUtils.load_json_file(file_path)
-                    if data:
-                        items[file.replace('.item.json', '')] = data
+        for file_path in scan_files("BP/items", '.item.json'):
+            data = MinecraftUtils.load_json_file(file_path)
+            if data:
+                items[os.path.basename(file_path).replace('.item.json', '')] = data
         return items
 
     @staticmethod
+    @Profiler.profiled("scan _get_rp_block_model_dimensions")
     def _get_rp_block_model_dimensions():
         model_dimensions = {}
-        for root, dirs, files in os.walk("RP/models/blocks"):
-            for file in files:
-                if file.endswith('.geo.json'):
-                    model_name = file.replace('.geo.json', '')
-                    model_path = os.path.join(root, file)
-                    width, height = MinecraftUtils._get_model_dimensions(model_path)
-                    if width and height:
-                        model_dimensions[model_name] = (width, height)
+        for model_path in scan_files("RP/models/blocks", '.geo.json'):
+            model_name = os.path.basename(model_path).replace('.geo.json', '')
+            width, height = MinecraftUtils._get_model_dimensions(model_path)
+            if width and height:
+                model_dimensions[model_name] = (width, height)
         return model_dimensions
 
     @staticmethod
@@ -136,11 +206,11 @@ class MinecraftUtils:
     def _verify_texture_mappings():
         """Wspólna weryfikacja mapowań terrain_texture.json"""
         try:
-            terrain_data = MinecraftUtils.load_json_file('RP/textures/terrain_texture.json')
+            terrain_data = MinecraftUtils.load_json_file(MinecraftUtils.TERRAIN_TEXTURE_FILE)
         except FileNotFoundError:
             terrain_data = []
         try:
-            item_data = MinecraftUtils.load_json_file('RP/textures/item_texture.json')
+            item_data = MinecraftUtils.load_json_file(MinecraftUtils.ITEM_TEXTURE_FILE)
         except FileNotFoundError:
             item_data = {}
         if not terrain_data and not item_data:
@@ -172,17 +242,10 @@ class MinecraftUtils:
         return valid_textures, missing_textures, groups['blocks'], groups['items']
 
     @staticmethod
+    @Profiler.profiled("scan _verify_png_files")
     def _verify_png_files():
         """Wspólna weryfikacja plików PNG"""
-        all_png_files = set()
-
-        for root, dirs, files in os.walk("RP/textures/"):
-            for file in files:
-                if file.endswith('.png'):
-                    full_path = os.path.join(root, file).replace('RP/', '')
-                    all_png_files.add(full_path)
-
-        return all_png_files
+        return {file_path.replace('RP/', '') for file_path in scan_files("RP/textures", '.png')}
 
     @staticmethod
     def _verify_material_instances(block_data):
@@ -221,40 +284,44 @@ class MinecraftUtils:
             return ""
 
     @staticmethod
-    def _verify_block_structure(block_id: str, block_data):
+    def _verify_block_structure(block_id: str, block_data, file_path: str = None):
         """Wspólna weryfikacja struktury bloku"""
         errors = []
         warnings = []
 
         # Check required structure
         if 'minecraft:block' not in block_data:
-            errors.append(f"Missing [minecraft:block] section in [{block_id}] block")
+            errors.append(Finding(
+                SEVERITY_ERROR, f"Missing [minecraft:block] section in [{block_id}] block", file_path))
             return errors, warnings
 
         block_data_section = block_data['minecraft:block']
 
         # Check description
         if 'description' not in block_data_section:
-            errors.append(f"Missing [description] section in [{block_id}] block")
+            errors.append(Finding(SEVERITY_ERROR, f"Missing [description] section in [{block_id}] block", file_path))
             return errors, warnings
 
         description = block_data_section['description']
 
         # Check identifier
         if 'identifier' not in description:
-            errors.append(f"Missing [identifier] field in [{block_id}] block")
+            errors.append(Finding(SEVERITY_ERROR, f"Missing [identifier] field in [{block_id}] block", file_path))
         else:
             identifier = description['identifier']
             if ':' not in identifier:
-                errors.append(f"Invalid identifier format (should be [namespace:name]) in [{block_id}] block")
+                errors.append(Finding(
+                    SEVERITY_ERROR, f"Invalid identifier format (should be [namespace:name]) in [{block_id}] block",
+                    file_path))
 
         # Check components
         if 'components' not in block_data_section:
-            errors.append(f"Missing [components] section in [{block_id}] block")
+            errors.append(Finding(SEVERITY_ERROR, f"Missing [components] section in [{block_id}] block", file_path))
         else:
             components = block_data_section['components']
             if 'minecraft:material_instances' not in components:
-                errors.append(f"Missing [minecraft:material_instances] section in [{block_id}] block")
+                errors.append(Finding(
+                    SEVERITY_ERROR, f"Missing [minecraft:material_instances] section in [{block_id}] block", file_path))
 
         return errors, warnings
 
@@ -285,9 +352,10 @@ class MinecraftUtils:
         blocks_loaded = []
         blocks_with_errors = []
 
-        for block_id, block_data in MinecraftUtils._get_bp_blocks().items():
+        for block_id, (file_path, block_data) in MinecraftUtils._get_bp_block_files().items():
             blocks_loaded.append(block_id)
-            structure_errors, structure_warnings = MinecraftUtils._verify_block_structure(block_id, block_data)
+            structure_errors, structure_warnings = MinecraftUtils._verify_block_structure(block_id, block_data,
+                                                                                          file_path)
             errors.extend(structure_errors)
             warnings.extend(structure_warnings)
 
@@ -326,8 +394,10 @@ class MinecraftUtils:
         stats[ConsoleStyle.error("Missing blocks") if file_blocks_missing else ConsoleStyle.info("Missing blocks")] = \
             f"[{len(file_blocks_missing)}] ({', '.join(sorted(file_blocks_missing))})" if file_blocks_missing else "0"
         if file_blocks_missing:
-            errors.append(
-                f"Missing [{len(file_blocks_missing)}] file blocks: {', '.join(sorted(file_blocks_missing))}")
+            errors.append(Finding(
+                SEVERITY_ERROR,
+                f"Missing [{len(file_blocks_missing)}] file blocks: {', '.join(sorted(file_blocks_missing))}",
+                MinecraftUtils.DATABASE_FILE_NAME))
 
         ConsoleStyle.print_stats(stats, "DATABASE BLOCK COVERAGE", icon="📄")
 
@@ -516,15 +586,19 @@ class MinecraftUtils:
             "Missing from terrain_texture.json")] \
             = f"[{len(missing_in_terrain)}] {', '.join(sorted(missing_in_terrain))}" if missing_in_terrain else "0"
         if missing_in_terrain:
-            errors.append(
-                f"Missing [{len(missing_in_terrain)}] textures in terrain_texture.json: {', '.join(sorted(missing_in_terrain))}")
+            errors.append(Finding(
+                SEVERITY_ERROR,
+                f"Missing [{len(missing_in_terrain)}] textures in terrain_texture.json: {', '.join(sorted(missing_in_terrain))}",
+                MinecraftUtils.TERRAIN_TEXTURE_FILE))
 
         stats[ConsoleStyle.warning("Unused in terrain_texture.json") if unused_textures else ConsoleStyle.info(
             "Unused in terrain_texture.json")] \
             = f"[{len(unused_textures)}] {', '.join(sorted(unused_textures))}" if unused_textures else "0"
         if unused_textures:
-            warnings.append(
-                f"Unused [{len(unused_textures)}] textures in terrain_texture.json: {', '.join(sorted(unused_textures))}")
+            warnings.append(Finding(
+                SEVERITY_WARNING,
+                f"Unused [{len(unused_textures)}] textures in terrain_texture.json: {', '.join(sorted(unused_textures))}",
+                MinecraftUtils.TERRAIN_TEXTURE_FILE))
 
         ConsoleStyle.print_stats(stats, "BLOCK TEXTURE DEFINITIONS", icon="🔗")
 
@@ -561,15 +635,19 @@ class MinecraftUtils:
             "Missing from item_texture.json")] \
             = f"[{len(missing_in_item)}] {', '.join(sorted(missing_in_item))}" if missing_in_item else "0"
         if missing_in_item:
-            errors.append(
-                f"Missing [{len(missing_in_item)}] textures in item_texture.json: {', '.join(sorted(missing_in_item))}")
+            errors.append(Finding(
+                SEVERITY_ERROR,
+                f"Missing [{len(missing_in_item)}] textures in item_texture.json: {', '.join(sorted(missing_in_item))}",
+                MinecraftUtils.ITEM_TEXTURE_FILE))
 
         stats[ConsoleStyle.warning("Unused in item_texture.json") if unused_textures else ConsoleStyle.info(
             "Unused in item_texture.json")] \
             = f"[{len(unused_textures)}] {', '.join(sorted(unused_textures))}" if unused_textures else "0"
         if unused_textures:
-            warnings.append(
-                f"Unused [{len(unused_textures)}] textures in item_texture.json: {', '.join(sorted(unused_textures))}")
+            warnings.append(Finding(
+                SEVERITY_WARNING,
+                f"Unused [{len(unused_textures)}] textures in item_texture.json: {', '.join(sorted(unused_textures))}",
+                MinecraftUtils.ITEM_TEXTURE_FILE))
 
         ConsoleStyle.print_stats(stats, "ITEM TEXTURE DEFINITIONS", icon="🔗")
 
@@ -646,6 +724,58 @@ class MinecraftUtils:
 
         return errors, warnings
 
+    @staticmethod
+    def verify_schemas(file_paths=None):
+        """Walidacja plików bloków, geometrii, tekstur, manifestów i katalogu względem schematów"""
+        import minecraft_schema
+
+        if file_paths is None:
+            file_paths = minecraft_schema.project_files()
+        results = minecraft_schema.validate_files(file_paths)
+        errors = [Finding(SEVERITY_ERROR, error, file_path)
+                  for file_path in sorted(results) for error in results[file_path]]
+
+        stats = {}
+        for file_path in results:
+            schema_name = minecraft_schema.schema_for(file_path)
+            valid, total = stats.get(schema_name, (0, 0))
+            stats[schema_name] = (valid + (not results[file_path]), total + 1)
+        invalid_files = sorted(file_path for file_path, file_errors in results.items() if file_errors)
+
+        ConsoleStyle.print_stats({
+            **{(ConsoleStyle.success(schema_name) if valid == total else ConsoleStyle.error(schema_name)):
+                   f"[{valid}/{total}] valid" for schema_name, (valid, total) in stats.items()},
+            ConsoleStyle.error("Invalid files") if invalid_files else ConsoleStyle.info("Invalid files"):
+                f"[{len(invalid_files)}] {', '.join(invalid_files)}" if invalid_files else "0",
+        }, "SCHEMA VALIDATION", icon="📐")
+
+        return errors, []
+
+    @staticmethod
+    def verify_bounds():
+        """Porównanie visible_bounds i selection box z granicami kostek modeli (collision box pozostaje ręczny)"""
+        import minecraft_bounds
+
+        drifts, counts = minecraft_bounds.check_project()
+        # Obcięty model znika przy cullingu — błąd; luźne granice lub inne boxy bloku — ostrzeżenie
+        errors = [Finding(SEVERITY_ERROR, drift.message(), drift.file_path) for drift in drifts if drift.clipping]
+        warnings = [Finding(SEVERITY_WARNING, drift.message(), drift.file_path)
+                    for drift in drifts if not drift.clipping]
+        if drifts:
+            warnings.append("Run [python3 minecraft_bounds.py --fix] to write bounds computed from geometry")
+
+        drifting_files = sorted({drift.file_path for drift in drifts})
+        ConsoleStyle.print_stats({
+            ConsoleStyle.info("Checked geometries"): f"[{counts['geometries']}]",
+            ConsoleStyle.info("Checked blocks"): f"[{counts['blocks']}]",
+            (ConsoleStyle.error("Clipping bounds") if errors else ConsoleStyle.info("Clipping bounds")):
+                f"[{len(errors)}]",
+            (ConsoleStyle.warning("Drifting files") if drifting_files else ConsoleStyle.info("Drifting files")):
+                f"[{len(drifting_files)}] {', '.join(drifting_files)}" if drifting_files else "0",
+        }, "MODEL BOUNDS", icon="📦")
+
+        return errors, warnings
+
     @staticmethod
     def verify_manifests():
         """Weryfikuj pliki manifestów"""
@@ -661,14 +791,14 @@ class MinecraftUtils:
 
         for file_path, pack_type in manifest_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = MinecraftUtils.load_json_file(file_path)
 
                 # Check required fields
                 required_fields = ['format_version', 'header']
                 for field in required_fields:
                     if field not in data:
-                        errors.append(f"{pack_type} missing required field: {field}")
+                        errors.append(Finding(
+                            SEVERITY_ERROR, f"{pack_type} missing required field: {field}", file_path))
                         continue
 
                 if 'header' in data:
@@ -676,23 +806,25 @@ class MinecraftUtils:
                     header_fields = ['name', 'description', 'uuid', 'version', 'min_engine_version']
                     for field in header_fields:
                         if field not in header:
-                            errors.append(f"{pack_type} header missing required field: {field}")
+                            errors.append(Finding(
+                                SEVERITY_ERROR, f"{pack_type} header missing required field: {field}", file_path))
 
                 # Check a version format
                 if 'header' in data and 'version' in data['header']:
                     version = data['header']['version']
                     if not isinstance(version, list) or len(version) != 3:
-                        errors.append(f"{pack_type} version must be [major, minor, patch]")
+                        errors.append(Finding(
+                            SEVERITY_ERROR, f"{pack_type} version must be [major, minor, patch]", file_path))
                     else:
                         manifest_stats[ConsoleStyle.success(pack_type)] = f"Version {'.'.join(map(str, version))}"
 
                 manifest_stats[ConsoleStyle.success(f"{pack_type} JSON")] = "Valid"
 
             except json.JSONDecodeError as e:
-                errors.append(f"{pack_type} manifest is invalid JSON: {e}")
+                errors.append(Finding(SEVERITY_ERROR, f"{pack_type} manifest is invalid JSON: {e}", file_path))
                 manifest_stats[ConsoleStyle.error(pack_type)] = f"Invalid JSON: {e}"
             except Exception as e:
-                errors.append(f"Error reading {pack_type} manifest: {e}")
+                errors.append(Finding(SEVERITY_ERROR, f"Error reading {pack_type} manifest: {e}", file_path))
                 manifest_stats[ConsoleStyle.error(pack_type)] = f"Error: {e}"
 
         # Print statistics
@@ -713,8 +845,7 @@ class MinecraftUtils:
             return errors, warnings
 
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = MinecraftUtils.load_json_file(config_path)
 
             # Check required fields
             required_fields = ['type', 'name', 'namespace', 'targetVersion']
@@ -725,7 +856,7 @@ class MinecraftUtils:
                     config_stats[ConsoleStyle.success(field)] = data[field]
                 else:
                     config_stats[ConsoleStyle.error(field)] = "Missing"
-                    errors.append(f"config.json missing required field: {field}")
+                    errors.append(Finding(SEVERITY_ERROR, f"config.json missing required field: {field}", config_path))
 
             # Check namespace consistency
             if 'namespace' in data:
@@ -744,7 +875,9 @@ class MinecraftUtils:
                     config_stats[ConsoleStyle.success("Namespace usage")] = "Found in blocks"
                 else:
                     config_stats[ConsoleStyle.warning("Namespace usage")] = "Not found in blocks"
-                    warnings.append(f"Namespace '{MinecraftUtils.namespace}' not found in block identifiers")
+                    warnings.append(Finding(SEVERITY_WARNING,
+                                            f"Namespace '{MinecraftUtils.namespace}' not found in block identifiers",
+                                            config_path))
 
             config_stats[ConsoleStyle.success("JSON format")] = "Valid"
 
@@ -752,27 +885,22 @@ class MinecraftUtils:
             ConsoleStyle.print_stats(config_stats, "CONFIG VERIFICATION", icon="⚙️")
 
         except json.JSONDecodeError as e:
-            errors.append(f"config.json is invalid JSON: {e}")
+            errors.append(Finding(SEVERITY_ERROR, f"config.json is invalid JSON: {e}", config_path))
         except Exception as e:
-            errors.append(f"Error reading [config.json]: {e}")
+            errors.append(Finding(SEVERITY_ERROR, f"Error reading [config.json]: {e}", config_path))
 
         return errors, warnings
 
     @staticmethod
+    @Profiler.profiled("scan count_project_files")
     def count_project_files():
-        """Count files in the project"""
+        """Count files in the project (ignored directories are pruned, .gitignore/.mcignore rules honoured)"""
         stats: Dict[str, Any] = {}
 
         total_files = 0
         # Count files by directory
-        for root, dirs, files in os.walk("."):
-            # Skip git and cache directories
-            if any(skip in root for skip in ['.git', '.idea', '__pycache__', 'venv', 'dist']):
-                continue
-
-            rel_path = os.path.relpath(root, ".")
-            if rel_path == ".":
-                rel_path = ""
+        for root, dirs, files in ProjectScanner.shared().walk("."):
+            rel_path = "" if root == "." else root
 
             stats[ConsoleStyle.info(f"/{rel_path}", icon='📁')] = f"[{len(files)}] files"
             total_files += len(files)
@@ -832,10 +960,14 @@ class MinecraftUtils:
             else:
                 item_stats[ConsoleStyle.error(file_path)] = f"Missing {state_name[state]}"
                 if state == state_required:
-                    errors.append(
-                        f"Missing {state_name[state]} {'directory' if file_path.endswith('/') else 'file'}: {file_path}")
+                    errors.append(Finding(
+                        SEVERITY_ERROR,
+                        f"Missing {state_name[state]} {'directory' if file_path.endswith('/') else 'file'}: {file_path}",
+                        file_path))
                 else:
-                    warnings.append(f"Missing {'directory' if file_path.endswith('/') else 'file'}: {file_path}")
+                    warnings.append(Finding(
+                        SEVERITY_WARNING, f"Missing {'directory' if file_path.endswith('/') else 'file'}: {file_path}",
+                        file_path))
 
         ConsoleStyle.print_stats(item_stats, "REQUIRED FILES & DIRECTORIES", icon="🗂️")
 
@@ -863,7 +995,7 @@ class MinecraftUtils:
                 project_block_translations = set()
                 for block_id, block_data in MinecraftUtils._get_bp_blocks().items():
                     block_name = block_data['minecraft:block']['description']['identifier']
-                    project_block_translations.add(block_name.replace(f'{MinecraftUtils.namespace}:', ''))
+                    project_block_translations.add(block_name.replace(f'{MinecraftUtils.get_namespace()}:', ''))
 
                 # Wczytaj bazę danych
                 database_block_ids = set()
@@ -876,42 +1008,26 @@ class MinecraftUtils:
                         for block_id in database_file_content['categories'][category]['blocks']:
                             database_block_ids.add(block_id)
 
-                # Check if language files exist
-                for lang_name in languages_list:
-                    lang_path = f"RP/texts/{lang_name}.lang"
-                    lang_file_block_translations = set()
-                    lang_file_category_translations = set()
+                # Wczytaj crafting catalog (raz dla wszystkich języków)
+                project_category_translations = set()
+                try:
+                    project_category_translations = LangUtils.load_catalog_categories(MinecraftUtils.get_namespace())
+                except Exception as e:
+                    print_if_not_quiet(ConsoleStyle.error(f"Error reading crafting catalog: {e}"))
+                    warnings.append(Finding(
+                        SEVERITY_WARNING, f"Error reading crafting catalog: {e}", LangUtils.CATALOG_FILE))
+
+                # Wczytaj wszystkie pliki językowe i porównaj je z projektem w jednym przebiegu
+                lang_diffs = LangUtils.diff_languages(LangUtils.load_languages(languages_list),
+                                                      MinecraftUtils.get_namespace(),
+                                                      project_block_translations,
+                                                      project_category_translations)
+
+                for lang_name, lang_diff in lang_diffs.items():
+                    lang_file = os.path.join(LangUtils.TEXTS_DIR, f"{lang_name}.lang").replace(os.sep, '/')
+                    lang_file_block_translations = lang_diff['blocks']
+                    lang_file_category_translations = lang_diff['categories']
                     stats = {}
-                    with open(lang_path, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            line = line.strip()
-                            if line and '=' in line:
-                                key = line.split('=', 1)[0].strip()
-                                if key.startswith(f'tile.{MinecraftUtils.namespace}:') and key.endswith(
-                                        '.name'):
-                                    block_name = key.replace(f'tile.{MinecraftUtils.namespace}:',
-                                                             '').replace('.name', '')
-                                    lang_file_block_translations.add(block_name)
-                                elif key.startswith(f'{MinecraftUtils.namespace}:'):
-                                    # Kategorie mają format `namespace:category_name`
-                                    category_name = key.replace(f'{MinecraftUtils.namespace}:', '')
-                                    lang_file_category_translations.add(category_name)
-
-                    # Wczytaj crafting catalog
-                    project_category_translations = set()
-                    try:
-                        with open('BP/item_catalog/crafting_item_catalog.json', 'r', encoding='utf-8') as f:
-                            catalog_data = json.load(f)
-                            for category in catalog_data['minecraft:crafting_items_catalog']['categories']:
-                                for group in category.get('groups', []):
-                                    if 'group_identifier' in group and 'name' in group['group_identifier']:
-                                        name = group['group_identifier']['name']
-                                        if name.startswith(f'{MinecraftUtils.namespace}:'):
-                                            category_name = name.replace(f'{MinecraftUtils.namespace}:', '')
-                                            project_category_translations.add(category_name)
-                    except Exception as e:
-                        print_if_not_quiet(ConsoleStyle.error(f"Error reading crafting catalog: {e}"))
-                        warnings.append(f"Error reading crafting catalog: {e}")
 
                     stats[ConsoleStyle.info("Items in lang file")] \
                         = f"[{len(lang_file_category_translations) + len(lang_file_block_translations)}]"
@@ -928,41 +1044,49 @@ class MinecraftUtils:
                     stats[ConsoleStyle.info("Blocks in project", 3)] \
                         = f"[{len(project_block_translations)}]" if project_block_translations else "0"
 
-                    lang_file_extra_categories = lang_file_category_translations - project_category_translations
+                    lang_file_extra_categories = lang_diff['extra_categories']
                     stats[ConsoleStyle.warning(
                         "Extra categories in lang file") if lang_file_extra_categories else ConsoleStyle.info(
                         "Extra categories in lang file")] \
                         = f"[{len(lang_file_extra_categories)}] ({', '.join(sorted(lang_file_extra_categories))})" if lang_file_extra_categories else 0
                     if lang_file_extra_categories:
-                        warnings.append(
-                            f"Extra [{len(lang_file_extra_categories)}] categories in [{lang_name}] lang file")
+                        warnings.append(Finding(
+                            SEVERITY_WARNING,
+                            f"Extra [{len(lang_file_extra_categories)}] categories in [{lang_name}] lang file",
+                            lang_file))
 
-                    lang_file_extra_blocks = lang_file_block_translations - project_block_translations
+                    lang_file_extra_blocks = lang_diff['extra_blocks']
                     stats[ConsoleStyle.warning(
                         "Extra blocks in lang file") if lang_file_extra_blocks else ConsoleStyle.info(
                         "Extra blocks in lang file")] \
                         = f"[{len(lang_file_extra_blocks)}] ({', '.join(sorted(lang_file_extra_blocks))})" if lang_file_extra_blocks else 0
                     if lang_file_extra_blocks:
-                        warnings.append(
-                            f"Extra [{len(lang_file_extra_blocks)}] blocks in [{lang_name}] lang file")
+                        warnings.append(Finding(
+                            SEVERITY_WARNING,
+                            f"Extra [{len(lang_file_extra_blocks)}] blocks in [{lang_name}] lang file",
+                            lang_file))
 
-                    lang_file_missing_categories = project_category_translations - lang_file_category_translations
+                    lang_file_missing_categories = lang_diff['missing_categories']
                     stats[ConsoleStyle.error(
                         "Missing categories defined in lang file") if lang_file_missing_categories else ConsoleStyle.info(
                         "Missing categories defined in lang file")] \
                         = f"[{len(lang_file_missing_categories)}] ({', '.join(sorted(lang_file_missing_categories))})" if lang_file_missing_categories else 0
                     if lang_file_missing_categories:
-                        errors.append(
-                            f"Missing [{len(lang_file_missing_categories)}] categories defined in [{lang_name}] lang file")
+                        errors.append(Finding(
+                            SEVERITY_ERROR,
+                            f"Missing [{len(lang_file_missing_categories)}] categories defined in [{lang_name}] lang file",
+                            lang_file))
 
-                    lang_file_missing_blocks = project_block_translations - lang_file_block_translations
+                    lang_file_missing_blocks = lang_diff['missing_blocks']
                     stats[ConsoleStyle.error(
                         "Missing blocks defined in lang file") if lang_file_missing_blocks else ConsoleStyle.info(
                         "Missing blocks defined in lang file")] \
                         = f"[{len(lang_file_missing_blocks)}] ({', '.join(sorted(lang_file_missing_blocks))})" if lang_file_missing_blocks else 0
                     if lang_file_missing_blocks:
-                        errors.append(
-                            f"Missing [{len(lang_file_missing_blocks)}] blocks defined in [{lang_name}] lang file")
+                        errors.append(Finding(
+                            SEVERITY_ERROR,
+                            f"Missing [{len(lang_file_missing_blocks)}] blocks defined in [{lang_name}] lang file",
+                            lang_file))
 
                     if os.path.exists(MinecraftUtils.DATABASE_FILE_NAME):
                         stats[ConsoleStyle.info("In database")] = len(database_categories) + len(
@@ -975,16 +1099,20 @@ class MinecraftUtils:
                             "Missing categories from database")] \
                             = f"[{len(database_missing_categories)}] ({', '.join(sorted(database_missing_categories))})" if database_missing_categories else 0
                         if database_missing_categories:
-                            errors.append(
-                                f"Missing [{len(database_missing_categories)}] from database in [{lang_name}]")
+                            errors.append(Finding(
+                                SEVERITY_ERROR,
+                                f"Missing [{len(database_missing_categories)}] from database in [{lang_name}]",
+                                lang_file))
                         database_missing_blocks = database_block_ids - project_block_translations
                         stats[ConsoleStyle.error(
                             "Missing blocks from database") if database_missing_blocks else ConsoleStyle.info(
                             "Missing blocks from database")] \
                             = f"[{len(database_missing_blocks)}] ({', '.join(sorted(database_missing_blocks))})" if database_missing_blocks else 0
                         if database_missing_blocks:
-                            errors.append(
-                                f"Missing [{len(database_missing_blocks)}] from database in [{lang_name}]")
+                            errors.append(Finding(
+                                SEVERITY_ERROR,
+                                f"Missing [{len(database_missing_blocks)}] from database in [{lang_name}]",
+                                lang_file))
 
                     ConsoleStyle.print_stats(stats, f"{lang_name}", '-')
         except FileNotFoundError as e:
@@ -993,25 +1121,16 @@ class MinecraftUtils:
         return errors, warnings
 
     @staticmethod
-    def verification_summary(verifications: List[Callable[[], Tuple[List[str], List[str]]]]):
+    def verification_summary(verifications: List[Callable[[], Tuple[List[str], List[str]]]],
+                             report_format: str = None, report_file: str = None, exit_on_finish: bool = True):
+        report = VerificationReport([run_check(verify_func) for verify_func in verifications])
         verification_results = {
-            'success': [],
-            'warning': {},
-            'error': {},
+            'success': [result.name for result in report.results if result.status == 'passed'],
+            'warning': {result.name: [finding.message for finding in result.warnings]
+                        for result in report.results if result.warnings},
+            'error': {result.name: [finding.message for finding in result.errors]
+                      for result in report.results if result.errors},
         }
-        for verify_func in verifications:
-            try:
-                errors, warnings = verify_func()
-                if errors or warnings:
-                    if errors:
-                        verification_results['error'][verify_func.__name__] = errors
-                    if warnings:
-                        verification_results['warning'][verify_func.__name__] = warnings
-                else:
-                    verification_results['success'].append(verify_func.__name__)
-
-            except Exception as e:
-                verification_results['error'][{verify_func.__name__}].append(e)
 
         # Print summary statistics
         success_details = ''.join([f'\n   • {name}' for name in verification_results['success']])
@@ -1028,6 +1147,14 @@ class MinecraftUtils:
             ConsoleStyle.error("Checks with errors"): f"[{len(verification_results['error'])}]{error_details}",
         }, f"VERIFICATION SUMMARY ([{len(verifications)}])", icon='📊')
 
+        # Write machine-readable report
+        if report_format:
+            if report_file:
+                report.write(report_format, report_file)
+                print_if_not_quiet(ConsoleStyle.info(f"Report saved to [{report_file}]"))
+            else:
+                print(report.serialize(report_format))
+
         # Exit with the appropriate code
         print_if_not_quiet(ConsoleStyle.divider('-'))
         if verification_results['error']:
@@ -1038,4 +1165,6 @@ class MinecraftUtils:
             print_if_not_quiet(ConsoleStyle.success("Verification passed! Project is ready for building.", icon="🎉"))
             status = 0
         print_if_not_quiet(ConsoleStyle.divider('-'))
-        sys.exit(status)
+        if exit_on_finish:
+            sys.exit(status)
+        return status
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Graf zależności zasobów paczki Minecraft (bloki, geometrie, tekstury, tłumaczenia, katalog)
+"""
+import argparse
+import os
+import sys
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Set, Tuple
+
+from console_utils import ConsoleStyle, Profiler
+from json_utils import JsonBackend
+from minecraft_lang import LangUtils
+from scan_utils import scan_files
+
+# Rodzaje węzłów; węzeł to napis `rodzaj:nazwa`, np. `texture:base_road`, `block:jct:base_road_1`
+BLOCK = 'block'
+ITEM = 'item'
+GEOMETRY = 'geometry'
+TEXTURE = 'texture'
+SOUND = 'sound'
+LANG = 'lang'
+GROUP = 'group'
+FILE = 'file'
+KINDS = [GROUP, BLOCK, ITEM, GEOMETRY, TEXTURE, SOUND, LANG, FILE]
+
+DATABASE_FILE = 'database.json'
+BUILTIN_TEXTURES_FILE = 'minecraft_textures.json'
+TERRAIN_TEXTURE_FILE = 'RP/textures/terrain_texture.json'
+ITEM_TEXTURE_FILE = 'RP/textures/item_texture.json'
+SOUND_DEFINITIONS_FILE = 'RP/sounds/sound_definitions.json'
+SOUNDS_FILE = 'RP/sounds.json'
+RP_BLOCKS_FILE = 'RP/blocks.json'
+TEXTURE_EXTENSIONS = ['', '.png', '.tga']
+SOUND_EXTENSIONS = ['.ogg', '.wav', '.fsb']
+# Pliki, które mogą zostać usunięte z paczki przy przycinaniu
+PRUNABLE_DIRS = ('RP/models/', 'RP/textures/', 'RP/sounds/')
+PRUNABLE_EXTENSIONS = ('.geo.json', '.png', '.tga', '.ogg', '.wav', '.fsb')
+
+
+def node(kind: str, name: str) -> str:
+    return f"{kind}:{name}"
+
+
+def split_node(graph_node: str) -> Tuple[str, str]:
+    kind, _, name = graph_node.partition(':')
+    return kind, name
+
+
+def _resolve_file(base_path: str, extensions: Iterable[str]) -> str:
+    """Return the existing file for a path given without extension (or the bare path when none exists)"""
+    for extension in extensions:
+        if os.path.isfile(base_path + extension):
+            return base_path + extension
+    return base_path
+
+
+@dataclass
+class PrunePlan:
+    """Zasoby nieosiągalne z katalogu i bazy danych, pomijane w paczce wydania"""
+    files: Set[str] = field(default_factory=set)
+    lang_keys: Set[str] = field(default_factory=set)
+    definitions: Set[str] = field(default_factory=set)
+    # Przepisane pliki (.lang, definicje tekstur i dźwięków) bez usuniętych wpisów
+    rewritten: Dict[str, bytes] = field(default_factory=dict)
+    removed_bytes: int = 0
+
+
+def _without_keys(data: Dict[str, Any], section: str, keys: Set[str]) -> Dict[str, Any]:
+    return {**data, section: {key: value for key, value in data.get(section, {}).items() if key not in keys}}
+
+
+class AssetGraph:
+    """Graf zależności zasobów z indeksem w przód (co węzeł potrzebuje) i wstecz (kto go używa)"""
+
+    def __init__(self):
+        self.forward: Dict[str, Set[str]] = defaultdict(set)
+        self.reverse: Dict[str, Set[str]] = defaultdict(set)
+        # Węzły, które istnieją w projekcie (pozostałe są tylko referencjami)
+        self.defined: Set[str] = set()
+        # Punkty wejścia: grupy katalogu i bloki z bazy danych
+        self.roots: Set[str] = set()
+        self.namespace = ''
+
+    def add_edge(self, source: str, target: str):
+        self.forward[source].add(target)
+        self.reverse[target].add(source)
+
+    def define(self, graph_node: str):
+        self.defined.add(graph_node)
+
+    def nodes(self, kind: str = None) -> Set[str]:
+        """All defined and referenced nodes (optionally of one kind)"""
+        all_nodes = self.defined | set(self.forward) | set(self.reverse)
+        if kind is None:
+            return all_nodes
+        return {graph_node for graph_node in all_nodes if split_node(graph_node)[0] == kind}
+
+    @staticmethod
+    def _traverse(starts: Iterable[str], index: Dict[str, Set[str]]) -> Set[str]:
+        """Breadth-first traversal, each edge is visited once"""
+        seen = set(starts)
+        queue = deque(seen)
+        while queue:
+            for neighbour in index.get(queue.popleft(), ()):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+        return seen
+
+    def dependencies(self, graph_node: str, recursive: bool = False) -> Set[str]:
+        """What the node needs"""
+        if not recursive:
+            return set(self.forward.get(graph_node, ()))
+        return self._traverse([graph_node], self.forward) - {graph_node}
+
+    def dependents(self, graph_node: str, recursive: bool = False) -> Set[str]:
+        """What uses the node (impact of changing it)"""
+        if not recursive:
+            return set(self.reverse.get(graph_node, ()))
+        return self._traverse([graph_node], self.reverse) - {graph_node}
+
+    def reachable(self, roots: Iterable[str] = None) -> Set[str]:
+        """Nodes reachable from the roots (catalog and database by default)"""
+        return self._traverse(self.roots if roots is None else roots, self.forward)
+
+    def orphans(self, kind: str = None) -> Set[str]:
+        """Defined nodes which nothing uses"""
+        return {graph_node for graph_node in self.defined
+                if not self.reverse.get(graph_node) and graph_node not in self.roots
+                and (kind is None or split_node(graph_node)[0] == kind)}
+
+    def missing(self, kind: str = None) -> Set[str]:
+        """Referenced nodes which are not defined in the project"""
+        return {graph_node for graph_node in self.reverse
+                if graph_node not in self.defined and (kind is None or split_node(graph_node)[0] == kind)}
+
+    def files(self, graph_nodes: Iterable[str]) -> Set[str]:
+        """File paths of the file nodes"""
+        return {split_node(graph_node)[1] for graph_node in graph_nodes if split_node(graph_node)[0] == FILE}
+
+    def stats(self) -> Dict[str, int]:
+        counts = {kind: 0 for kind in KINDS}
+        for graph_node in self.nodes():
+            kind = split_node(graph_node)[0]
+            counts[kind] = counts.get(kind, 0) + 1
+        counts['edges'] = sum(len(targets) for targets in self.forward.values())
+        return counts
+
+    def unlisted(self) -> Set[str]:
+        """Blocks and items shipped in the pack but absent from the catalog and database"""
+        shipped = {graph_node for graph_node in self.defined if split_node(graph_node)[0] in (BLOCK, ITEM)}
+        return shipped - self.reachable()
+
+    def prune_plan(self) -> PrunePlan:
+        """Compute assets unreachable from the catalog, database and shipped blocks/items"""
+        # Pliki bloków i itemów zawsze trafiają do paczki, więc ich zależności też muszą zostać
+        shipped = {graph_node for graph_node in self.defined if split_node(graph_node)[0] in (BLOCK, ITEM)}
+        keep = self.reachable(self.roots | shipped)
+        plan = PrunePlan()
+
+        for graph_node in self.defined - keep:
+            kind, name = split_node(graph_node)
+            if kind == FILE and name.startswith(PRUNABLE_DIRS) and name.endswith(PRUNABLE_EXTENSIONS):
+                plan.files.add(name)
+                plan.removed_bytes += os.path.getsize(name)
+            elif kind == LANG and name.startswith((f"tile.{self.namespace}:", f"item.{self.namespace}:",
+                                                   f"{self.namespace}:")):
+                plan.lang_keys.add(name)
+            elif kind in (TEXTURE, SOUND):
+                plan.definitions.add(graph_node)
+
+        # Pliki nieznane w grafie (np. PNG bez definicji) też nie są osiągalne
+        for file_path in scan_files('RP', ''):
+            if file_path.startswith(PRUNABLE_DIRS) and file_path.endswith(PRUNABLE_EXTENSIONS) \
+                    and node(FILE, file_path) not in keep and file_path not in plan.files:
+                plan.files.add(file_path)
+                plan.removed_bytes += os.path.getsize(file_path)
+
+        if plan.lang_keys:
+            for file_path in scan_files(LangUtils.TEXTS_DIR, '.lang'):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                plan.rewritten[file_path] = LangUtils.remove_keys(content, plan.lang_keys).encode('utf-8')
+
+        textures = {split_node(graph_node)[1] for graph_node in plan.definitions if graph_node.startswith(TEXTURE)}
+        sounds = {split_node(graph_node)[1] for graph_node in plan.definitions if graph_node.startswith(SOUND)}
+        for file_path, section, keys in [(TERRAIN_TEXTURE_FILE, 'texture_data', textures),
+                                         (ITEM_TEXTURE_FILE, 'texture_data', textures),
+                                         (SOUND_DEFINITIONS_FILE, 'sound_definitions', sounds)]:
+            if keys and os.path.isfile(file_path):
+                data = _without_keys(JsonBackend.load_file(file_path), section, keys)
+                plan.rewritten[file_path] = JsonBackend.dumps(data).encode('utf-8')
+
+        for file_path, content in plan.rewritten.items():
+            plan.removed_bytes += max(os.path.getsize(file_path) - len(content), 0)
+        return plan
+
+    # ===== BUDOWANIE GRAFU =====
+
+    def _add_file(self, owner: str, file_path: str):
+        file_node = node(FILE, file_path)
+        self.add_edge(owner, file_node)
+        if os.path.isfile(file_path):
+            self.define(file_node)
+
+    def _add_texture(self, owner: str, texture_name: str, builtin_textures: Set[str]):
+        if texture_name and not texture_name.startswith('minecraft:') and texture_name not in builtin_textures:
+            self.add_edge(owner, node(TEXTURE, texture_name))
+
+    def _load_geometries(self):
+        for file_path in scan_files('RP/models', '.geo.json'):
+            data = JsonBackend.load_file(file_path)
+            for geometry in data.get('minecraft:geometry', []):
+                identifier = geometry.get('description', {}).get('identifier')
+                if identifier:
+                    geometry_node = node(GEOMETRY, identifier)
+                    self.define(geometry_node)
+                    self._add_file(geometry_node, file_path)
+
+    def _load_texture_definitions(self):
+        for texture_file in [TERRAIN_TEXTURE_FILE, ITEM_TEXTURE_FILE]:
+            if not os.path.isfile(texture_file):
+                continue
+            for texture_id, texture_info in JsonBackend.load_file(texture_file).get('texture_data', {}).items():
+                texture_node = node(TEXTURE, texture_id)
+                self.define(texture_node)
+                paths = texture_info.get('textures', []) if isinstance(texture_info, dict) else []
+                # `textures` może być napisem, listą napisów lub listą obiektów z `path` (warianty)
+                for texture_path in paths if isinstance(paths, list) else [paths]:
+                    if isinstance(texture_path, dict):
+                        texture_path = texture_path.get('path', '')
+                    if texture_path:
+                        self._add_file(texture_node, _resolve_file(f"RP/{texture_path}", TEXTURE_EXTENSIONS))
+
+    def _load_sound_definitions(self):
+        if not os.path.isfile(SOUND_DEFINITIONS_FILE):
+            return
+        data = JsonBackend.load_file(SOUND_DEFINITIONS_FILE)
+        for sound_name, sound_info in data.get('sound_definitions', {}).items():
+            sound_node = node(SOUND, sound_name)
+            self.define(sound_node)
+            for sound in sound_info.get('sounds', []):
+                sound_path = sound.get('name') if isinstance(sound, dict) else sound
+                if sound_path:
+                    self._add_file(sound_node, _resolve_file(f"RP/{sound_path}", SOUND_EXTENSIONS))
+
+    def _load_sound_references(self):
+        """Sounds used by events in sounds.json or by name in scripts are always kept"""
+        sound_nodes = self.nodes(SOUND) & self.defined
+        if not sound_nodes:
+            return
+
+        def collect(value):
+            if isinstance(value, dict):
+                for key, item in value.items():
+                    if key == 'sound' and isinstance(item, str):
+                        self.roots.add(node(SOUND, item))
+                    else:
+                        collect(item)
+
+        if os.path.isfile(SOUNDS_FILE):
+            collect(JsonBackend.load_file(SOUNDS_FILE))
+        for file_path in scan_files('BP', '.js') + scan_files('BP', '.ts'):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            for sound_node in sound_nodes:
+                if split_node(sound_node)[1] in content:
+                    self.roots.add(sound_node)
+
+    def _load_blocks(self, builtin_textures: Set[str]):
+        rp_blocks = JsonBackend.load_file(RP_BLOCKS_FILE) if os.path.isfile(RP_BLOCKS_FILE) else {}
+        for file_path in scan_files('BP/blocks', '.block.json'):
+            data = JsonBackend.load_file(file_path).get('minecraft:block', {})
+            identifier = data.get('description', {}).get('identifier')
+            if not identifier:
+                continue
+            block_node = node(BLOCK, identifier)
+            self.define(block_node)
+            self._add_file(block_node, file_path)
+            self.add_edge(block_node, node(LANG, f"tile.{identifier}.name"))
+
+            component_sets = [data.get('components', {})]
+            component_sets += [permutation.get('components', {}) for permutation in data.get('permutations', [])]
+            for components in component_sets:
+                geometry = components.get('minecraft:geometry')
+                if isinstance(geometry, dict):
+                    geometry = geometry.get('identifier')
+                if geometry and not geometry.startswith('minecraft:'):
+                    self.add_edge(block_node, node(GEOMETRY, geometry))
+                for material in components.get('minecraft:material_instances', {}).values():
+                    if isinstance(material, dict):
+                        self._add_texture(block_node, material.get('texture'), builtin_textures)
+
+            # RP/blocks.json może używać identyfikatora z namespace lub bez
+            block_info = rp_blocks.get(identifier) or rp_blocks.get(identifier.partition(':')[2]) or {}
+            # Dźwięki vanilla (np. `stone`) nie są zasobami paczki
+            sound_node = node(SOUND, block_info.get('sound'))
+            if sound_node in self.defined:
+                self.add_edge(block_node, sound_node)
+            textures = block_info.get('textures')
+            for texture_name in textures.values() if isinstance(textures, dict) else [textures]:
+                if isinstance(texture_name, str):
+                    self._add_texture(block_node, texture_name, builtin_textures)
+
+    def _load_items(self, builtin_textures: Set[str]):
+        for file_path in scan_files('BP/items', '.item.json'):
+            data = JsonBackend.load_file(file_path).get('minecraft:item', {})
+            identifier = data.get('description', {}).get('identifier')
+            if not identifier:
+                continue
+            item_node = node(ITEM, identifier)
+            self.define(item_node)
+            self._add_file(item_node, file_path)
+            self.add_edge(item_node, node(LANG, f"item.{identifier}.name"))
+            icon = data.get('components', {}).get('minecraft:icon', {})
+            self._add_texture(item_node, icon.get('texture') if isinstance(icon, dict) else icon, builtin_textures)
+
+    def _catalog_entry(self, identifier: str) -> str:
+        item_node = node(ITEM, identifier)
+        return item_node if item_node in self.defined else node(BLOCK, identifier)
+
+    def _load_catalog(self):
+        if not os.path.isfile(LangUtils.CATALOG_FILE):
+            return
+        catalog = JsonBackend.load_file(LangUtils.CATALOG_FILE).get('minecraft:crafting_items_catalog', {})
+        for category in catalog.get('categories', []):
+            for group in category.get('groups', []):
+                group_identifier = group.get('group_identifier', {})
+                group_name = group_identifier.get('name') or category.get('category_name', '')
+                group_node = node(GROUP, group_name)
+                self.define(group_node)
+                self.roots.add(group_node)
+                if group_identifier.get('name'):
+                    self.add_edge(group_node, node(LANG, group_name))
+                if group_identifier.get('icon'):
+                    self.add_edge(group_node, self._catalog_entry(group_identifier['icon']))
+                for entry in group.get('items', []):
+                    identifier = entry.get('name') if isinstance(entry, dict) else entry
+                    if identifier:
+                        self.add_edge(group_node, self._catalog_entry(identifier))
+
+    def _load_database(self, namespace: str):
+        if not os.path.isfile(DATABASE_FILE):
+            return
+        data = JsonBackend.load_file(DATABASE_FILE)
+        for category in data.get('categories', {}).values():
+            for block_id in category.get('blocks', {}):
+                self.roots.add(node(BLOCK, block_id if ':' in block_id else f"{namespace}:{block_id}"))
+
+    def _load_translations(self):
+        if not os.path.isfile(LangUtils.LANGUAGES_FILE):
+            return
+        for lang_name, index in LangUtils.load_languages(JsonBackend.load_file(LangUtils.LANGUAGES_FILE)).items():
+            for key in index:
+                self.define(node(LANG, key))
+
+    @staticmethod
+    def build() -> 'AssetGraph':
+        """Build the graph of the project in the current directory"""
+        graph = AssetGraph()
+        with Profiler.stage("graph.build"):
+            namespace = JsonBackend.load_file('config.json').get('namespace', '') if os.path.isfile(
+                'config.json') else ''
+            graph.namespace = namespace
+            builtin_textures = set()
+            if os.path.isfile(BUILTIN_TEXTURES_FILE):
+                builtin_textures = set(JsonBackend.load_file(BUILTIN_TEXTURES_FILE).get('builtin_textures', []))
+            graph._load_geometries()
+            graph._load_texture_definitions()
+            graph._load_sound_definitions()
+            graph._load_sound_references()
+            graph._load_blocks(builtin_textures)
+            graph._load_items(builtin_textures)
+            graph._load_catalog()
+            graph._load_database(namespace)
+            graph._load_translations()
+        return graph
+
+
+def main(argv=None, build_graph=None):
+    """Graph query CLI (build_graph lets the project daemon reuse a graph built earlier)"""
+    parser = argparse.ArgumentParser(description="Query the asset dependency graph of the add-on",
+                                     epilog="nodes are written as kind:name, e.g. texture:base_road, "
+                                            f"block:jct:base_road_1 (kinds: {', '.join(KINDS)})")
+    parser.add_argument("query", choices=['needs', 'uses', 'orphans', 'missing', 'stats'],
+                        help="needs: what NODE depends on, uses: what depends on NODE, "
+                             "orphans/missing: unused/undefined nodes, stats: node counts")
+    parser.add_argument("node", nargs='?', help="graph node for needs/uses")
+    parser.add_argument("--recursive", '-R', action="store_true", help="follow edges transitively")
+    parser.add_argument("--kind", '-k', choices=KINDS, help="limit orphans/missing to one node kind")
+    args = parser.parse_args(argv)
+
+    if args.query in ('needs', 'uses') and not args.node:
+        parser.error(f"{args.query} requires NODE")
+
+    graph = (build_graph or AssetGraph.build)()
+
+    if args.query == 'stats':
+        ConsoleStyle.print_stats({ConsoleStyle.info(kind): f"[{count}]" for kind, count in graph.stats().items()},
+                                 "ASSET GRAPH", icon="🕸️")
+        return
+
+    if args.query in ('needs', 'uses'):
+        if args.node not in graph.nodes():
+            print(ConsoleStyle.error(f"Unknown node [{args.node}]"))
+            sys.exit(1)
+        if args.query == 'needs':
+            result = graph.dependencies(args.node, args.recursive)
+        else:
+            result = graph.dependents(args.node, args.recursive)
+    elif args.query == 'orphans':
+        result = graph.orphans(args.kind)
+    else:
+        result = graph.missing(args.kind)
+
+    for graph_node in sorted(result):
+        print(graph_node if graph_node in graph.defined else f"{graph_node} (missing)")
+
+
+if __name__ == "__main__":
+    main()
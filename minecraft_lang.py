@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Biblioteka z funkcjami parsowania plików tłumaczeń (.lang) Minecraft
+"""
+import os
+from typing import Dict, Iterable, Set, Tuple
+
+from json_utils import JsonBackend
+
+# Indeks pliku .lang: klucz -> (wartość, numer linii)
+LangIndex = Dict[str, Tuple[str, int]]
+
+
+class LangUtils:
+    """Klasa z funkcjami parsowania i porównywania plików .lang"""
+
+    TEXTS_DIR = 'RP/texts'
+    LANGUAGES_FILE = 'RP/texts/languages.json'
+    CATALOG_FILE = 'BP/item_catalog/crafting_item_catalog.json'
+
+    @staticmethod
+    def parse_lang(content: str) -> LangIndex:
+        """Parse .lang content into a key -> (value, line) index in a single pass"""
+        index = {}
+        if content.startswith('\ufeff'):
+            content = content[1:]
+        for line_no, line in enumerate(content.splitlines(), 1):
+            key, sep, value = line.partition('=')
+            if not sep:
+                continue
+            key = key.strip()
+            if not key or key.startswith('#'):
+                continue
+            # Komentarz w linii ma format `wartość\t## komentarz`
+            comment_pos = value.find('\t##')
+            if comment_pos != -1:
+                value = value[:comment_pos]
+            index[key] = (value.strip(), line_no)
+        return index
+
+    @staticmethod
+    def remove_keys(content: str, keys: Set[str]) -> str:
+        """Return .lang content without lines defining the given keys (comments and order are kept)"""
+        lines = content.splitlines(keepends=True)
+        return ''.join(line for line in lines
+                       if line.lstrip('\ufeff').partition('=')[0].strip() not in keys or '=' not in line)
+
+    @staticmethod
+    def load_lang_file(lang_path: str) -> LangIndex:
+        """Read a .lang file and return its key index"""
+        with open(lang_path, 'r', encoding='utf-8') as f:
+            return LangUtils.parse_lang(f.read())
+
+    @staticmethod
+    def load_languages(languages: Iterable[str], texts_dir: str = TEXTS_DIR) -> Dict[str, LangIndex]:
+        """Read every listed language once and return indexes keyed by language name"""
+        return {lang_name: LangUtils.load_lang_file(os.path.join(texts_dir, f"{lang_name}.lang"))
+                for lang_name in languages}
+
+    @staticmethod
+    def split_keys(index: LangIndex, namespace: str) -> Tuple[Set[str], Set[str]]:
+        """Split index keys into block names (`tile.ns:x.name`) and category names (`ns:x`)"""
+        block_prefix = f'tile.{namespace}:'
+        category_prefix = f'{namespace}:'
+        blocks = {key[len(block_prefix):-len('.name')] for key in index
+                  if key.startswith(block_prefix) and key.endswith('.name')}
+        categories = {key[len(category_prefix):] for key in index if key.startswith(category_prefix)}
+        return blocks, categories
+
+    @staticmethod
+    def load_catalog_categories(namespace: str, catalog_path: str = CATALOG_FILE) -> Set[str]:
+        """Read group names from the crafting catalog (without namespace)"""
+        catalog_data = JsonBackend.load_file(catalog_path)
+        prefix = f'{namespace}:'
+        categories = set()
+        for category in catalog_data['minecraft:crafting_items_catalog']['categories']:
+            for group in category.get('groups', []):
+                name = group.get('group_identifier', {}).get('name', '')
+                if name.startswith(prefix):
+                    categories.add(name[len(prefix):])
+        return categories
+
+    @staticmethod
+    def diff_languages(lang_indexes: Dict[str, LangIndex], namespace: str, project_blocks: Set[str],
+                       project_categories: Set[str]) -> Dict[str, Dict[str, Set[str]]]:
+        """Compare every language against project keys, returning lang and missing/extra sets per language"""
+        result = {}
+        for lang_name, index in lang_indexes.items():
+            blocks, categories = LangUtils.split_keys(index, namespace)
+            result[lang_name] = {
+                'blocks': blocks,
+                'categories': categories,
+                'extra_blocks': blocks - project_blocks,
+                'extra_categories': categories - project_categories,
+                'missing_blocks': project_blocks - blocks,
+                'missing_categories': project_categories - categories,
+            }
+        return result
@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+Biblioteka ze schematami plików paczki Minecraft kompilowanymi do funkcji walidujących
+"""
+import fnmatch
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from json_utils import JsonBackend
+from scan_utils import scan_files
+
+# Walidator: (wartość, ścieżka w dokumencie, lista błędów) -> None
+Validator = Callable[[Any, str, List[str]], None]
+
+# Poniżej tej liczby plików walidacja działa w bieżącym procesie (start procesów kosztuje więcej)
+PARALLEL_THRESHOLD = 500
+
+_TYPES = {
+    'object': lambda value: isinstance(value, dict),
+    'array': lambda value: isinstance(value, list),
+    'string': lambda value: isinstance(value, str),
+    'boolean': lambda value: isinstance(value, bool),
+    'integer': lambda value: isinstance(value, int) and not isinstance(value, bool),
+    'number': lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+}
+
+
+def _describe(value: Any) -> str:
+    text = JsonBackend.dumps(value, compact=True) if not isinstance(value, str) else f'"{value}"'
+    return text if len(text) <= 40 else text[:37] + '...'
+
+
+def compile_schema(schema: Dict[str, Any]) -> Validator:
+    """Compile a JSON-schema subset into one validator closure
+
+    Supported keywords: type, enum, pattern, minimum, maximum, multipleOf, minItems, maxItems, items,
+    properties, required, additionalProperties, anyOf and check (function returning an error or None).
+    Keywords are resolved once here, so validation does not interpret the schema per document.
+    """
+    checks: List[Validator] = []
+
+    if 'type' in schema:
+        type_names = schema['type'] if isinstance(schema['type'], list) else [schema['type']]
+        type_checks = [_TYPES[type_name] for type_name in type_names]
+        expected = ' or '.join(type_names)
+
+        def check_type(value, path, errors):
+            if not any(type_check(value) for type_check in type_checks):
+                errors.append(f"{path}: expected {expected}, got {_describe(value)}")
+                raise _Stop
+
+        checks.append(check_type)
+
+    if 'enum' in schema:
+        allowed = schema['enum']
+
+        def check_enum(value, path, errors):
+            if value not in allowed:
+                errors.append(f"{path}: {_describe(value)} is not one of {', '.join(map(str, allowed))}")
+
+        checks.append(check_enum)
+
+    if 'pattern' in schema:
+        regex = re.compile(schema['pattern'])
+
+        def check_pattern(value, path, errors):
+            if isinstance(value, str) and not regex.search(value):
+                errors.append(f"{path}: {_describe(value)} does not match {regex.pattern}")
+
+        checks.append(check_pattern)
+
+    if 'minimum' in schema or 'maximum' in schema:
+        minimum = schema.get('minimum', float('-inf'))
+        maximum = schema.get('maximum', float('inf'))
+
+        def check_range(value, path, errors):
+            if isinstance(value, (int, float)) and not minimum <= value <= maximum:
+                errors.append(f"{path}: {value} is out of range [{minimum}, {maximum}]")
+
+        checks.append(check_range)
+
+    if 'multipleOf' in schema:
+        step = schema['multipleOf']
+
+        def check_multiple(value, path, errors):
+            if isinstance(value, (int, float)) and value % step:
+                errors.append(f"{path}: {value} is not a multiple of {step}")
+
+        checks.append(check_multiple)
+
+    if 'minItems' in schema or 'maxItems' in schema:
+        min_items = schema.get('minItems', 0)
+        max_items = schema.get('maxItems', float('inf'))
+
+        def check_length(value, path, errors):
+            if isinstance(value, list) and not min_items <= len(value) <= max_items:
+                count = min_items if min_items == max_items else f"{min_items}..{max_items}"
+                errors.append(f"{path}: expected {count} items, got {len(value)}")
+
+        checks.append(check_length)
+
+    if 'items' in schema:
+        item_validator = compile_schema(schema['items'])
+
+        def check_items(value, path, errors):
+            if isinstance(value, list):
+                for index, item in enumerate(value):
+                    item_validator(item, f"{path}[{index}]", errors)
+
+        checks.append(check_items)
+
+    if 'required' in schema:
+        required = schema['required']
+
+        def check_required(value, path, errors):
+            if isinstance(value, dict):
+                for key in required:
+                    if key not in value:
+                        errors.append(f"{path}: missing [{key}]")
+
+        checks.append(check_required)
+
+    if 'properties' in schema or 'additionalProperties' in schema:
+        property_validators = {key: compile_schema(sub_schema)
+                               for key, sub_schema in schema.get('properties', {}).items()}
+        additional = schema.get('additionalProperties', True)
+        additional_validator = compile_schema(additional) if isinstance(additional, dict) else None
+
+        def check_properties(value, path, errors):
+            if not isinstance(value, dict):
+                return
+            for key, item in value.items():
+                validator = property_validators.get(key, additional_validator)
+                if validator:
+                    validator(item, f"{path}.{key}", errors)
+                elif additional is False and key not in property_validators:
+                    errors.append(f"{path}: unexpected [{key}]")
+
+        checks.append(check_properties)
+
+    if 'anyOf' in schema:
+        # Błędy są raportowane z pierwszej alternatywy o pasującym typie (np. obiekt zamiast boolean)
+        alternatives = []
+        for sub_schema in schema['anyOf']:
+            type_names = sub_schema.get('type', [])
+            type_checks = [_TYPES[type_name] for type_name in
+                           (type_names if isinstance(type_names, list) else [type_names])]
+            alternatives.append((type_checks, compile_schema(sub_schema)))
+        expected_types = ' or '.join(dict.fromkeys(
+            type_name for sub_schema in schema['anyOf']
+            for type_name in (sub_schema['type'] if isinstance(sub_schema.get('type'), list)
+                              else [sub_schema.get('type', 'value')])))
+
+        def check_any_of(value, path, errors):
+            first_errors = None
+            for type_checks, alternative in alternatives:
+                if type_checks and not any(type_check(value) for type_check in type_checks):
+                    continue
+                alternative_errors = []
+                alternative(value, path, alternative_errors)
+                if not alternative_errors:
+                    return
+                if first_errors is None:
+                    first_errors = alternative_errors
+            errors.extend(first_errors or [f"{path}: expected {expected_types}, got {_describe(value)}"])
+
+        checks.append(check_any_of)
+
+    if 'check' in schema:
+        custom_check = schema['check']
+
+        def check_custom(value, path, errors):
+            error = custom_check(value)
+            if error:
+                errors.append(f"{path}: {error}")
+
+        checks.append(check_custom)
+
+    if len(checks) == 1:
+        single_check = checks[0]
+
+        def validate_single(value, path, errors):
+            try:
+                single_check(value, path, errors)
+            except _Stop:
+                pass
+
+        return validate_single
+
+    def validate(value, path, errors):
+        try:
+            for check in checks:
+                check(value, path, errors)
+        except _Stop:
+            # Zły typ — dalsze sprawdzenia tej wartości nie mają sensu
+            pass
+
+    return validate
+
+
+class _Stop(Exception):
+    pass
+
+
+# ===== SCHEMATY =====
+
+NUMBER = {'type': 'number'}
+VECTOR3 = {'type': 'array', 'items': NUMBER, 'minItems': 3, 'maxItems': 3}
+VECTOR2 = {'type': 'array', 'items': NUMBER, 'minItems': 2, 'maxItems': 2}
+VERSION3 = {'type': 'array', 'items': {'type': 'integer', 'minimum': 0}, 'minItems': 3, 'maxItems': 3}
+FORMAT_VERSION = {'type': 'string', 'pattern': r'^\d+\.\d+\.\d+$'}
+UUID = {'type': 'string', 'pattern': r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'}
+IDENTIFIER = {'type': 'string', 'pattern': r'^[a-z0-9_.-]+:[a-z0-9_./-]+$'}
+
+
+def _box_check(max_height: float) -> Callable[[Dict[str, Any]], str]:
+    """Box must stay inside the block: x/z in [-8, 8], y in [0, max_height]"""
+    limits = [(-8, 8), (0, max_height), (-8, 8)]
+
+    def check(box):
+        if not isinstance(box, dict) or 'origin' not in box or 'size' not in box:
+            return None
+        try:
+            for axis, (low, high) in zip('xyz', limits):
+                index = 'xyz'.index(axis)
+                start = box['origin'][index]
+                end = start + box['size'][index]
+                if start < low or end > high:
+                    return f"{axis} range [{start}, {end}] exceeds [{low}, {high}]"
+        except (TypeError, IndexError):
+            return None
+        return None
+
+    return check
+
+
+def _box(max_height: float) -> Dict[str, Any]:
+    return {'anyOf': [
+        {'type': 'boolean'},
+        {'type': 'object', 'required': ['origin', 'size'], 'check': _box_check(max_height),
+         'properties': {'origin': VECTOR3,
+                        'size': {**VECTOR3, 'items': {'type': 'number', 'minimum': 0, 'maximum': max_height}}}},
+    ]}
+
+
+MATERIAL_INSTANCE = {'anyOf': [
+    {'type': 'string'},
+    {'type': 'object', 'properties': {
+        'texture': {'type': 'string'},
+        'render_method': {'enum': ['opaque', 'double_sided', 'blend', 'alpha_test', 'alpha_test_single_sided',
+                                   'blend_to_opaque', 'alpha_test_to_opaque', 'alpha_test_single_sided_to_opaque']},
+        'ambient_occlusion': {'type': ['boolean', 'number']},
+        'face_dimming': {'type': 'boolean'},
+        'isotropic': {'type': 'boolean'},
+        'tint_method': {'type': 'string'},
+    }},
+]}
+
+BLOCK_COMPONENTS = {'type': 'object', 'properties': {
+    'minecraft:collision_box': _box(24),
+    'minecraft:selection_box': _box(16),
+    'minecraft:geometry': {'anyOf': [
+        {'type': 'string', 'pattern': r'^(geometry\.|minecraft:geometry\.)'},
+        {'type': 'object', 'required': ['identifier'],
+         'properties': {'identifier': {'type': 'string', 'pattern': r'^(geometry\.|minecraft:geometry\.)'},
+                        'bone_visibility': {'type': 'object'}}},
+    ]},
+    'minecraft:material_instances': {'type': 'object', 'additionalProperties': MATERIAL_INSTANCE},
+    'minecraft:transformation': {'type': 'object', 'properties': {
+        'rotation': {**VECTOR3, 'items': {'type': 'number', 'multipleOf': 90}},
+        'scale': {**VECTOR3, 'items': {'type': 'number', 'minimum': 0}},
+        'translation': VECTOR3,
+        'rotation_pivot': VECTOR3,
+        'scale_pivot': VECTOR3,
+    }},
+    'minecraft:destructible_by_mining': {'anyOf': [
+        {'type': 'boolean'},
+        {'type': 'object', 'properties': {'seconds_to_destroy': {'type': 'number', 'minimum': 0}}},
+    ]},
+    'minecraft:destructible_by_explosion': {'anyOf': [
+        {'type': 'boolean'},
+        {'type': 'object', 'properties': {'explosion_resistance': {'type': 'number', 'minimum': 0}}},
+    ]},
+    'minecraft:map_color': {'anyOf': [{'type': 'string', 'pattern': r'^#[0-9a-fA-F]{6}$'}, VECTOR3]},
+    'minecraft:light_emission': {'type': 'integer', 'minimum': 0, 'maximum': 15},
+    'minecraft:light_dampening': {'type': 'integer', 'minimum': 0, 'maximum': 15},
+    'minecraft:friction': {'type': 'number', 'minimum': 0, 'maximum': 0.9},
+}}
+
+BLOCK_SCHEMA = {'type': 'object', 'required': ['format_version', 'minecraft:block'], 'properties': {
+    'format_version': FORMAT_VERSION,
+    'minecraft:block': {'type': 'object', 'required': ['description', 'components'], 'properties': {
+        'description': {'type': 'object', 'required': ['identifier'], 'properties': {
+            'identifier': IDENTIFIER,
+            'menu_category': {'type': 'object', 'properties': {
+                'category': {'enum': ['construction', 'equipment', 'items', 'nature', 'none', 'commands']},
+                'group': {'type': 'string'},
+                'is_hidden_in_commands': {'type': 'boolean'},
+            }},
+            'states': {'type': 'object', 'additionalProperties': {'anyOf': [
+                {'type': 'array', 'minItems': 1, 'maxItems': 16},
+                {'type': 'object', 'required': ['values']},
+            ]}},
+            'traits': {'type': 'object'},
+        }},
+        'components': {**BLOCK_COMPONENTS, 'required': ['minecraft:material_instances']},
+        'permutations': {'type': 'array', 'items': {
+            'type': 'object', 'required': ['condition', 'components'],
+            'properties': {'condition': {'type': 'string'}, 'components': BLOCK_COMPONENTS},
+        }},
+    }},
+}}
+
+CUBE = {'type': 'object', 'required': ['origin', 'size'], 'properties': {
+    'origin': VECTOR3,
+    'size': {**VECTOR3, 'items': {'type': 'number', 'minimum': 0}},
+    'pivot': VECTOR3,
+    'rotation': VECTOR3,
+    'inflate': NUMBER,
+    'mirror': {'type': 'boolean'},
+    'uv': {'anyOf': [VECTOR2, {'type': 'object', 'additionalProperties': {
+        'type': 'object', 'required': ['uv'],
+        'properties': {'uv': VECTOR2, 'uv_size': VECTOR2, 'material_instance': {'type': 'string'}},
+    }}]},
+}}
+
+GEOMETRY_SCHEMA = {'type': 'object', 'required': ['format_version', 'minecraft:geometry'], 'properties': {
+    'format_version': FORMAT_VERSION,
+    'minecraft:geometry': {'type': 'array', 'minItems': 1, 'items': {
+        'type': 'object', 'required': ['description'], 'properties': {
+            'description': {'type': 'object', 'required': ['identifier'], 'properties': {
+                'identifier': {'type': 'string', 'pattern': r'^geometry\.'},
+                'texture_width': {'type': 'integer', 'minimum': 1},
+                'texture_height': {'type': 'integer', 'minimum': 1},
+                'visible_bounds_width': {'type': 'number', 'minimum': 0},
+                'visible_bounds_height': {'type': 'number', 'minimum': 0},
+                'visible_bounds_offset': VECTOR3,
+            }},
+            'bones': {'type': 'array', 'items': {'type': 'object', 'required': ['name'], 'properties': {
+                'name': {'type': 'string'},
+                'parent': {'type': 'string'},
+                'pivot': VECTOR3,
+                'rotation': VECTOR3,
+                'cubes': {'type': 'array', 'items': CUBE},
+            }}},
+        }}},
+}}
+
+TEXTURE_PATHS = {'anyOf': [
+    {'type': 'string'},
+    {'type': 'array', 'minItems': 1, 'items': {'anyOf': [
+        {'type': 'string'},
+        {'type': 'object', 'required': ['path'], 'properties': {'path': {'type': 'string'}}},
+    ]}},
+]}
+
+TERRAIN_TEXTURE_SCHEMA = {'type': 'object', 'required': ['texture_data'], 'properties': {
+    'resource_pack_name': {'type': 'string'},
+    'texture_name': {'enum': ['atlas.terrain', 'atlas.items']},
+    'padding': {'type': 'integer', 'minimum': 0},
+    'num_mip_levels': {'type': 'integer', 'minimum': 0},
+    'texture_data': {'type': 'object', 'additionalProperties': {
+        'type': 'object', 'required': ['textures'], 'properties': {'textures': TEXTURE_PATHS},
+    }},
+}}
+
+RP_BLOCKS_SCHEMA = {'type': 'object', 'properties': {'format_version': FORMAT_VERSION}, 'additionalProperties': {
+    'type': 'object', 'properties': {
+        'sound': {'type': 'string'},
+        'textures': {'anyOf': [{'type': 'string'}, {'type': 'object', 'additionalProperties': {'type': 'string'}}]},
+        'carried_textures': {'type': 'string'},
+        'isotropic': {'type': ['boolean', 'object']},
+        'brightness_gamma': NUMBER,
+    }},
+}
+
+MANIFEST_SCHEMA = {'type': 'object', 'required': ['format_version', 'header', 'modules'], 'properties': {
+    'format_version': {'enum': [1, 2, 3]},
+    'header': {'type': 'object', 'required': ['name', 'uuid', 'version'], 'properties': {
+        'name': {'type': 'string'},
+        'description': {'type': 'string'},
+        'uuid': UUID,
+        'version': {'anyOf': [VERSION3, {'type': 'string'}]},
+        'min_engine_version': {'anyOf': [VERSION3, {'type': 'string'}]},
+    }},
+    'modules': {'type': 'array', 'minItems': 1, 'items': {
+        'type': 'object', 'required': ['type', 'uuid', 'version'], 'properties': {
+            'type': {'enum': ['data', 'resources', 'script', 'client_data', 'interface', 'world_template',
+                              'skin_pack']},
+            'uuid': UUID,
+            'version': {'anyOf': [VERSION3, {'type': 'string'}]},
+        }}},
+    'dependencies': {'type': 'array', 'items': {'anyOf': [
+        {'type': 'object', 'required': ['uuid', 'version'],
+         'properties': {'uuid': UUID, 'version': {'anyOf': [VERSION3, {'type': 'string'}]}}},
+        {'type': 'object', 'required': ['module_name', 'version'], 'properties': {'module_name': {'type': 'string'}}},
+    ]}},
+}}
+
+CATALOG_SCHEMA = {'type': 'object', 'required': ['format_version', 'minecraft:crafting_items_catalog'], 'properties': {
+    'format_version': FORMAT_VERSION,
+    'minecraft:crafting_items_catalog': {'type': 'object', 'required': ['categories'], 'properties': {
+        'categories': {'type': 'array', 'items': {
+            'type': 'object', 'required': ['category_name'], 'properties': {
+                'category_name': {'enum': ['construction', 'equipment', 'items', 'nature']},
+                'groups': {'type': 'array', 'items': {'type': 'object', 'required': ['items'], 'properties': {
+                    'group_identifier': {'type': 'object', 'required': ['name'], 'properties': {
+                        'icon': IDENTIFIER,
+                        'name': IDENTIFIER,
+                    }},
+                    'items': {'type': 'array', 'items': {'anyOf': [
+                        IDENTIFIER,
+                        {'type': 'object', 'required': ['name'], 'properties': {'name': IDENTIFIER}},
+                    ]}},
+                }}},
+            }}},
+    }},
+}}
+
+# Wzorce ścieżek -> schemat (pierwszy pasujący)
+SCHEMA_FILES = [
+    ('BP/blocks/*.block.json', 'block'),
+    ('RP/models/*.geo.json', 'geometry'),
+    ('RP/textures/terrain_texture.json', 'terrain_texture'),
+    ('RP/textures/item_texture.json', 'terrain_texture'),
+    ('RP/blocks.json', 'blocks'),
+    ('*/manifest.json', 'manifest'),
+    ('BP/item_catalog/*.json', 'catalog'),
+]
+
+SCHEMAS = {
+    'block': BLOCK_SCHEMA,
+    'geometry': GEOMETRY_SCHEMA,
+    'terrain_texture': TERRAIN_TEXTURE_SCHEMA,
+    'blocks': RP_BLOCKS_SCHEMA,
+    'manifest': MANIFEST_SCHEMA,
+    'catalog': CATALOG_SCHEMA,
+}
+
+# Kompilacja raz na proces (również w każdym procesie roboczym)
+VALIDATORS: Dict[str, Validator] = {name: compile_schema(schema) for name, schema in SCHEMAS.items()}
+
+
+def schema_for(file_path: str) -> str:
+    """Schema name for the project file (None when the file has no schema)"""
+    file_path = file_path.replace(os.sep, '/')
+    for pattern, schema_name in SCHEMA_FILES:
+        if fnmatch.fnmatch(file_path, pattern):
+            return schema_name
+    return None
+
+
+def validate(data: Any, schema_name: str) -> List[str]:
+    """Validate parsed data against the named schema"""
+    errors = []
+    VALIDATORS[schema_name](data, '$', errors)
+    return errors
+
+
+def validate_file(file_path: str) -> List[str]:
+    """Validate one file against its schema; messages are prefixed with the file path"""
+    schema_name = schema_for(file_path)
+    if not schema_name:
+        return []
+    try:
+        with open(file_path, 'rb') as f:
+            data = JsonBackend.loads_lenient(f.read())
+    except (OSError, ValueError) as e:
+        return [f"[{file_path}] cannot parse: {e}"]
+    return [f"[{file_path}] {error}" for error in validate(data, schema_name)]
+
+
+def _validate_chunk(file_paths: List[str]) -> List[Tuple[str, List[str]]]:
+    return [(file_path, validate_file(file_path)) for file_path in file_paths]
+
+
+def validate_files(file_paths: Iterable[str], workers: int = None) -> Dict[str, List[str]]:
+    """Validate many files, in worker processes when there are enough of them; returns errors per file"""
+    file_paths = [file_path for file_path in file_paths if schema_for(file_path)]
+    if len(file_paths) < PARALLEL_THRESHOLD or workers == 1:
+        return dict(_validate_chunk(file_paths))
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(len(file_paths) // (workers * 4), 1)
+    chunks = [file_paths[index:index + chunk_size] for index in range(0, len(file_paths), chunk_size)]
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_result in executor.map(_validate_chunk, chunks):
+            results.update(chunk_result)
+    return results
+
+
+def project_files(directories: Iterable[str] = ('BP', 'RP')) -> List[str]:
+    """All project files which have a schema"""
+    return sorted(file_path for directory in directories for file_path in scan_files(directory)
+                  if schema_for(file_path))
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Biblioteka z plikami struktur Bedrock (.mcstructure — NBT little-endian) budowanymi na siatce NumPy
+"""
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+from import_utils import lazy_import
+
+np = lazy_import('numpy')
+
+STRUCTURE_EXTENSION = '.mcstructure'
+FORMAT_VERSION = 1
+# Wersja stanów bloków 1.20.0.32 (bloki z traits wymagają 1.20+)
+BLOCK_VERSION = 18090528
+# Indeks palety "structure void" — pozycja nie nadpisuje świata przy wczytaniu
+VOID = -1
+
+CARDINAL_STATE = 'minecraft:cardinal_direction'
+# Obrót o 90° zgodnie z ruchem wskazówek zegara patrząc z góry (north = -z, east = +x)
+CLOCKWISE = {'north': 'east', 'east': 'south', 'south': 'west', 'west': 'north'}
+
+TAG_END, TAG_BYTE, TAG_SHORT, TAG_INT, TAG_LONG, TAG_FLOAT, TAG_DOUBLE = range(7)
+TAG_BYTE_ARRAY, TAG_STRING, TAG_LIST, TAG_COMPOUND, TAG_INT_ARRAY, TAG_LONG_ARRAY = range(7, 13)
+
+BlockState = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+# ===== NBT =====
+
+def _string(value: str) -> bytes:
+    encoded = value.encode('utf-8')
+    return struct.pack('<H', len(encoded)) + encoded
+
+
+def _tag_type(value) -> int:
+    if isinstance(value, bool):
+        return TAG_BYTE
+    if isinstance(value, int):
+        return TAG_INT
+    if isinstance(value, float):
+        return TAG_FLOAT
+    if isinstance(value, str):
+        return TAG_STRING
+    if isinstance(value, dict):
+        return TAG_COMPOUND
+    if isinstance(value, (list, tuple)) or (np and isinstance(value, np.ndarray)):
+        return TAG_LIST
+    raise TypeError(f"Cannot encode {type(value).__name__} as NBT")
+
+
+def _payload(value, parts: List[bytes]):
+    tag = _tag_type(value)
+    if tag == TAG_BYTE:
+        parts.append(struct.pack('<b', value))
+    elif tag == TAG_INT:
+        parts.append(struct.pack('<i', value))
+    elif tag == TAG_FLOAT:
+        parts.append(struct.pack('<f', value))
+    elif tag == TAG_STRING:
+        parts.append(_string(value))
+    elif tag == TAG_COMPOUND:
+        for name, item in value.items():
+            parts.append(bytes((_tag_type(item),)) + _string(name))
+            _payload(item, parts)
+        parts.append(bytes((TAG_END,)))
+    elif not isinstance(value, (list, tuple)):
+        # Tablica NumPy jako lista TAG_Int zakodowana jednym tobytes()
+        parts.append(struct.pack('<bi', TAG_INT, value.size))
+        parts.append(value.astype('<i4', copy=False).tobytes())
+    else:
+        item_tag = _tag_type(value[0]) if value else TAG_END
+        parts.append(struct.pack('<bi', item_tag, len(value)))
+        for item in value:
+            _payload(item, parts)
+
+
+def nbt_dumps(value: Dict[str, Any], name: str = '') -> bytes:
+    """Encode a root compound as little-endian NBT (bool -> Byte, int -> Int, numpy array -> List of Int)"""
+    parts = [bytes((TAG_COMPOUND,)) + _string(name)]
+    _payload(value, parts)
+    return b''.join(parts)
+
+
+class _Reader:
+    FORMATS = {TAG_BYTE: '<b', TAG_SHORT: '<h', TAG_INT: '<i', TAG_LONG: '<q', TAG_FLOAT: '<f', TAG_DOUBLE: '<d'}
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.position = 0
+
+    def unpack(self, fmt: str):
+        value, = struct.unpack_from(fmt, self.data, self.position)
+        self.position += struct.calcsize(fmt)
+        return value
+
+    def string(self) -> str:
+        length = self.unpack('<H')
+        self.position += length
+        return self.data[self.position - length:self.position].decode('utf-8')
+
+    def payload(self, tag: int):
+        if tag in self.FORMATS:
+            return self.unpack(self.FORMATS[tag])
+        if tag == TAG_STRING:
+            return self.string()
+        if tag == TAG_COMPOUND:
+            compound = {}
+            while True:
+                item_tag = self.unpack('<b')
+                if item_tag == TAG_END:
+                    return compound
+                name = self.string()
+                compound[name] = self.payload(item_tag)
+        if tag in (TAG_LIST, TAG_BYTE_ARRAY, TAG_INT_ARRAY, TAG_LONG_ARRAY):
+            item_tag = {TAG_BYTE_ARRAY: TAG_BYTE, TAG_INT_ARRAY: TAG_INT, TAG_LONG_ARRAY: TAG_LONG}.get(tag)
+            if item_tag is None:
+                item_tag = self.unpack('<b')
+            count = self.unpack('<i')
+            if item_tag == TAG_INT:
+                values = np.frombuffer(self.data, '<i4', count, self.position).astype(np.int32)
+                self.position += 4 * count
+                return values
+            return [self.payload(item_tag) for _ in range(count)]
+        raise ValueError(f"Unknown NBT tag [{tag}] at offset [{self.position}]")
+
+
+def nbt_loads(data: bytes) -> Tuple[str, Dict[str, Any]]:
+    """Decode little-endian NBT into (root name, compound), lists of Int become numpy arrays"""
+    reader = _Reader(data)
+    if reader.unpack('<b') != TAG_COMPOUND:
+        raise ValueError("NBT root is not a compound")
+    name = reader.string()
+    return name, reader.payload(TAG_COMPOUND)
+
+
+# ===== STRUKTURY =====
+
+class Structure:
+    """Bedrock structure: block palette and a (x, y, z) grid of palette indices (VOID = structure void)"""
+
+    def __init__(self, size_x: int, size_y: int, size_z: int):
+        self.blocks = np.full((size_x, size_y, size_z), VOID, dtype=np.int32)
+        self.palette: List[BlockState] = []
+        self._indices: Dict[BlockState, int] = {}
+
+    @property
+    def size(self) -> Tuple[int, int, int]:
+        return tuple(int(value) for value in self.blocks.shape)
+
+    def block(self, name: str, states: Optional[Dict[str, Any]] = None) -> int:
+        """Palette index of the block state (added on first use)"""
+        key = (name, tuple(sorted((states or {}).items())))
+        if key not in self._indices:
+            self._indices[key] = len(self.palette)
+            self.palette.append(key)
+        return self._indices[key]
+
+    def fill(self, index: int, x0: int, y0: int, z0: int, x1: int, y1: int, z1: int):
+        """Set the inclusive cuboid (like /fill) to the palette index"""
+        self.blocks[min(x0, x1):max(x0, x1) + 1, min(y0, y1):max(y0, y1) + 1, min(z0, z1):max(z0, z1) + 1] = index
+
+    def paste(self, other: 'Structure', x: int, y: int, z: int):
+        """Copy non-void blocks of another structure with its minimum corner at (x, y, z)"""
+        mapping = np.array([self.block(name, dict(states)) for name, states in other.palette] or [VOID],
+                           dtype=np.int32)
+        size_x, size_y, size_z = other.size
+        target = self.blocks[x:x + size_x, y:y + size_y, z:z + size_z]
+        mask = other.blocks != VOID
+        target[mask] = mapping[other.blocks[mask]]
+
+    def rotated(self, turns: int = 1) -> 'Structure':
+        """Copy rotated clockwise (seen from above) by turns * 90°, with cardinal_direction states rotated too"""
+        turns %= 4
+        result = Structure(*self.size)
+        # rot90 z płaszczyzny x -> z obraca zgodnie z ruchem wskazówek zegara (north = -z staje się east = +x)
+        result.blocks = np.ascontiguousarray(np.rot90(self.blocks, turns, axes=(0, 2)))
+        for name, states in self.palette:
+            states = dict(states)
+            if CARDINAL_STATE in states:
+                for _ in range(turns):
+                    states[CARDINAL_STATE] = CLOCKWISE[states[CARDINAL_STATE]]
+            result.block(name, states)
+        return result
+
+    def counts(self) -> Dict[str, int]:
+        """Number of placed blocks per block name"""
+        counts: Dict[str, int] = {}
+        placed = np.bincount(self.blocks[self.blocks != VOID], minlength=len(self.palette))
+        for (name, _), count in zip(self.palette, placed.tolist()):
+            if count:
+                counts[name] = counts.get(name, 0) + count
+        return counts
+
+    def to_nbt(self) -> Dict[str, Any]:
+        # Kolejność indeksów: z najszybciej, potem y, potem x — to układ C tablicy (x, y, z)
+        indices = self.blocks.ravel()
+        return {
+            'format_version': FORMAT_VERSION,
+            'size': list(self.size),
+            'structure': {
+                'block_indices': [indices, np.full(indices.size, VOID, dtype=np.int32)],
+                'entities': [],
+                'palette': {
+                    'default': {
+                        'block_palette': [{'name': name, 'states': dict(states), 'version': BLOCK_VERSION}
+                                          for name, states in self.palette],
+                        'block_position_data': {},
+                    },
+                },
+            },
+            'structure_world_origin': [0, 0, 0],
+        }
+
+    def to_bytes(self) -> bytes:
+        return nbt_dumps(self.to_nbt())
+
+    def save(self, file_path: str) -> int:
+        content = self.to_bytes()
+        with open(file_path, 'wb') as f:
+            f.write(content)
+        return len(content)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Structure':
+        _, root = nbt_loads(data)
+        structure = cls(*(int(value) for value in root['size']))
+        palette = root['structure']['palette']['default']['block_palette']
+        for block in palette:
+            structure.palette.append((block['name'], tuple(sorted(block['states'].items()))))
+        structure._indices = {key: index for index, key in enumerate(structure.palette)}
+        structure.blocks = root['structure']['block_indices'][0].reshape(structure.size)
+        return structure
+
+    @classmethod
+    def load(cls, file_path: str) -> 'Structure':
+        with open(file_path, 'rb') as f:
+            return cls.from_bytes(f.read())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Biblioteka ze skrótami zawartości paczek (wersja paczki zmienia się tylko, gdy zmieniła się jej zawartość)
+"""
+import hashlib
+import os
+from typing import Any, Dict, List, Optional
+
+from json_utils import JsonBackend
+from scan_utils import IGNORE_FILES, scan_files
+
+# Plik ze skrótem zapisany obok manifest.json (nie trafia do archiwów)
+CONTENT_HASH_FILE = 'content_hash.json'
+MANIFEST_FILE = 'manifest.json'
+
+
+def is_packaged(file_name: str) -> bool:
+    """Whether the file belongs to pack contents (not .DS_Store, ignore rule files nor the content hash file)"""
+    return not file_name.endswith('.DS_Store') and file_name != CONTENT_HASH_FILE and file_name not in IGNORE_FILES
+
+
+def _normalized_manifest(content: bytes) -> bytes:
+    """Manifest without its own versions, so bumping the version does not change the hash"""
+    data = JsonBackend.loads_lenient(content)
+    data.get('header', {}).pop('version', None)
+    for module in data.get('modules', []):
+        module.pop('version', None)
+    return JsonBackend.dumps(data, compact=True).encode('utf-8')
+
+
+def content_hash(pack_dir: str) -> str:
+    """SHA-256 of all packaged files of the pack (paths and contents, manifest without own versions)"""
+    file_paths = [file_path for file_path in scan_files(pack_dir) if is_packaged(os.path.basename(file_path))]
+
+    digest = hashlib.sha256()
+    for file_path in sorted(file_paths, key=lambda path: os.path.relpath(path, pack_dir).replace(os.sep, '/')):
+        relative_path = os.path.relpath(file_path, pack_dir).replace(os.sep, '/')
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        if relative_path == MANIFEST_FILE:
+            content = _normalized_manifest(content)
+        digest.update(relative_path.encode('utf-8') + b'\0')
+        digest.update(len(content).to_bytes(8, 'little'))
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def read_content_hash(pack_dir: str) -> Optional[Dict[str, Any]]:
+    """Stored {"sha256": ..., "version": [...]} of the pack, None when not recorded yet"""
+    file_path = os.path.join(pack_dir, CONTENT_HASH_FILE)
+    if not os.path.exists(file_path):
+        return None
+    return JsonBackend.load_file(file_path)
+
+
+def write_content_hash(pack_dir: str, sha256: str, version: List[int]):
+    JsonBackend.dump_file(os.path.join(pack_dir, CONTENT_HASH_FILE), {"sha256": sha256, "version": version},
+                          compact=False)
+
+
+def dependency_order(pack_dirs: List[str]) -> List[str]:
+    """Pack directories ordered so that packs come after the packs they depend on (by manifest UUIDs)"""
+    manifests = {pack_dir: JsonBackend.load_file(os.path.join(pack_dir, MANIFEST_FILE)) for pack_dir in pack_dirs}
+    uuids = {manifest['header']['uuid']: pack_dir for pack_dir, manifest in manifests.items()}
+    ordered = []
+
+    def visit(pack_dir, visiting):
+        if pack_dir in ordered or pack_dir in visiting:
+            return
+        for dependency in manifests[pack_dir].get('dependencies', []):
+            if dependency.get('uuid') in uuids:
+                visit(uuids[dependency['uuid']], visiting | {pack_dir})
+        ordered.append(pack_dir)
+
+    for pack_dir in pack_dirs:
+        visit(pack_dir, set())
+    return ordered
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Demon projektu z ciepłym stanem (zaimportowane moduły, wyniki weryfikacji, graf zasobów) dostępny przez gniazdo Unix
+
+Ten sam skrypt jest cienkim klientem: polecenia verify/build/graph trafiają do działającego demona,
+a gdy demon nie działa, są uruchamiane bezpośrednio.
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+SOCKET_FILE = '.project_daemon.sock'
+# Polecenie -> (moduł, argumenty uruchamiane zawsze bezpośrednio, bo blokują demona)
+COMMANDS = {
+    'verify': ('verify_all', ()),
+    'build': ('build', ('--watch', '-w')),
+    'graph': ('minecraft_graph', ()),
+}
+START_TIMEOUT = 10.0
+USAGE = f"""usage: project_daemon.py {{start,serve,status,stop,{','.join(COMMANDS)}}} [args...]
+
+  start               start the daemon in the background
+  serve               run the daemon in the foreground
+  status              show daemon state (cached checks, file watcher backend)
+  stop                stop the daemon
+  verify [args...]    verify_all.py through the daemon (cached results of checks with unchanged inputs)
+  build [args...]     build.py through the daemon
+  graph [args...]     minecraft_graph.py through the daemon (graph kept until BP/RP change)
+
+Without a running daemon, verify/build/graph run directly."""
+
+
+def _send(conn: socket.socket, message):
+    conn.sendall((json.dumps(message) + '\n').encode('utf-8'))
+
+
+class _StreamWriter:
+    """File-like object streaming printed text to the client (output is dropped once the client disconnects)"""
+
+    def __init__(self, conn: socket.socket, stream: str, tty: bool):
+        self.conn = conn
+        self.stream = stream
+        self.tty = tty
+        self.closed = False
+
+    def write(self, text: str) -> int:
+        if text and not self.closed:
+            try:
+                _send(self.conn, {'stream': self.stream, 'text': text})
+            except OSError:
+                self.closed = True
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self) -> bool:
+        return self.tty
+
+
+class _Capture:
+    """In-memory stdout for a check, reporting the client's terminal type (colors are kept in cached output)"""
+
+    def __init__(self, tty: bool):
+        self.parts = []
+        self.tty = tty
+
+    def write(self, text: str) -> int:
+        self.parts.append(text)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self) -> bool:
+        return self.tty
+
+    def getvalue(self) -> str:
+        return ''.join(self.parts)
+
+
+class _Restart(Exception):
+    """Python sources of the daemon changed, it re-executes itself"""
+
+
+class ProjectDaemon:
+    """Keeps imported modules, check results and the asset graph warm; file changes invalidate affected state"""
+
+    def __init__(self, socket_path: str = SOCKET_FILE):
+        from watch_utils import FileWatcher
+        # Ciepły start: importy raz na życie demona
+        import build
+        import minecraft_graph
+        import verify_all
+        from minecraft_check import MinecraftUtils
+
+        self.socket_path = socket_path
+        self.modules = {'verify': verify_all, 'build': build, 'graph': minecraft_graph}
+        self.utils = MinecraftUtils
+        self.watcher = FileWatcher(['.'])
+        # (nazwa weryfikacji, tty, quiet) -> (błędy, ostrzeżenia, wypisany tekst)
+        self.results = {}
+        self.graph = None
+        self.sources = {}
+        self._record_sources()
+        self.started = time.time()
+        self.requests = 0
+        self.running = True
+
+    # ===== STAN =====
+
+    def _record_sources(self):
+        """Remember mtimes of loaded project modules (also those imported lazily by later requests)"""
+        project_dir = os.getcwd() + os.sep
+        for module in list(sys.modules.values()):
+            file_path = getattr(module, '__file__', None)
+            if file_path and file_path.startswith(project_dir) and file_path not in self.sources:
+                self.sources[file_path] = os.stat(file_path).st_mtime_ns
+
+    def _sources_changed(self) -> bool:
+        for file_path, mtime in self.sources.items():
+            try:
+                if os.stat(file_path).st_mtime_ns != mtime:
+                    return True
+            except FileNotFoundError:
+                return True
+        return False
+
+    def invalidate(self, changed):
+        """Drop cached results of checks affected by changed files (unknown pack files drop all)"""
+        import fnmatch
+
+        if not changed:
+            return
+        names = {'count_project_files', 'verify_project_structure'}
+        for file_path in changed:
+            mapped = [verification_names for pattern, verification_names in self.utils.VERIFICATION_DEPENDENCIES
+                      if fnmatch.fnmatch(file_path, pattern)]
+            for verification_names in mapped:
+                names.update(verification_names)
+            if not mapped and file_path.startswith(('BP/', 'RP/')):
+                self.results.clear()
+        self.results = {key: value for key, value in self.results.items() if key[0] not in names}
+        if any(file_path.startswith(('BP/', 'RP/')) or file_path == 'config.json' for file_path in changed):
+            self.graph = None
+
+    def wrap_check(self, verify_func):
+        """Check returning the cached result (and replaying its output) while its inputs are unchanged"""
+        import functools
+        from console_utils import ConsoleStyle
+
+        @functools.wraps(verify_func)
+        def cached():
+            key = (verify_func.__name__, sys.stdout.isatty(), ConsoleStyle.QUIET_MODE)
+            if key not in self.results:
+                stdout = sys.stdout
+                sys.stdout = capture = _Capture(stdout.isatty())
+                try:
+                    errors, warnings = verify_func()
+                finally:
+                    sys.stdout = stdout
+                # Wyjątek nie trafia do pamięci podręcznej — kolejne żądanie uruchomi weryfikację ponownie
+                self.results[key] = (errors, warnings, capture.getvalue())
+            errors, warnings, output = self.results[key]
+            sys.stdout.write(output)
+            return list(errors), list(warnings)
+
+        return cached
+
+    def _build_graph(self):
+        if self.graph is None:
+            from minecraft_graph import AssetGraph
+            self.graph = AssetGraph.build()
+        return self.graph
+
+    # ===== ŻĄDANIA =====
+
+    def _status(self):
+        from console_utils import ConsoleStyle
+        cached = sorted({key[0] for key in self.results})
+        ConsoleStyle.print_stats({
+            ConsoleStyle.info("Uptime"): f"[{time.time() - self.started:.0f}] s",
+            ConsoleStyle.info("Requests"): f"[{self.requests}]",
+            ConsoleStyle.info("File watcher"): f"[{self.watcher.backend}]",
+            ConsoleStyle.info("Watched files"): f"[{len(self.watcher.state)}]",
+            ConsoleStyle.info("Cached checks"): f"[{len(cached)}] {', '.join(cached)}" if cached else "0",
+            ConsoleStyle.info("Asset graph"): "cached" if self.graph is not None else "not built",
+        }, "PROJECT DAEMON", icon="🛰️")
+
+    def _run(self, command: str, argv):
+        if command == 'status':
+            self._status()
+        elif command == 'stop':
+            self.running = False
+        elif command == 'verify':
+            self.modules['verify'].main(argv, wrap_check=self.wrap_check)
+        elif command == 'graph':
+            self.modules['graph'].main(argv, build_graph=self._build_graph)
+        elif command == 'build':
+            self.modules['build'].main(argv)
+        else:
+            print(f"Unknown command [{command}]", file=sys.stderr)
+            sys.exit(2)
+
+    def handle(self, conn: socket.socket):
+        import traceback
+        from contextlib import redirect_stderr, redirect_stdout
+        from console_utils import ConsoleStyle, Profiler
+
+        with conn.makefile('r', encoding='utf-8') as f:
+            request = json.loads(f.readline())
+        if self._sources_changed():
+            _send(conn, {'restart': True})
+            raise _Restart()
+        self.invalidate({file_path[2:] if file_path.startswith('./') else file_path
+                         for file_path in self.watcher.pending()})
+        self.requests += 1
+
+        tty = bool(request.get('tty'))
+        status = 0
+        with redirect_stdout(_StreamWriter(conn, 'stdout', tty)), redirect_stderr(_StreamWriter(conn, 'stderr', tty)):
+            try:
+                self._run(request.get('command'), list(request.get('args', [])))
+            except SystemExit as e:
+                if isinstance(e.code, str):
+                    print(e.code, file=sys.stderr)
+                status = e.code if isinstance(e.code, int) else int(e.code is not None)
+            except Exception:
+                traceback.print_exc()
+                status = 1
+            finally:
+                # Stan globalny ustawiany przez skrypty nie może przejść na kolejne żądania
+                ConsoleStyle.set_quiet_mode(False)
+                Profiler.set_enabled(False)
+                Profiler.reset()
+        self._record_sources()
+        _send(conn, {'exit': status})
+
+    def serve(self):
+        from console_utils import ConsoleStyle
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        server.listen()
+        print(ConsoleStyle.success(f"Project daemon listening on [{self.socket_path}] "
+                                   f"(file watcher: [{self.watcher.backend}])"))
+        restart = False
+        try:
+            while self.running:
+                conn, _ = server.accept()
+                with conn:
+                    try:
+                        self.handle(conn)
+                    except _Restart:
+                        restart = True
+                        break
+                    except (OSError, ValueError) as e:
+                        # Klient rozłączony lub niepoprawne żądanie — demon działa dalej
+                        print(ConsoleStyle.warning(f"Request failed: {e}"))
+        finally:
+            server.close()
+            os.unlink(self.socket_path)
+            self.watcher.stop()
+        if restart:
+            print(ConsoleStyle.info("Python sources changed, restarting daemon..."))
+            os.execv(sys.executable, [sys.executable, os.path.abspath(__file__), 'serve', self.socket_path])
+
+
+# ===== KLIENT =====
+
+def _connect(socket_path: str):
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        conn.close()
+        return None
+    return conn
+
+
+def _wait_for_daemon(socket_path: str, timeout: float = START_TIMEOUT) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        conn = _connect(socket_path)
+        if conn:
+            conn.close()
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def request(command: str, argv, socket_path: str = SOCKET_FILE):
+    """Send the command to the daemon and stream its output, return exit status (None when no daemon runs)"""
+    for _ in range(2):
+        conn = _connect(socket_path)
+        if conn is None:
+            return None
+        with conn, conn.makefile('r', encoding='utf-8') as f:
+            _send(conn, {'command': command, 'args': argv, 'tty': sys.stdout.isatty()})
+            for line in f:
+                message = json.loads(line)
+                if 'text' in message:
+                    (sys.stderr if message['stream'] == 'stderr' else sys.stdout).write(message['text'])
+                elif 'exit' in message:
+                    sys.stdout.flush()
+                    return message['exit']
+                elif message.get('restart'):
+                    break
+            else:
+                print("Project daemon closed the connection", file=sys.stderr)
+                return 1
+        # Demon uruchamia się ponownie po zmianie kodu Pythona — ponów żądanie
+        if not _wait_for_daemon(socket_path):
+            return None
+    return None
+
+
+def start(socket_path: str = SOCKET_FILE) -> bool:
+    if _wait_for_daemon(socket_path, 0):
+        print(f"Project daemon already running on [{socket_path}]")
+        return True
+    if os.path.exists(socket_path):
+        # Gniazdo po demonie, który nie zakończył się poprawnie
+        os.unlink(socket_path)
+    subprocess.Popen([sys.executable, os.path.abspath(__file__), 'serve', socket_path], start_new_session=True,
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if not _wait_for_daemon(socket_path):
+        print(f"Project daemon did not start within [{START_TIMEOUT:.0f}] s", file=sys.stderr)
+        return False
+    print(f"Project daemon started on [{socket_path}]")
+    return True
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print(USAGE)
+        return 0 if argv else 2
+    command, args = argv[0], argv[1:]
+
+    if command == 'serve':
+        socket_path = args[0] if args else SOCKET_FILE
+        if os.path.exists(socket_path) and not _wait_for_daemon(socket_path, 0):
+            os.unlink(socket_path)
+        ProjectDaemon(socket_path).serve()
+        return 0
+    if command == 'start':
+        return 0 if start() else 1
+    if command in ('status', 'stop'):
+        status = request(command, [])
+        if status is None:
+            print("Project daemon is not running")
+            return 1
+        return status
+    if command not in COMMANDS:
+        print(USAGE)
+        return 2
+
+    module_name, blocking_args = COMMANDS[command]
+    status = None
+    if not any(arg in blocking_args for arg in args):
+        status = request(command, args)
+    if status is None:
+        # Brak demona — uruchomienie bezpośrednie
+        module = __import__(module_name)
+        try:
+            module.main(args)
+        except SystemExit as e:
+            return e.code
+        return 0
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Generator funkcji (.mcfunction) układających drogi poleceniami /fill i /setblock
+
+Trasa (łamana z liczbą pasów i wzorcami linii) jest wokselizowana do siatki bloków, a siatka pokrywana możliwie
+małą liczbą prostokątów: nawierzchnia może przykryć całą drogę jednym zestawem /fill, a oznakowanie ją nadpisuje.
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+from console_utils import ConsoleStyle, Profiler
+from json_utils import JsonBackend
+from minecraft_structure import VOID, Structure, np
+from road_prefabs import ACROSS, ALONG, MARKING_PATTERNS, BlockCatalog, cross_section, pattern_mask
+
+OUTPUT_DIR = 'BP/functions/roads'
+FUNCTIONS_DIR = 'BP/functions'
+FUNCTION_EXTENSION = '.mcfunction'
+# Limit bloków zmienianych jednym /fill
+MAX_FILL_VOLUME = 32768
+# Limit poleceń w jednym pliku funkcji (dłuższe funkcje są dzielone na części wywoływane z głównej)
+MAX_FUNCTION_COMMANDS = 10000
+DEFAULT_HEIGHT = 16
+
+SURFACE = 'base_road_{height}'
+LINE = 'road_marking_straight_{height}'
+
+# Prostokąt siatki (x0, z0, x1, z1), granice włącznie
+Rectangle = Tuple[int, int, int, int]
+
+
+# ===== WOKSELIZACJA =====
+
+def _road_columns(road: Dict[str, Any]):
+    return cross_section(road.get('lanes', 2), road.get('two_way', True), road.get('separator', 'dashed'),
+                         road.get('center', 'solid'))
+
+
+def _bounds(roads: List[Dict[str, Any]]) -> Rectangle:
+    """Bounding box (x0, z0, x1, z1) of all roads including their width"""
+    xs, zs = [], []
+    for road in roads:
+        half = len(_road_columns(road)) // 2
+        for x, z in road['points']:
+            xs.extend((x - half, x + half))
+            zs.extend((z - half, z + half))
+    return min(xs), min(zs), max(xs), max(zs)
+
+
+def _lay_axis_segment(grid, start, end, columns, surface: int, line: int, distance: int,
+                      extend: Tuple[int, int], unmarked: Tuple[int, int]):
+    """Road along x or z: surface extended by extend blocks over joints, lines without unmarked blocks at the ends"""
+    (sx, sz), (ex, ez) = start, end
+    along_x = sz == ez
+    length = abs(ex - sx) + abs(ez - sz)
+    step = 1 if (ex > sx if along_x else ez > sz) else -1
+    t = np.arange(-extend[0], length + extend[1] + 1)
+    along = (sx if along_x else sz) + step * t
+    inside = (t >= unmarked[0]) & (t <= length - unmarked[1])
+    half = len(columns) // 2
+    for column, pattern in enumerate(columns):
+        across = (sz if along_x else sx) + column - half
+        values = np.full(t.size, surface, dtype=np.int32)
+        if pattern is not None:
+            # Położenie we wzorcu liczone od początku trasy, więc przerywana linia biegnie dalej za zakrętem
+            values[inside & pattern_mask(pattern, distance - extend[0], t.size)] = line
+        if along_x:
+            grid[along, across] = values
+        else:
+            grid[across, along] = values
+
+
+def _lay_free_segment(grid, start, end, half: int, surface: int):
+    """Road in any other direction: cells within half width of the segment (surface only)"""
+    (sx, sz), (ex, ez) = start, end
+    xs = np.arange(max(min(sx, ex) - half, 0), min(max(sx, ex) + half, grid.shape[0] - 1) + 1)
+    zs = np.arange(max(min(sz, ez) - half, 0), min(max(sz, ez) + half, grid.shape[1] - 1) + 1)
+    x, z = np.meshgrid(xs, zs, indexing='ij')
+    dx, dz = ex - sx, ez - sz
+    t = np.clip(((x - sx) * dx + (z - sz) * dz) / (dx * dx + dz * dz), 0, 1)
+    mask = np.hypot(x - (sx + t * dx), z - (sz + t * dz)) <= half + 0.5
+    grid[x[mask], z[mask]] = surface
+
+
+def voxelize(roads: List[Dict[str, Any]], catalog: BlockCatalog, height: int = DEFAULT_HEIGHT):
+    """Single-layer structure of the roads and the world (x, z) of its corner; later roads paint over earlier"""
+    x0, z0, x1, z1 = _bounds(roads)
+    structure = Structure(x1 - x0 + 1, 1, z1 - z0 + 1)
+    grid = structure.blocks[:, 0, :]
+    surface = catalog.index(structure, SURFACE.format(height=height))
+    for road in roads:
+        columns = _road_columns(road)
+        half = len(columns) // 2
+        points = [(x - x0, z - z0) for x, z in road['points']]
+        if len(points) < 2:
+            raise ValueError(f"Road needs at least two points, got {road['points']}")
+        distance = 0
+        last = len(points) - 2
+        for i, (start, end) in enumerate(zip(points, points[1:])):
+            if start == end:
+                continue
+            if start[0] == end[0] or start[1] == end[1]:
+                along_x = start[1] == end[1]
+                line = catalog.index(structure, LINE.format(height=height), ACROSS if along_x else ALONG)
+                # Na złączeniach nawierzchnia zachodzi na kwadrat zakrętu, a linie kończą się przed nim
+                _lay_axis_segment(grid, start, end, columns, surface, line, distance,
+                                  extend=(half if i > 0 else 0, half if i < last else 0),
+                                  unmarked=(half + 1 if i > 0 else 0, half + 1 if i < last else 0))
+            else:
+                _lay_free_segment(grid, start, end, half, surface)
+            distance += max(abs(end[0] - start[0]), abs(end[1] - start[1]))
+    return structure, (x0, z0)
+
+
+# ===== PROSTOKĄTY =====
+
+def _merged_runs(mask) -> List[Rectangle]:
+    """Runs of cells along z in every x row, runs with the same extent in consecutive rows merged (vectorized)"""
+    padded = np.zeros((mask.shape[0], mask.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    # nonzero zwraca kolejne wiersze po kolei, więc początki i końce odcinków łączą się parami
+    x, z0 = np.nonzero(edges == 1)
+    z1 = np.nonzero(edges == -1)[1] - 1
+    order = np.lexsort((x, z1, z0))
+    x, z0, z1 = x[order], z0[order], z1[order]
+    first = np.ones(x.size, dtype=bool)
+    first[1:] = (z0[1:] != z0[:-1]) | (z1[1:] != z1[:-1]) | (x[1:] != x[:-1] + 1)
+    starts = np.flatnonzero(first)
+    ends = np.append(starts[1:], x.size) - 1
+    return list(zip(x[starts].tolist(), z0[starts].tolist(), x[ends].tolist(), z1[ends].tolist()))
+
+
+def rectangles(mask) -> List[Rectangle]:
+    """Disjoint rectangles covering the (x, z) mask, from the scan order giving fewer of them"""
+    by_z = _merged_runs(mask)
+    by_x = [(x0, z0, x1, z1) for z0, x0, z1, x1 in _merged_runs(mask.T)]
+    return by_z if len(by_z) <= len(by_x) else by_x
+
+
+def split_rectangle(rectangle: Rectangle, max_volume: int = MAX_FILL_VOLUME) -> List[Rectangle]:
+    """Split a rectangle along its longer side into parts of at most max_volume blocks"""
+    x0, z0, x1, z1 = rectangle
+    size_x, size_z = x1 - x0 + 1, z1 - z0 + 1
+    if size_x * size_z <= max_volume:
+        return [rectangle]
+    if size_x >= size_z:
+        step = max(max_volume // size_z, 1)
+        return [(x, z0, min(x + step - 1, x1), z1) for x in range(x0, x1 + 1, step)]
+    step = max(max_volume // size_x, 1)
+    return [(x0, z, x1, min(z + step - 1, z1)) for z in range(z0, z1 + 1, step)]
+
+
+def paint_plan(grid) -> List[Tuple[int, List[Rectangle]]]:
+    """(palette index, rectangles) in painting order with the fewest rectangles in total
+
+    The most common block may be painted under the whole road first, when covering its own cells only would
+    need more rectangles than that; the other blocks then overwrite it.
+    """
+    placed = grid != VOID
+    if not placed.any():
+        return []
+    counts = np.bincount(grid[placed])
+    background = int(counts.argmax())
+    others = [(int(index), rectangles(grid == index)) for index in np.flatnonzero(counts) if index != background]
+    under_all = rectangles(placed)
+    own = rectangles(grid == background)
+    if len(under_all) < len(own):
+        return [(background, under_all)] + others
+    return [(background, own)] + others
+
+
+# ===== POLECENIA =====
+
+def block_argument(block) -> str:
+    """Block with states in command syntax, e.g. jct:x ["minecraft:cardinal_direction"="north"]"""
+    name, states = block
+    if not states:
+        return name
+    values = []
+    for key, value in states:
+        if isinstance(value, bool):
+            value = 'true' if value else 'false'
+        elif isinstance(value, str):
+            value = f'"{value}"'
+        values.append(f'"{key}"={value}')
+    return f"{name} [{','.join(values)}]"
+
+
+def _coordinate(value: int, relative: bool) -> str:
+    if not relative:
+        return str(value)
+    return f"~{value}" if value else "~"
+
+
+def layer_commands(structure: Structure, origin: Tuple[int, int], y: int, relative: bool = False) -> List[str]:
+    """/fill and /setblock commands building the single-layer structure at height y"""
+    ox, oz = origin
+    commands = []
+    for index, layer_rectangles in paint_plan(structure.blocks[:, 0, :]):
+        block = block_argument(structure.palette[index])
+        for rectangle in layer_rectangles:
+            for x0, z0, x1, z1 in split_rectangle(rectangle):
+                start = ' '.join(_coordinate(v, relative) for v in (ox + x0, y, oz + z0))
+                if (x0, z0) == (x1, z1):
+                    commands.append(f"setblock {start} {block}")
+                else:
+                    end = ' '.join(_coordinate(v, relative) for v in (ox + x1, y, oz + z1))
+                    commands.append(f"fill {start} {end} {block}")
+    return commands
+
+
+def plan_commands(plan: Dict[str, Any], catalog: BlockCatalog, relative: bool = False) -> Tuple[List[str], int]:
+    """Commands of the road plan (roads grouped by their y level) and the number of road cells"""
+    height = plan.get('height', DEFAULT_HEIGHT)
+    levels: Dict[int, List[Dict[str, Any]]] = {}
+    for road in plan['roads']:
+        levels.setdefault(road.get('y', plan.get('y', 0)), []).append(road)
+    commands = []
+    cells = 0
+    for y, roads in sorted(levels.items()):
+        with Profiler.stage("voxelize"):
+            structure, origin = voxelize(roads, catalog, height)
+        with Profiler.stage("rectangles"):
+            commands.extend(layer_commands(structure, origin, y, relative))
+        cells += int(np.count_nonzero(structure.blocks != VOID))
+    return commands, cells
+
+
+def write_functions(name: str, commands: List[str], output_dir: str = OUTPUT_DIR) -> List[str]:
+    """Write name.mcfunction (split into parts called from it above MAX_FUNCTION_COMMANDS) and return file paths"""
+    os.makedirs(output_dir, exist_ok=True)
+    header = f"# Generated by road_functions.py ({len(commands)} commands)\n"
+    if len(commands) <= MAX_FUNCTION_COMMANDS:
+        chunks = {name: commands}
+        main_commands = None
+    else:
+        chunks = {f"{name}_part{number + 1}": commands[start:start + MAX_FUNCTION_COMMANDS]
+                  for number, start in enumerate(range(0, len(commands), MAX_FUNCTION_COMMANDS))}
+        function_dir = os.path.relpath(output_dir, FUNCTIONS_DIR).replace(os.sep, '/')
+        prefix = '' if function_dir == '.' or function_dir.startswith('..') else function_dir + '/'
+        main_commands = [f"function {prefix}{part}" for part in chunks]
+    file_paths = []
+    for chunk_name, chunk in chunks.items():
+        file_paths.append(os.path.join(output_dir, chunk_name + FUNCTION_EXTENSION))
+        with open(file_paths[-1], 'w', encoding='utf-8') as f:
+            f.write(header + '\n'.join(chunk) + '\n')
+    if main_commands:
+        file_paths.insert(0, os.path.join(output_dir, name + FUNCTION_EXTENSION))
+        with open(file_paths[0], 'w', encoding='utf-8') as f:
+            f.write(header + '\n'.join(main_commands) + '\n')
+    return file_paths
+
+
+def _points(value: str) -> List[List[int]]:
+    return [[int(coordinate) for coordinate in point.split(',')] for point in value.split()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate .mcfunction files laying roads with /fill and /setblock",
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog="""
+plan file:
+  {"name": "main_street", "y": 64, "height": 16,
+   "roads": [{"points": [[0, 0], [0, 120], [80, 120]], "lanes": 2, "separator": "dashed", "center": "solid"}]}
+
+examples:
+  python3 road_functions.py road_plan.json
+  python3 road_functions.py --points "0,0 0,120 80,120" --lanes 4 --y 64 --name main_street
+  /function roads/main_street   (in game)
+""")
+    parser.add_argument("plan", nargs='?', help="JSON road plan")
+    parser.add_argument("--points", type=_points, help='single road polyline "x,z x,z ..." instead of a plan')
+    parser.add_argument("--lanes", type=int, default=2, help="lane count of --points road (default: 2)")
+    parser.add_argument("--one-way", action='store_true', help="--points road without a center line")
+    parser.add_argument("--separator", default='dashed', choices=list(MARKING_PATTERNS),
+                        help="line between lanes of one direction (default: dashed)")
+    parser.add_argument("--center", default='solid', choices=list(MARKING_PATTERNS),
+                        help="line between directions (default: solid)")
+    parser.add_argument("--y", type=int, default=0, help="road level of --points road (default: 0)")
+    parser.add_argument("--height", type=int, default=DEFAULT_HEIGHT,
+                        help=f"surface block height 1-16 (default: {DEFAULT_HEIGHT})")
+    parser.add_argument("--name", help="function name (default: plan name or file name)")
+    parser.add_argument("--relative", action='store_true', help="coordinates relative to the executing position")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help=f"functions directory (default: {OUTPUT_DIR})")
+    args = parser.parse_args(argv)
+
+    if args.plan:
+        plan = JsonBackend.load_file(args.plan)
+        name = args.name or plan.get('name') or os.path.splitext(os.path.basename(args.plan))[0]
+    elif args.points:
+        plan = {'y': args.y, 'height': args.height, 'roads': [{
+            'points': args.points, 'lanes': args.lanes, 'two_way': not args.one_way,
+            'separator': args.separator, 'center': args.center}]}
+        name = args.name or 'road'
+    else:
+        parser.error("give a plan file or --points")
+
+    ConsoleStyle.print_section(f"Generating road function [{name}]", "=", "🛣️")
+    start = time.perf_counter()
+    try:
+        commands, cells = plan_commands(plan, BlockCatalog.load(), args.relative)
+    except (KeyError, ValueError) as e:
+        print(ConsoleStyle.error(f"Invalid road plan: {e}"))
+        sys.exit(1)
+    file_paths = write_functions(name, commands, args.output_dir)
+    for file_path in file_paths:
+        print(ConsoleStyle.success(f"Written [{file_path}]"))
+    fills = sum(1 for command in commands if command.startswith('fill'))
+    ConsoleStyle.print_stats({
+        ConsoleStyle.info("Road blocks"): f"[{cells}]",
+        ConsoleStyle.info("Commands"): f"[{len(commands)}] ({fills} fill, {len(commands) - fills} setblock)",
+        ConsoleStyle.info("Blocks per command"): f"[{cells / max(len(commands), 1):.1f}]",
+        ConsoleStyle.info("Function files"): f"[{len(file_paths)}]",
+        ConsoleStyle.info("Time"): f"[{time.perf_counter() - start:.3f}] s",
+    }, "ROAD FUNCTION", icon="🛣️")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Generator prefabrykatów dróg (.mcstructure) z bloków dodatku: odcinki proste, skrzyżowania, rampy i przejścia dla pieszych
+
+Prefabrykaty są budowane w jednej orientacji (droga wzdłuż osi z) i trafiają do BP/structures/<namespace>/,
+skąd można je wczytać poleceniem `/structure load <namespace>:<nazwa> ~ ~ ~ [obrót]`.
+"""
+import argparse
+import fnmatch
+import os
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+from console_utils import ConsoleStyle, Profiler
+from json_utils import JsonBackend
+from minecraft_structure import CARDINAL_STATE, STRUCTURE_EXTENSION, Structure, np
+from scan_utils import scan_files
+
+OUTPUT_DIR = 'BP/structures'
+DEFAULT_LANES = [2, 4]
+LANE_WIDTH = 3
+SEGMENT_LENGTH = 16
+ARM_LENGTH = 6
+ZEBRA_DEPTH = 4
+
+# Wzorce linii wzdłuż drogi, powtarzane co len(wzorca) bloków (True = blok z linią)
+MARKING_PATTERNS = {
+    'solid': (True,),
+    'dashed': (True, True, False, False),
+    'none': (False,),
+}
+
+SURFACE = 'base_road_16'
+LINE = 'road_marking_straight_16'
+STOP_LINE = 'road_marking_stop_16'
+ZEBRA_EDGE = 'road_zebra_crossing_edge_16'
+ZEBRA_MIDDLE = 'road_zebra_crossing_middle_16'
+RAMP = 'base_road_ramp_{angle}_part{part}'
+RAMP_LINE = 'road_ramp_marking_straight_{angle}_part{part}'
+
+# cardinal_direction: linie wzdłuż drogi (oś z), linie w poprzek (oś x), rampy wznoszące się ku +z
+ALONG = 'north'
+ACROSS = 'east'
+ASCENDING = 'south'
+
+
+class BlockCatalog:
+    """Block identifiers of the pack with their placement states (read from BP/blocks)"""
+
+    def __init__(self, namespace: str, states: Dict[str, Set[str]]):
+        self.namespace = namespace
+        self.states = states
+
+    @classmethod
+    def load(cls) -> 'BlockCatalog':
+        namespace = JsonBackend.load_file('config.json').get('namespace', '') if os.path.isfile('config.json') else ''
+        states = {}
+        for file_path in scan_files('BP/blocks', '.block.json'):
+            description = JsonBackend.load_file(file_path).get('minecraft:block', {}).get('description', {})
+            enabled = set()
+            for trait in description.get('traits', {}).values():
+                enabled.update(trait.get('enabled_states', []))
+            states[description.get('identifier', '')] = enabled
+        return cls(namespace, states)
+
+    def identifier(self, name: str) -> str:
+        return f"{self.namespace}:{name}" if self.namespace else name
+
+    def index(self, structure: Structure, name: str, direction: str = ALONG) -> int:
+        """Palette index of the block (oriented when it has the cardinal_direction placement state)"""
+        identifier = self.identifier(name)
+        if identifier not in self.states:
+            raise ValueError(f"Block [{identifier}] does not exist in BP/blocks")
+        states = {CARDINAL_STATE: direction} if CARDINAL_STATE in self.states[identifier] else {}
+        return structure.block(identifier, states)
+
+    def ramp_angles(self) -> Dict[str, int]:
+        """Angle family of straight ramps (e.g. 22_5) -> number of parts"""
+        pattern = re.compile(rf'^{re.escape(self.identifier(""))}base_road_ramp_(.+)_part(\d+)$')
+        angles: Dict[str, int] = {}
+        for identifier in self.states:
+            match = pattern.match(identifier)
+            if match:
+                angles[match.group(1)] = max(angles.get(match.group(1), 0), int(match.group(2)))
+        # Od najłagodniejszej rampy (najwięcej części)
+        return dict(sorted(angles.items(), key=lambda item: -item[1]))
+
+
+def cross_section(lanes: int, two_way: bool = True, separator: str = 'dashed',
+                  center: str = 'solid') -> List[Optional[str]]:
+    """Marking pattern of every column across the road (None = lane surface), lanes separated by line columns"""
+    if lanes < 1:
+        raise ValueError("Road needs at least one lane")
+    for pattern in (separator, center):
+        if pattern not in MARKING_PATTERNS:
+            raise ValueError(f"Unknown marking pattern [{pattern}], available: {', '.join(MARKING_PATTERNS)}")
+    columns: List[Optional[str]] = []
+    for lane in range(lanes):
+        if lane:
+            columns.append(center if two_way and lane == lanes // 2 else separator)
+        columns.extend([None] * LANE_WIDTH)
+    return columns
+
+
+def pattern_mask(pattern: str, start: int, length: int):
+    """Boolean array telling which of length consecutive blocks (from position start) carry the line"""
+    values = np.array(MARKING_PATTERNS[pattern], dtype=bool)
+    return values[(np.arange(start, start + length)) % len(values)]
+
+
+def _lay_rows(structure: Structure, columns: List[Optional[str]], surface: int, line: int,
+              z0: int, z1: int, y: int = 0):
+    """Fill rows z0..z1 (inclusive) at height y with the cross-section (vectorized along the road)"""
+    length = z1 - z0 + 1
+    for x, pattern in enumerate(columns):
+        if pattern is None:
+            structure.blocks[x, y, z0:z1 + 1] = surface
+        else:
+            structure.blocks[x, y, z0:z1 + 1] = np.where(pattern_mask(pattern, z0, length), line, surface)
+
+
+def straight(catalog: BlockCatalog, lanes: int = 2, length: int = SEGMENT_LENGTH, two_way: bool = True,
+             separator: str = 'dashed', center: str = 'solid') -> Structure:
+    columns = cross_section(lanes, two_way, separator, center)
+    structure = Structure(len(columns), 1, length)
+    _lay_rows(structure, columns, catalog.index(structure, SURFACE), catalog.index(structure, LINE, ALONG),
+              0, length - 1)
+    return structure
+
+
+def crosswalk(catalog: BlockCatalog, lanes: int = 2, length: int = SEGMENT_LENGTH, two_way: bool = True) -> Structure:
+    """Straight segment with a zebra crossing of ZEBRA_DEPTH rows in the middle"""
+    structure = straight(catalog, lanes, length, two_way, separator='solid')
+    width = structure.size[0]
+    z0 = (length - ZEBRA_DEPTH) // 2
+    z1 = z0 + ZEBRA_DEPTH - 1
+    structure.fill(catalog.index(structure, ZEBRA_MIDDLE, ALONG), 1, 0, z0, width - 2, 0, z1)
+    structure.fill(catalog.index(structure, ZEBRA_EDGE, 'west'), 0, 0, z0, 0, 0, z1)
+    structure.fill(catalog.index(structure, ZEBRA_EDGE, 'east'), width - 1, 0, z0, width - 1, 0, z1)
+    return structure
+
+
+def intersection(catalog: BlockCatalog, lanes: int = 2, arm: int = ARM_LENGTH, two_way: bool = True) -> Structure:
+    """Four-way intersection: plain square with arms ending in stop lines on incoming (right-hand) lanes"""
+    north_arm = straight(catalog, lanes, arm, two_way, separator='solid')
+    columns = cross_section(lanes, two_way)
+    width = len(columns)
+    # Ruch prawostronny: pojazdy jadące na południe (+z) zajmują pasy na zachód od linii środkowej (mniejsze x)
+    center_x = (lanes // 2) * (LANE_WIDTH + 1) - 1
+    incoming = [x for x in range(width) if not two_way or lanes < 2 or x < center_x]
+    stop_line = catalog.index(north_arm, STOP_LINE, ACROSS)
+    north_arm.blocks[incoming, 0, arm - 1] = stop_line
+
+    size = width + 2 * arm
+    structure = Structure(size, 1, size)
+    structure.fill(catalog.index(structure, SURFACE), arm, 0, arm, arm + width - 1, 0, arm + width - 1)
+    structure.paste(north_arm, arm, 0, 0)
+    structure.paste(north_arm.rotated(1), arm + width, 0, arm)
+    structure.paste(north_arm.rotated(2), arm, 0, arm + width)
+    structure.paste(north_arm.rotated(3), 0, 0, arm)
+    return structure
+
+
+def ramp(catalog: BlockCatalog, angle: str, lanes: int = 2, rise: int = 1, two_way: bool = True,
+         separator: str = 'dashed', center: str = 'solid', marked: bool = True) -> Structure:
+    """Straight ramp of the angle family rising by rise blocks towards +z, with an embankment below upper levels"""
+    parts = catalog.ramp_angles().get(angle)
+    if not parts:
+        raise ValueError(f"No ramp parts for angle [{angle}], available: {', '.join(catalog.ramp_angles())}")
+    columns = cross_section(lanes, two_way, separator, center)
+    structure = Structure(len(columns), rise, rise * parts)
+    embankment = catalog.index(structure, SURFACE) if rise > 1 else None
+    for part in range(1, parts + 1):
+        surface = catalog.index(structure, RAMP.format(angle=angle, part=part), ASCENDING)
+        line = catalog.index(structure, RAMP_LINE.format(angle=angle, part=part), ASCENDING) if marked else surface
+        for level in range(rise):
+            z = level * parts + part - 1
+            _lay_rows(structure, columns, surface, line, z, z, level)
+            if level:
+                structure.blocks[:, :level, z] = embankment
+    return structure
+
+
+def default_prefabs(catalog: BlockCatalog, lane_counts: List[int]) -> Dict[str, Callable[[], Structure]]:
+    """Prefab name -> builder for straight segments, intersections, crosswalks and ramps of every angle family"""
+    prefabs: Dict[str, Callable[[], Structure]] = {}
+    for lanes in lane_counts:
+        prefabs[f"road_straight_{lanes}_lanes"] = lambda lanes=lanes: straight(catalog, lanes)
+        prefabs[f"road_intersection_{lanes}_lanes"] = lambda lanes=lanes: intersection(catalog, lanes)
+        prefabs[f"road_crosswalk_{lanes}_lanes"] = lambda lanes=lanes: crosswalk(catalog, lanes)
+        for angle in catalog.ramp_angles():
+            prefabs[f"road_ramp_{angle}_{lanes}_lanes"] = lambda lanes=lanes, angle=angle: ramp(catalog, angle, lanes)
+    return prefabs
+
+
+def generate(output_dir: str = OUTPUT_DIR, lane_counts: Optional[List[int]] = None, only: Optional[str] = None):
+    """Write prefabs to output_dir/<namespace>/ and return {name: (size, placed blocks, bytes)}"""
+    catalog = BlockCatalog.load()
+    target_dir = os.path.join(output_dir, catalog.namespace) if catalog.namespace else output_dir
+    os.makedirs(target_dir, exist_ok=True)
+    results = {}
+    for name, builder in default_prefabs(catalog, lane_counts or DEFAULT_LANES).items():
+        if only and not fnmatch.fnmatch(name, only):
+            continue
+        with Profiler.stage(f"prefab {name}"):
+            structure = builder()
+            written = structure.save(os.path.join(target_dir, name + STRUCTURE_EXTENSION))
+        results[name] = (structure.size, int(np.count_nonzero(structure.blocks >= 0)), written)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate road prefab structures (.mcstructure) from pack blocks",
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog="""
+examples:
+  python3 road_prefabs.py
+  python3 road_prefabs.py --lanes 2,4,6 --only "road_ramp_*"
+  /structure load jct:road_intersection_2_lanes ~ ~-1 ~ 90_degrees   (in game)
+""")
+    parser.add_argument("--lanes", type=lambda x: [int(v) for v in x.split(',')], default=DEFAULT_LANES,
+                        help=f"comma separated lane counts (default: {','.join(map(str, DEFAULT_LANES))})")
+    parser.add_argument("--only", metavar='PATTERN', help="generate only prefabs matching the glob pattern")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help=f"structures directory (default: {OUTPUT_DIR})")
+    args = parser.parse_args(argv)
+
+    ConsoleStyle.print_section("Generating road prefabs", "=", "🏗️")
+    start = time.perf_counter()
+    try:
+        results = generate(args.output_dir, args.lanes, args.only)
+    except ValueError as e:
+        print(ConsoleStyle.error(str(e)))
+        sys.exit(1)
+    for name, (size, placed, written) in results.items():
+        print(ConsoleStyle.success(f"[{name}] {size[0]}x{size[1]}x{size[2]}, [{placed}] blocks, "
+                                   f"[{written / 1024:.1f}] KB"))
+    ConsoleStyle.print_stats({
+        ConsoleStyle.info("Prefabs"): f"[{len(results)}]",
+        ConsoleStyle.info("Blocks"): f"[{sum(placed for _, placed, _ in results.values())}]",
+        ConsoleStyle.info("Size"): f"[{sum(written for _, _, written in results.values()) / 1024:.1f}] KB",
+        ConsoleStyle.info("Time"): f"[{time.perf_counter() - start:.3f}] s",
+    }, "ROAD PREFABS", icon="🛣️")
+
+
+if __name__ == "__main__":
+    main()
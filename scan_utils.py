@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Biblioteka ze wspólnym skanerem plików projektu (os.scandir, reguły .gitignore/.mcignore, pamięć podręczna listingów katalogów)
+"""
+import os
+import re
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Katalogi i pliki pomijane zawsze, także bez plików z regułami
+IGNORED_DIRS = {'.git', '.idea', '__pycache__', 'venv', '.venv', 'dist'}
+IGNORED_FILES = {'.DS_Store'}
+# Pliki z regułami w składni .gitignore (.mcignore — pliki śledzone w repozytorium, ale pomijane przez narzędzia)
+IGNORE_FILES = ('.gitignore', '.mcignore')
+# Listing katalogu zmienionego w tym oknie przed odczytem nie jest zapamiętywany (jak "racy git")
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def _translate(pattern: str) -> str:
+    """Regex of a gitignore glob (`*`, `?`, `[...]`, `**/`, `/**`, `/**/`)"""
+    regex = ''
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            regex += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('**', i):
+            regex += '.*'
+            i += 2
+        elif pattern[i] == '*':
+            regex += '[^/]*'
+            i += 1
+        elif pattern[i] == '?':
+            regex += '[^/]'
+            i += 1
+        elif pattern[i] == '[' and pattern.find(']', i + 2) != -1:
+            end = pattern.find(']', i + 2)
+            group = pattern[i + 1:end].replace('\\', '\\\\')
+            regex += '[' + ('^' + group[1:] if group[0] in '!^' else group) + ']'
+            i = end + 1
+        elif pattern[i] == '\\' and i + 1 < len(pattern):
+            regex += re.escape(pattern[i + 1])
+            i += 2
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return regex
+
+
+class IgnoreRule:
+    """Single .gitignore line scoped to the directory of its file"""
+
+    def __init__(self, pattern: str):
+        self.negate = pattern.startswith('!')
+        if self.negate:
+            pattern = pattern[1:]
+        self.dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        # Wzorzec ze znakiem '/' (poza końcowym) dotyczy ścieżki względem katalogu pliku, bez niego — samej nazwy
+        self.anchored = '/' in pattern
+        self.regex = re.compile(_translate(pattern.lstrip('/')) + r'\Z')
+
+    def matches(self, relative_path: str, name: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        return bool(self.regex.match(relative_path if self.anchored else name))
+
+
+def parse_ignore_file(content: str) -> List[IgnoreRule]:
+    rules = []
+    for line in content.splitlines():
+        line = line.rstrip()
+        if line.endswith('\\'):
+            line += ' '
+        if not line or line.startswith('#') or line in ('/', '!'):
+            continue
+        rules.append(IgnoreRule(line))
+    return rules
+
+
+class ProjectScanner:
+    """Scanner of project directories pruning ignored directories before descending into them
+
+    Directory listings are cached and reused while the directory mtime is unchanged, so repeated scans by
+    the builder and the verifiers only stat directories.
+    """
+
+    _shared: Dict[str, 'ProjectScanner'] = {}
+
+    def __init__(self, root: str = '.'):
+        self.root = root
+        # katalog -> (mtime w ns, [(nazwa, czy katalog, DirEntry)])
+        self._listings: Dict[str, Tuple[int, List[Tuple[str, bool, os.DirEntry]]]] = {}
+        # plik z regułami -> (mtime w ns, reguły)
+        self._rules: Dict[str, Tuple[int, List[IgnoreRule]]] = {}
+
+    @classmethod
+    def shared(cls) -> 'ProjectScanner':
+        """Scanner of the current working directory shared by all scripts of the process"""
+        cwd = os.getcwd()
+        if cwd not in cls._shared:
+            cls._shared[cwd] = cls()
+        return cls._shared[cwd]
+
+    def _path(self, directory: str) -> str:
+        return os.path.join(self.root, directory) if directory else self.root
+
+    def _listing(self, directory: str) -> List[Tuple[str, bool, os.DirEntry]]:
+        """Entries of the directory (relative to root), from cache when its mtime did not change"""
+        path = self._path(directory)
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._listings.get(directory)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        listed_at = time.time_ns()
+        with os.scandir(path) as it:
+            entries = sorted((entry.name, entry.is_dir(), entry) for entry in it)
+        if mtime < listed_at - RACY_WINDOW_NS:
+            self._listings[directory] = (mtime, entries)
+        return entries
+
+    def _directory_rules(self, directory: str, names) -> List[IgnoreRule]:
+        rules = []
+        for ignore_file in IGNORE_FILES:
+            if ignore_file not in names:
+                continue
+            file_path = os.path.join(self._path(directory), ignore_file)
+            mtime = os.stat(file_path).st_mtime_ns
+            cached = self._rules.get(file_path)
+            if not cached or cached[0] != mtime:
+                with open(file_path, encoding='utf-8', errors='replace') as f:
+                    cached = self._rules[file_path] = (mtime, parse_ignore_file(f.read()))
+            rules.extend(cached[1])
+        return rules
+
+    def _scopes(self, directory: str) -> List[Tuple[str, List[IgnoreRule]]]:
+        """Rules of the directory and all its parents up to root, outermost first"""
+        scopes = []
+        parts = directory.split('/') if directory else []
+        for depth in range(len(parts) + 1):
+            scope = '/'.join(parts[:depth])
+            try:
+                names = {name for name, _, _ in self._listing(scope)}
+            except OSError:
+                break
+            rules = self._directory_rules(scope, names)
+            if rules:
+                scopes.append((scope, rules))
+        return scopes
+
+    @staticmethod
+    def _ignored(scopes, path: str, name: str, is_dir: bool) -> bool:
+        if name in (IGNORED_DIRS if is_dir else IGNORED_FILES):
+            return True
+        ignored = False
+        for scope, rules in scopes:
+            relative_path = path[len(scope) + 1:] if scope else path
+            for rule in rules:
+                if rule.negate == ignored and rule.matches(relative_path, name, is_dir):
+                    ignored = not rule.negate
+        return ignored
+
+    def is_ignored(self, path: str) -> bool:
+        """Whether the path (relative to root) or one of its parent directories is ignored"""
+        parts = path.replace(os.sep, '/').strip('/').split('/')
+        for depth in range(1, len(parts) + 1):
+            current = '/'.join(parts[:depth])
+            is_dir = depth < len(parts) or os.path.isdir(self._path(current))
+            if self._ignored(self._scopes('/'.join(parts[:depth - 1])), current, parts[depth - 1], is_dir):
+                return True
+        return False
+
+    def walk(self, top: str = '') -> Iterator[Tuple[str, List[str], List[str]]]:
+        """Like os.walk (top-down, '/' separators) without ignored directories and files"""
+        top = os.path.normpath(top or '.').replace(os.sep, '/')
+        top = '' if top == '.' else top
+        if not os.path.isdir(self._path(top)):
+            return
+        stack = [(top, self._scopes(top))]
+        while stack:
+            directory, scopes = stack.pop()
+            try:
+                entries = self._listing(directory)
+            except OSError:
+                continue
+            rules = self._directory_rules(directory, {name for name, _, _ in entries}) if directory != top else []
+            if rules:
+                scopes = scopes + [(directory, rules)]
+            dirs, files = [], []
+            for name, is_dir, entry in entries:
+                path = f"{directory}/{name}" if directory else name
+                if not self._ignored(scopes, path, name, is_dir):
+                    (dirs if is_dir else files).append(name)
+            yield directory or '.', dirs, files
+            # Katalogi usunięte z dirs przez wywołującego nie są odwiedzane (jak w os.walk)
+            stack.extend((f"{directory}/{name}" if directory else name, scopes) for name in reversed(dirs))
+
+    def files(self, top: str = '', suffix: Optional[str] = None) -> List[str]:
+        """Sorted paths of not ignored files under top (optionally only with the suffix)"""
+        found = []
+        for directory, dirs, files in self.walk(top):
+            prefix = '' if directory == '.' else directory + '/'
+            found.extend(prefix + file for file in files if suffix is None or file.endswith(suffix))
+        return sorted(found)
+
+    def stat(self, path: str) -> os.stat_result:
+        """Fresh stat result of a scanned file
+
+        Not cached: writing a file changes its own mtime and size, but not the mtime of its directory,
+        so a stat kept with the directory listing would go stale.
+        """
+        return os.stat(self._path(path.replace(os.sep, '/')))
+
+
+def scan_files(top: str, suffix: Optional[str] = None) -> List[str]:
+    """Sorted not ignored files under top of the current project (shared scanner)"""
+    return ProjectScanner.shared().files(top, suffix)
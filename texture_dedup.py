@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Biblioteka wyszukująca tekstury bloków będące obrotem lub odbiciem innej tekstury (hash pikseli)
+i przepinająca bloki na jedną teksturę z odbiciem UV lub obrotem minecraft:transformation
+"""
+import argparse
+import copy
+import hashlib
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from console_utils import ConsoleStyle
+from import_utils import lazy_import
+from json_utils import JsonBackend
+from scan_utils import scan_files
+
+np = lazy_import('numpy')
+
+TEXTURES_DIR = 'RP/textures'
+TERRAIN_TEXTURE_FILE = 'RP/textures/terrain_texture.json'
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+FACES = ('north', 'south', 'east', 'west', 'up', 'down')
+# Obrót bloku wokół osi Y (transformation) działa tylko na teksturę górnej ściany bez zmiany pozostałych
+ROTATABLE_FACE = 'up'
+# Liczba kanałów dla typu koloru PNG: szarość, RGB, paleta, szarość+alfa, RGBA
+CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+# ===== PNG =====
+
+def _paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def _unfilter(raw: bytes, height: int, stride: int, bpp: int) -> bytes:
+    """Reverse PNG scanline filters (Sub/Up vectorized, Average/Paeth byte by byte)"""
+    rows = []
+    previous = np.zeros(stride, dtype=np.uint8)
+    for y in range(height):
+        start = y * (stride + 1)
+        kind = raw[start]
+        line = np.frombuffer(raw, np.uint8, stride, start + 1)
+        if kind == 0:
+            line = line.copy()
+        elif kind == 1:
+            padded = np.zeros((stride + bpp - 1) // bpp * bpp, dtype=np.uint8)
+            padded[:stride] = line
+            line = np.cumsum(padded.reshape(-1, bpp), axis=0, dtype=np.uint8).ravel()[:stride]
+        elif kind == 2:
+            line = line + previous
+        elif kind in (3, 4):
+            line = bytearray(line.tobytes())
+            up = previous.tolist()
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                if kind == 3:
+                    line[i] = (line[i] + (left + up[i]) // 2) & 0xff
+                else:
+                    line[i] = (line[i] + _paeth(left, up[i], up[i - bpp] if i >= bpp else 0)) & 0xff
+            line = np.frombuffer(bytes(line), np.uint8)
+        else:
+            raise ValueError(f"Unknown PNG filter [{kind}] in row [{y}]")
+        rows.append(line)
+        previous = line
+    return b''.join(row.tobytes() for row in rows)
+
+
+def decode_png(data: bytes):
+    """Decode a non-interlaced PNG into a (height, width, 4) uint16 RGBA array (8-bit values scaled to 16-bit)"""
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("Not a PNG file")
+    position = len(PNG_SIGNATURE)
+    chunks: Dict[bytes, bytes] = {}
+    idat = []
+    while position + 8 <= len(data):
+        length, tag = struct.unpack_from('>I4s', data, position)
+        content = data[position + 8:position + 8 + length]
+        position += length + 12
+        if tag == b'IDAT':
+            idat.append(content)
+        else:
+            chunks.setdefault(tag, content)
+        if tag == b'IEND':
+            break
+    width, height, depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', chunks[b'IHDR'])
+    if interlace:
+        raise ValueError("Interlaced PNG is not supported")
+    if color_type not in CHANNELS:
+        raise ValueError(f"Unknown PNG color type [{color_type}]")
+    channels = CHANNELS[color_type]
+    stride = (width * channels * depth + 7) // 8
+    raw = _unfilter(zlib.decompress(b''.join(idat)), height, stride, max(1, channels * depth // 8))
+    rows = np.frombuffer(raw, np.uint8).reshape(height, stride)
+
+    if depth == 16:
+        samples = rows.view('>u2').reshape(height, width, channels).astype(np.uint16)
+    elif depth == 8:
+        samples = rows.reshape(height, width, channels).astype(np.uint16)
+    else:
+        bits = np.unpackbits(rows, axis=1).reshape(height, -1, depth)[:, :width]
+        samples = (bits * (1 << np.arange(depth - 1, -1, -1))).sum(axis=2).astype(np.uint16)[..., None]
+
+    transparency = chunks.get(b'tRNS')
+    if color_type == 3:
+        palette = np.frombuffer(chunks[b'PLTE'], np.uint8).reshape(-1, 3).astype(np.uint16) * 257
+        alpha = np.full(len(palette), 0xffff, dtype=np.uint16)
+        if transparency:
+            alpha[:len(transparency)] = np.frombuffer(transparency, np.uint8).astype(np.uint16) * 257
+        indices = samples[..., 0]
+        return np.dstack((palette[indices], alpha[indices]))
+
+    if depth < 16:
+        # Skalowanie do 16 bitów: 8-bit * 257, 1/2/4-bit proporcjonalnie do maksimum
+        samples = samples * (0xffff // ((1 << depth) - 1))
+    color = samples[..., :channels - (color_type in (4, 6))]
+    if color.shape[2] == 1:
+        color = np.repeat(color, 3, axis=2)
+    if color_type in (4, 6):
+        alpha = samples[..., -1]
+    else:
+        alpha = np.full((height, width), 0xffff, dtype=np.uint16)
+        if transparency:
+            # tRNS dla szarości/RGB wskazuje jeden w pełni przezroczysty kolor
+            key = np.frombuffer(transparency, '>u2').astype(np.uint16) * (0xffff // ((1 << depth) - 1))
+            alpha[(samples[..., :len(key)] == key).all(axis=2)] = 0
+    return np.dstack((color, alpha)).astype(np.uint16)
+
+
+# ===== DOPASOWANIA =====
+
+def transformed(pixels, turns: int, mirror: bool):
+    """Image rotated counterclockwise by turns * 90° and then mirrored left-right (u axis) when mirror"""
+    result = np.rot90(pixels, turns)
+    return result[:, ::-1] if mirror else result
+
+
+def _digest(pixels) -> bytes:
+    pixels = np.ascontiguousarray(pixels)
+    return hashlib.blake2b(struct.pack('<II', *pixels.shape[:2]) + pixels.tobytes(), digest_size=16).digest()
+
+
+@dataclass(frozen=True)
+class TextureMatch:
+    """Texture file equal to another texture file after rotation and/or mirroring"""
+    path: str
+    source: str
+    turns: int
+    mirror: bool
+    size: int
+    pixels: int
+
+    def transform(self) -> str:
+        parts = [f"rotate {self.turns * 90}° counterclockwise"] if self.turns else []
+        if self.mirror:
+            parts.append("mirror u")
+        return ' + '.join(parts) or "identical"
+
+    def message(self) -> str:
+        return f"[{self.path}] = [{self.source}] {self.transform()}"
+
+
+def find_matches(paths: List[str]) -> Tuple[List[TextureMatch], List[str]]:
+    """Textures that are a rotation/mirror of an earlier texture (sorted order decides the kept one), and errors"""
+    variants: Dict[bytes, Tuple[str, int, bool]] = {}
+    images = {}
+    matches = []
+    errors = []
+    for path in sorted(paths):
+        with open(path, 'rb') as f:
+            data = f.read()
+        try:
+            pixels = decode_png(data)
+        except (ValueError, KeyError, zlib.error) as e:
+            errors.append(f"Cannot decode [{path}]: {e}")
+            continue
+        found = variants.get(_digest(pixels))
+        if found and np.array_equal(transformed(images[found[0]], found[1], found[2]), pixels):
+            matches.append(TextureMatch(path, *found, size=len(data), pixels=pixels.shape[0] * pixels.shape[1]))
+            continue
+        images[path] = pixels
+        # Najprostsze przekształcenie wygrywa: symetryczne tekstury dają ten sam hash dla kilku wariantów
+        for mirror in (False, True):
+            for turns in range(4):
+                variants.setdefault(_digest(transformed(pixels, turns, mirror)), (path, turns, mirror))
+    return matches, errors
+
+
+def terrain_textures(terrain: Dict[str, Any]) -> Dict[str, str]:
+    """Texture id -> PNG path of single-file terrain_texture.json entries"""
+    textures = {}
+    for texture_id, entry in terrain.get('texture_data', {}).items():
+        texture = entry.get('textures') if isinstance(entry, dict) else None
+        if isinstance(texture, str):
+            textures[texture_id] = os.path.join('RP', texture if texture.endswith('.png') else texture + '.png')
+    return textures
+
+
+def check_project() -> Tuple[List[TextureMatch], List[str]]:
+    return find_matches(scan_files(TEXTURES_DIR, '.png'))
+
+
+# ===== PRZEPINANIE BLOKÓW =====
+
+def _geometry_identifier(component: Any) -> Optional[str]:
+    return component.get('identifier') if isinstance(component, dict) else component
+
+
+def _geometries() -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    geometries = {}
+    for file_path in scan_files('RP/models', '.geo.json'):
+        for geometry in JsonBackend.load_file(file_path).get('minecraft:geometry', []):
+            geometries[geometry['description']['identifier']] = (file_path, geometry)
+    return geometries
+
+
+def _face_uvs(geometry: Dict[str, Any], face: str) -> Optional[List[Dict[str, Any]]]:
+    """Per-face UV entries of the face for every cube (None when some cube uses box UV)"""
+    faces = []
+    for bone in geometry.get('bones', []):
+        for cube in bone.get('cubes', []):
+            uv = cube.get('uv')
+            if not isinstance(uv, dict) or face not in uv:
+                return None
+            faces.append(uv[face])
+    return faces
+
+
+def _quarter_symmetric(geometry: Dict[str, Any], turns: int) -> bool:
+    """Whether rotating the geometry by turns * 90° around the block center keeps every cube in place"""
+    for bone in geometry.get('bones', []):
+        for cube in bone.get('cubes', []):
+            (x, _, z), (size_x, _, size_z) = cube['origin'], cube['size']
+            if cube.get('rotation') or x != -size_x / 2 or z != -size_z / 2 or (turns % 2 and size_x != size_z):
+                return False
+    return True
+
+
+def _mirrored_geometry(geometries, identifier: str, face: str) -> Tuple[str, str, Dict[str, Any]]:
+    """Geometry with the face UVs mirrored along u: (identifier, file path, geometry file data)"""
+    file_path, geometry = geometries[identifier]
+    mirrored_id = f"{identifier}_{face}_mirrored"
+    if mirrored_id in geometries:
+        return mirrored_id, geometries[mirrored_id][0], None
+    geometry = copy.deepcopy(geometry)
+    geometry['description']['identifier'] = mirrored_id
+    for uv in _face_uvs(geometry, face):
+        uv['uv'][0] += uv['uv_size'][0]
+        uv['uv_size'][0] = -uv['uv_size'][0]
+    name = mirrored_id.split('.', 1)[-1]
+    data = {'format_version': JsonBackend.load_file(file_path).get('format_version'), 'minecraft:geometry': [geometry]}
+    return mirrored_id, os.path.join(os.path.dirname(file_path), f"{name}.geo.json"), data
+
+
+def _rebind_block(block: Dict[str, Any], face: str, match: TextureMatch, source_id: str,
+                  geometries, created: Dict[str, Dict[str, Any]]) -> Optional[str]:
+    """Point the face instance to the source texture (UV mirror / block rotation), return reason when impossible"""
+    components = block['components']
+    instances = components['minecraft:material_instances']
+    if face not in FACES:
+        return f"instance [{face}] is not a face"
+    if any(value == face for value in instances.values()):
+        return f"instance [{face}] is referenced by other faces"
+    if any('minecraft:geometry' in p.get('components', {}) or 'minecraft:material_instances' in p.get('components', {})
+           for p in block.get('permutations', [])):
+        return "permutations change geometry or material instances"
+    identifier = _geometry_identifier(components.get('minecraft:geometry'))
+    if identifier not in geometries:
+        return f"geometry [{identifier}] not found in RP/models"
+    uvs = _face_uvs(geometries[identifier][1], face)
+    if not uvs:
+        return f"geometry [{identifier}] has no per-face UV for [{face}]"
+    # Zgodność orientacji: lustrzane mapowanie UV odwraca kierunek obrotu tekstury względem obrotu bloku
+    orientations = {(uv['uv_size'][0] > 0) == (uv['uv_size'][1] > 0) for uv in uvs}
+    if match.turns and (face != ROTATABLE_FACE or len(orientations) != 1
+                        or set(instances) - {'*', face}
+                        or not _quarter_symmetric(geometries[identifier][1], match.turns)):
+        return "rotation needs a quarter-symmetric geometry with only this face textured differently"
+
+    if match.mirror:
+        mirrored_id, file_path, data = _mirrored_geometry(geometries, identifier, face)
+        if data:
+            created[file_path] = data
+            geometries[mirrored_id] = (file_path, data['minecraft:geometry'][0])
+        geometry = components['minecraft:geometry']
+        components['minecraft:geometry'] = dict(geometry, identifier=mirrored_id) \
+            if isinstance(geometry, dict) else mirrored_id
+    if match.turns:
+        preserving = orientations.pop() != match.mirror
+        # Obrót Y transformation: dodatni kąt = przeciwnie do wskazówek zegara patrząc z góry
+        offset = match.turns * 90 * (1 if preserving else -1)
+        transformations = [c['minecraft:transformation'] for c in
+                           [components] + [p.get('components', {}) for p in block.get('permutations', [])]
+                           if 'minecraft:transformation' in c]
+        if not transformations:
+            components['minecraft:transformation'] = {'rotation': [0, 0, 0]}
+            transformations = [components['minecraft:transformation']]
+        for transformation in transformations:
+            rotation = transformation.setdefault('rotation', [0, 0, 0])
+            rotation[1] = (rotation[1] + offset) % 360
+    instances[face]['texture'] = source_id
+    return None
+
+
+def reuse(matches: List[TextureMatch]) -> Dict[str, List[str]]:
+    """Rebind blocks to the kept textures, drop fully replaced textures; return rewritten/created/removed/skipped"""
+    terrain = JsonBackend.load_file(TERRAIN_TEXTURE_FILE)
+    textures = terrain_textures(terrain)
+    ids_by_path: Dict[str, List[str]] = {}
+    for texture_id, path in textures.items():
+        ids_by_path.setdefault(path, []).append(texture_id)
+    geometries = _geometries()
+    created: Dict[str, Dict[str, Any]] = {}
+    result = {'rewritten': [], 'created': [], 'removed': [], 'skipped': []}
+    replaced = {}
+    for match in matches:
+        if match.path in ids_by_path and match.source in ids_by_path:
+            for texture_id in ids_by_path[match.path]:
+                replaced[texture_id] = (match, ids_by_path[match.source][0])
+
+    still_used = set()
+    for file_path in scan_files('BP/blocks', '.block.json'):
+        data = JsonBackend.load_file(file_path)
+        block = data.get('minecraft:block', {})
+        instances = block.get('components', {}).get('minecraft:material_instances', {})
+        changed = False
+        for face, instance in list(instances.items()):
+            texture_id = instance.get('texture') if isinstance(instance, dict) else None
+            if texture_id not in replaced:
+                continue
+            match, source_id = replaced[texture_id]
+            attempt = copy.deepcopy(block)
+            reason = _rebind_block(attempt, face, match, source_id, geometries, created)
+            if reason:
+                still_used.add(texture_id)
+                result['skipped'].append(f"[{file_path}] {face}: {reason}")
+                continue
+            block.clear()
+            block.update(attempt)
+            instances = block['components']['minecraft:material_instances']
+            changed = True
+        for permutation in block.get('permutations', []):
+            for instance in permutation.get('components', {}).get('minecraft:material_instances', {}).values():
+                if isinstance(instance, dict) and instance.get('texture') in replaced:
+                    still_used.add(instance['texture'])
+        if changed:
+            JsonBackend.dump_file(file_path, data)
+            result['rewritten'].append(file_path)
+
+    for file_path, data in sorted(created.items()):
+        JsonBackend.dump_file(file_path, data)
+        result['created'].append(file_path)
+    removed_ids = [texture_id for texture_id in replaced if texture_id not in still_used]
+    for texture_id in removed_ids:
+        del terrain['texture_data'][texture_id]
+    if removed_ids:
+        JsonBackend.dump_file(TERRAIN_TEXTURE_FILE, terrain)
+        remaining = set(terrain_textures(terrain).values())
+        for path in sorted({textures[texture_id] for texture_id in removed_ids} - remaining):
+            os.remove(path)
+            result['removed'].append(path)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find block textures that are rotations or mirrors of other textures")
+    parser.add_argument("--apply", action="store_true",
+                        help="rebind blocks to the kept texture (UV mirror / block rotation) and remove duplicates")
+    args = parser.parse_args()
+
+    matches, errors = check_project()
+    for error in errors:
+        print(ConsoleStyle.error(error))
+    for match in matches:
+        print(ConsoleStyle.warning(match.message()))
+    ConsoleStyle.print_stats({
+        ConsoleStyle.info("Duplicate textures"): f"[{len(matches)}]",
+        ConsoleStyle.info("PNG bytes"): f"[{sum(match.size for match in matches)}]",
+        # Atlas tekstur trzyma piksele RGBA (4 bajty) niezależnie od kompresji PNG
+        ConsoleStyle.info("Atlas bytes (RGBA)"): f"[{sum(match.pixels for match in matches) * 4}]",
+    }, "TEXTURE REUSE", icon="🎨")
+    if args.apply and matches:
+        result = reuse(matches)
+        for skipped in result['skipped']:
+            print(ConsoleStyle.warning(f"Skipped {skipped}"))
+        print(ConsoleStyle.success(f"Rewritten [{len(result['rewritten'])}] blocks, created "
+                                   f"[{len(result['created'])}] geometries, removed [{len(result['removed'])}] PNG files"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Biblioteka z modelem wyników weryfikacji (JSON / JUnit XML)
+"""
+import json
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from console_utils import Profiler
+
+SEVERITY_ERROR = 'error'
+SEVERITY_WARNING = 'warning'
+
+
+@dataclass
+class Finding:
+    """Single problem reported by a check (file is the project path the check was handling, if any)"""
+    severity: str
+    message: str
+    file: Optional[str] = None
+
+
+@dataclass
+class CheckResult:
+    """Result of a single verification check"""
+    name: str
+    elapsed: float = 0.0
+    findings: List[Finding] = field(default_factory=list)
+    crashed: bool = False
+
+    @property
+    def errors(self) -> List[Finding]:
+        return [finding for finding in self.findings if finding.severity == SEVERITY_ERROR]
+
+    @property
+    def warnings(self) -> List[Finding]:
+        return [finding for finding in self.findings if finding.severity == SEVERITY_WARNING]
+
+    @property
+    def status(self) -> str:
+        if self.errors:
+            return 'failed'
+        if self.warnings:
+            return 'warning'
+        return 'passed'
+
+
+def _to_finding(severity: str, item: Any) -> Finding:
+    """Convert a message returned by a check (string, exception or Finding) into a Finding
+
+    The severity always follows the list the check returned the item in.
+    """
+    if isinstance(item, Finding):
+        return Finding(severity, item.message, item.file)
+    return Finding(severity, str(item), getattr(item, 'filename', None))
+
+
+def run_check(verify_func: Callable[[], Tuple[List[Any], List[Any]]]) -> CheckResult:
+    """Run a check, measure its wall time and collect its findings; exceptions become error findings"""
+    result = CheckResult(verify_func.__name__)
+    start = time.perf_counter()
+    try:
+        with Profiler.stage(verify_func.__name__):
+            errors, warnings = verify_func()
+        result.findings.extend(_to_finding(SEVERITY_ERROR, error) for error in errors)
+        result.findings.extend(_to_finding(SEVERITY_WARNING, warning) for warning in warnings)
+    except Exception as e:
+        result.crashed = True
+        result.findings.append(Finding(SEVERITY_ERROR, f"{type(e).__name__}: {e}", getattr(e, 'filename', None)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+class VerificationReport:
+    """Collection of check results serializable to JSON and JUnit XML"""
+
+    FORMATS = ('json', 'junit')
+
+    def __init__(self, results: List[CheckResult] = None):
+        self.results = results or []
+
+    @property
+    def elapsed(self) -> float:
+        return sum(result.elapsed for result in self.results)
+
+    @property
+    def failed(self) -> bool:
+        return any(result.errors for result in self.results)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'status': 'failed' if self.failed else 'passed',
+            'elapsed': round(self.elapsed, 6),
+            'checks': [
+                {**asdict(result), 'elapsed': round(result.elapsed, 6), 'status': result.status}
+                for result in self.results
+            ],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+
+    def to_junit_xml(self, suite_name: str = 'verify_all') -> str:
+        from xml.etree import ElementTree
+
+        suite = ElementTree.Element('testsuite', {
+            'name': suite_name,
+            'tests': str(len(self.results)),
+            'failures': str(sum(1 for result in self.results if result.errors and not result.crashed)),
+            'errors': str(sum(1 for result in self.results if result.crashed)),
+            'time': f"{self.elapsed:.6f}",
+        })
+        for result in self.results:
+            case = ElementTree.SubElement(suite, 'testcase', {
+                'classname': suite_name,
+                'name': result.name,
+                'time': f"{result.elapsed:.6f}",
+            })
+            if result.errors:
+                tag = 'error' if result.crashed else 'failure'
+                element = ElementTree.SubElement(case, tag, {
+                    'message': f"{len(result.errors)} error(s)",
+                    'type': tag,
+                })
+                element.text = '\n'.join(
+                    f"{finding.file}: {finding.message}" if finding.file else finding.message
+                    for finding in result.errors)
+            if result.warnings:
+                ElementTree.SubElement(case, 'system-out').text = '\n'.join(
+                    f"warning: {finding.file}: {finding.message}" if finding.file else f"warning: {finding.message}"
+                    for finding in result.warnings)
+        return ElementTree.tostring(suite, encoding='unicode', xml_declaration=True)
+
+    def serialize(self, report_format: str) -> str:
+        if report_format == 'json':
+            return self.to_json()
+        if report_format == 'junit':
+            return self.to_junit_xml()
+        raise ValueError(f"Unknown report format: {report_format}")
+
+    def write(self, report_format: str, file_path: str):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(self.serialize(report_format))
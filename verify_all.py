@@ -3,20 +3,79 @@
 Comprehensive verification script for Minecraft Bedrock Addon
 Verifies project structure, files, textures, and build readiness
 """
-from minecraft_check import MinecraftUtils
-
-
-def main():
-    """Main verification function"""
-    MinecraftUtils.verification_summary([
-        MinecraftUtils.verify_config,
-        MinecraftUtils.verify_manifests,
-        MinecraftUtils.verify_project_structure,
-        MinecraftUtils.count_project_files,
-        MinecraftUtils.verify_translations,
-        MinecraftUtils.verify_blocks,
-        MinecraftUtils.verify_textures,
-    ])
+import argparse
+import subprocess
+
+from console_utils import ConsoleStyle, Profiler, print_if_not_quiet
+from verification_report import VerificationReport
+
+
+def git_changed_files(ref):
+    """List files changed since the git ref (committed, staged, unstaged and untracked)"""
+    changed = subprocess.run(['git', 'diff', '--name-only', ref, '--'],
+                             capture_output=True, text=True, check=True).stdout.splitlines()
+    untracked = subprocess.run(['git', 'ls-files', '--others', '--exclude-standard'],
+                               capture_output=True, text=True, check=True).stdout.splitlines()
+    return sorted(set(changed + untracked))
+
+
+def main(argv=None, wrap_check=None):
+    """Main verification function (wrap_check lets the project daemon serve cached check results)"""
+    parser = argparse.ArgumentParser(description="Verify Minecraft Addon project")
+    parser.add_argument("--only", action='append', metavar='CHECK',
+                        help="run only the given check, e.g. verify_translations (repeatable)")
+    parser.add_argument("--changed", nargs='+', metavar='PATH',
+                        help="run only checks affected by the given changed files")
+    parser.add_argument("--since", metavar='REF', help="run only checks affected by files changed since git ref")
+    parser.add_argument("--report", '-r', choices=VerificationReport.FORMATS,
+                        help="write machine-readable report (with timing per check)")
+    parser.add_argument("--report-file", '-f', help="report output file (default: stdout)")
+    parser.add_argument("--quiet", '-q', action="store_true", help="do not print colorized tables")
+    parser.add_argument("--profile", nargs='?', const='', metavar='FILE',
+                        help="print timing of verification stages (and save flame graph stacks to FILE)")
+    args = parser.parse_args(argv)
+
+    if args.quiet:
+        ConsoleStyle.set_quiet_mode()
+    Profiler.set_enabled(args.profile is not None)
+    try:
+        run(parser, args, wrap_check)
+    finally:
+        # Także po sys.exit z podsumowania weryfikacji
+        Profiler.finish(args.profile)
+
+
+def run(parser, args, wrap_check=None):
+    """Select checks from parsed arguments and print the verification summary"""
+    # Import weryfikacji dopiero po sparsowaniu argumentów (szybkie --help)
+    from minecraft_check import MinecraftUtils
+
+    verifications = MinecraftUtils.default_verifications()
+    if args.only:
+        available = {verify_func.__name__: verify_func for verify_func in MinecraftUtils.available_verifications()}
+        unknown = [name for name in args.only if name not in available]
+        if unknown:
+            parser.error(f"unknown check(s): {', '.join(unknown)} (available: {', '.join(available)})")
+        verifications = [available[name] for name in args.only]
+
+    if args.changed is not None or args.since:
+        changed_files = list(args.changed or [])
+        if args.since:
+            try:
+                changed_files += git_changed_files(args.since)
+            except (OSError, subprocess.CalledProcessError) as e:
+                parser.error(f"cannot list files changed since {args.since}: {e}")
+        verifications = MinecraftUtils.affected_verifications(changed_files, verifications if args.only else None)
+        print_if_not_quiet(ConsoleStyle.info(
+            f"[{len(changed_files)}] changed files -> [{len(verifications)}] checks: "
+            f"{', '.join(verify_func.__name__ for verify_func in verifications) or '-'}"))
+        if not verifications:
+            print_if_not_quiet(ConsoleStyle.success("No checks affected by changed files"))
+            return
+
+    if wrap_check:
+        verifications = [wrap_check(verify_func) for verify_func in verifications]
+    MinecraftUtils.verification_summary(verifications, args.report, args.report_file)
 
 if __name__ == "__main__":
     main()
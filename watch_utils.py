@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Biblioteka z funkcjami obserwowania zmian plików (watchdog / inotify lub polling)
+"""
+import os
+import threading
+import time
+from typing import Dict, Iterable, Set, Tuple
+
+from scan_utils import ProjectScanner
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+# Stan pliku: (mtime w ns, rozmiar)
+FileState = Tuple[int, int]
+
+
+class _WakeUpHandler(FileSystemEventHandler):
+    """Watchdog handler which only wakes up the waiting watcher"""
+
+    def __init__(self, event: threading.Event):
+        super().__init__()
+        self.event = event
+
+    def on_any_event(self, event):
+        self.event.set()
+
+
+class FileWatcher:
+    """Class for detecting changed, added and removed files under the given paths"""
+
+    def __init__(self, paths: Iterable[str], interval: float = 0.25, debounce: float = 0.3):
+        self.paths = list(paths)
+        self.interval = interval
+        self.debounce = debounce
+        self.state = self.snapshot()
+        self._event = threading.Event()
+        self._observer = None
+        if Observer:
+            # inotify/FSEvents przez watchdog — bez pollingu, snapshot liczony tylko po zdarzeniu
+            self._observer = Observer()
+            handler = _WakeUpHandler(self._event)
+            for path in self.paths:
+                if os.path.isdir(path):
+                    self._observer.schedule(handler, path, recursive=True)
+                elif os.path.exists(path):
+                    self._observer.schedule(handler, os.path.dirname(os.path.abspath(path)), recursive=False)
+            self._observer.start()
+
+    @property
+    def backend(self) -> str:
+        return 'watchdog' if self._observer else 'polling'
+
+    def snapshot(self) -> Dict[str, FileState]:
+        """Stat all watched files (not ignored by the project scanner; stats are always fresh)"""
+        state = {}
+        scanner = ProjectScanner.shared()
+        for path in self.paths:
+            if os.path.isfile(path):
+                stat = os.stat(path)
+                state[path] = (stat.st_mtime_ns, stat.st_size)
+                continue
+            for file_path in scanner.files(path):
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+                state[os.path.join(path, file_path) if path == '.' else file_path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def poll(self) -> Set[str]:
+        """Return paths changed since the previous poll"""
+        new_state = self.snapshot()
+        changed = {path for path, file_state in new_state.items() if self.state.get(path) != file_state}
+        changed.update(path for path in self.state if path not in new_state)
+        self.state = new_state
+        return changed
+
+    def pending(self) -> Set[str]:
+        """Return paths changed since the previous check without blocking (with watchdog only after an event)"""
+        if self._observer and not self._event.is_set():
+            return set()
+        self._event.clear()
+        return self.poll()
+
+    def wait_for_changes(self) -> Set[str]:
+        """Block until files change, then wait until no change happens for the debounce time"""
+        changed = set()
+        while not changed:
+            if self._observer:
+                self._event.wait()
+                self._event.clear()
+            else:
+                time.sleep(self.interval)
+            changed = self.poll()
+        while True:
+            time.sleep(self.debounce)
+            more = self.poll()
+            if not more:
+                return changed
+            changed.update(more)
+
+    def stop(self):
+        if self._observer:
+            self._observer.stop()
+            self._observer.join()